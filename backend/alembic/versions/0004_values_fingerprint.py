@@ -0,0 +1,26 @@
+"""track applied chart values on deployments
+
+Revision ID: 0004_values_fingerprint
+Revises: 0003_server_type
+Create Date: 2026-10-18 00:00:00.000000
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0004_values_fingerprint"
+down_revision = "0003_server_type"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("deployments", sa.Column("index_html", sa.Text(), nullable=True))
+    op.add_column("deployments", sa.Column("values_fingerprint", sa.String(64), nullable=True))
+    op.add_column("deployments", sa.Column("applied_replicas", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("deployments", "applied_replicas")
+    op.drop_column("deployments", "values_fingerprint")
+    op.drop_column("deployments", "index_html")
@@ -0,0 +1,39 @@
+"""durable job queue
+
+Revision ID: 0005_jobs
+Revises: 0004_values_fingerprint
+Create Date: 2026-10-18 00:00:00.000001
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
+
+from alembic import op
+
+revision = "0005_jobs"
+down_revision = "0004_values_fingerprint"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", psql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("kind", sa.String(32), nullable=False),
+        sa.Column("deployment_id", psql.UUID(as_uuid=True), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column("status", sa.String(16), nullable=False, server_default="queued"),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("run_after", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("locked_by", sa.String(64), nullable=True),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+    op.create_index("ix_jobs_status_run_after", "jobs", ["status", "run_after"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_run_after", table_name="jobs")
+    op.drop_table("jobs")
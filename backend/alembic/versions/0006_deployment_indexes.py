@@ -0,0 +1,27 @@
+"""indexes for paginated deployment listing and status scans
+
+Revision ID: 0006_deployment_indexes
+Revises: 0005_jobs
+Create Date: 2026-10-18 00:00:00.000002
+"""
+from alembic import op
+
+revision = "0006_deployment_indexes"
+down_revision = "0005_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /deployments: newest first per user, keyset on (created_at, id)
+    op.create_index("ix_deployments_user_created", "deployments", ["user_id", "created_at", "id"])
+    # ... filtered by status
+    op.create_index("ix_deployments_user_status_created", "deployments", ["user_id", "status", "created_at", "id"])
+    # reconciler scans for CREATING/PENDING/DELETING rows across users
+    op.create_index("ix_deployments_status", "deployments", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_deployments_status", table_name="deployments")
+    op.drop_index("ix_deployments_user_status_created", table_name="deployments")
+    op.drop_index("ix_deployments_user_created", table_name="deployments")
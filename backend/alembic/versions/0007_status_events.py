@@ -0,0 +1,75 @@
+"""deployment status change feed (LISTEN/NOTIFY + catch-up table)
+
+Revision ID: 0007_status_events
+Revises: 0006_deployment_indexes
+Create Date: 2026-10-18 00:00:00.000003
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
+
+from alembic import op
+
+revision = "0007_status_events"
+down_revision = "0006_deployment_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "deployment_status_events",
+        sa.Column("id", sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column("deployment_id", psql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", sa.Integer, nullable=False),
+        sa.Column("old_status", sa.String(32), nullable=True),
+        sa.Column("new_status", sa.String(32), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+    op.create_index("ix_deployment_status_events_created", "deployment_status_events", ["created_at"])
+    # every status write records an event and notifies listeners on commit,
+    # whichever code path (or process) made it
+    op.execute("""
+        CREATE FUNCTION deployment_status_notify() RETURNS trigger AS $$
+        DECLARE
+            ev deployment_status_events%ROWTYPE;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO deployment_status_events (deployment_id, user_id, old_status, new_status)
+                VALUES (NEW.id, NEW.user_id, NULL, NEW.status) RETURNING * INTO ev;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO deployment_status_events (deployment_id, user_id, old_status, new_status)
+                VALUES (OLD.id, OLD.user_id, OLD.status, NULL) RETURNING * INTO ev;
+            ELSE
+                INSERT INTO deployment_status_events (deployment_id, user_id, old_status, new_status)
+                VALUES (NEW.id, NEW.user_id, OLD.status, NEW.status) RETURNING * INTO ev;
+            END IF;
+            PERFORM pg_notify('deployment_status', json_build_object(
+                'event_id', ev.id,
+                'id', ev.deployment_id,
+                'user_id', ev.user_id,
+                'old', ev.old_status,
+                'new', ev.new_status
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER deployments_status_created_deleted
+        AFTER INSERT OR DELETE ON deployments
+        FOR EACH ROW EXECUTE FUNCTION deployment_status_notify()
+    """)
+    op.execute("""
+        CREATE TRIGGER deployments_status_changed
+        AFTER UPDATE OF status ON deployments
+        FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status)
+        EXECUTE FUNCTION deployment_status_notify()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS deployments_status_changed ON deployments")
+    op.execute("DROP TRIGGER IF EXISTS deployments_status_created_deleted ON deployments")
+    op.execute("DROP FUNCTION IF EXISTS deployment_status_notify()")
+    op.drop_index("ix_deployment_status_events_created", table_name="deployment_status_events")
+    op.drop_table("deployment_status_events")
@@ -19,6 +19,11 @@ else:
     raise SystemExit('DB not reachable')
 PY
 
+if [ "${1:-api}" = "worker" ]; then
+  echo "[entrypoint] Starting worker..."
+  exec python -m src.worker
+fi
+
 echo "[entrypoint] Running DB migrations..."
 alembic upgrade head
 
@@ -3,16 +3,95 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str
+    # engine factory (db/session.py), applied to the sync and async engines alike
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_s: float = 30.0
+    db_pool_recycle_s: int = 1800
+    # a liveness round trip on every checkout; recycling usually covers stale connections
+    db_pool_pre_ping: bool = False
+    db_statement_timeout_ms: int = 30000
+    # running behind PgBouncer (transaction pooling): no app-side pool, no prepared statements
+    db_pgbouncer: bool = False
     jwt_secret: str = "change-me"
     jwt_algorithm: str = "HS256"
     access_token_ttl_minutes: int = 60
     refresh_token_ttl_minutes: int = 60 * 24 * 7
+    # verified access token -> identity cache in deps.get_current_user
+    auth_cache_size: int = 10000
+    auth_cache_ttl_s: float = 60.0
     cluster_domain: str = "10-0-10-253.sslip.io"
     kubeconfig: str | None = None
     helm_enabled: bool = True
     helm_chart_path: str = "/app/helm/tenant-nginx"
     helm_chart_path_tomcat: str = "/app/helm/tenant-tomcat"
+    # "engine": render the charts in-process and server-side apply; "cli": helm upgrade --install
+    helm_mode: str = "engine"
+    chart_render_cache_size: int = 256
+    # concurrent helm upgrades per API process (queued upgrades per release coalesce)
+    helm_max_concurrency: int = 4
     insecure_kube: bool = True
+    # shared K8s client: one pooled connection per threadpool slot (AnyIO default: 40)
+    kube_pool_maxsize: int = 40
+    kube_config_check_interval_s: float = 5.0
+    # dedicated executor for K8s calls made from async handlers
+    kube_async_threads: int = 32
+    tenant_namespace_prefix: str = "tenant-"
+    # in-process watch cache of tenant Deployments/Endpoints/Pods
+    informer_enabled: bool = True
+    informer_watch_timeout_s: int = 60
+    informer_max_staleness_s: float = 30.0
+    # server-side apply the raw tenant objects concurrently
+    apply_parallel: bool = True
+    # budget for the cluster-wide lists behind GET /deployments
+    report_batch_timeout_s: float = 3.0
+    # job queue (src/jobs.py); the API runs an embedded worker unless disabled
+    worker_embedded: bool = True
+    worker_concurrency: int = 16
+    job_poll_interval_s: float = 1.0
+    job_lease_s: int = 120
+    job_max_attempts: int = 5
+    job_retry_base_s: float = 5.0
+    # bulk status reconciler (src/reconciler.py), runs next to each worker
+    reconcile_enabled: bool = True
+    reconcile_interval_s: float = 5.0
+    reconcile_min_interval_s: float = 0.5
+    deployment_ready_timeout_s: int = 300
+    # DELETE /auth/account: concurrent namespace deletes and the shared wait budget
+    teardown_concurrency: int = 8
+    teardown_timeout_s: int = 600
+    # deployment report cache (services/report_cache.py); Redis shares it across processes
+    report_cache_ttl_s: float = 2.0
+    report_cache_size: int = 10000
+    redis_url: str | None = None
+    # GET /deployments page size (keyset pagination)
+    list_page_size: int = 100
+    list_max_page_size: int = 500
+    # GET /deployments/{id}/events: one upstream poller per deployment, shared by its viewers
+    sse_interval_s: float = 2.0
+    sse_queue_size: int = 8
+    sse_max_duration_s: float = 180.0
+    sse_log_replay: int = 20
+    sse_resume_history: int = 64
+    sse_resume_linger_s: float = 30.0
+    sse_heartbeat_s: float = 15.0
+    # deployment status change feed (services/status_feed.py, Postgres LISTEN/NOTIFY)
+    status_feed_enabled: bool = True
+    # direct Postgres DSN for the LISTEN connection; needed with DB_PGBOUNCER
+    status_feed_database_url: str | None = None
+    status_feed_reconnect_s: float = 2.0
+    status_feed_catchup_overlap: int = 100
+    status_events_retention_s: int = 86400
+    # WS /deployments/stream: per-deployment channels one dashboard connection may hold
+    ws_max_subscriptions: int = 20
+    # follow-mode pod log streams (services/log_stream.py)
+    log_follow_max_streams: int = 64
+    log_follow_tail_lines: int = 40
+    log_follow_idle_s: float = 30.0
+    log_max_lines_per_s: float = 50.0
+    # POST /deployments:batch
+    batch_max_items: int = 200
+    batch_concurrency: int = 16
 
     model_config = {
         "env_prefix": "",
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+
+class _Summary:
+    __slots__ = ("count", "max", "total")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        avg = self.total / self.count if self.count else 0.0
+        return {"count": self.count, "sum": round(self.total, 6), "avg": round(avg, 6), "max": round(self.max, 6)}
+
+
+class Metrics:
+    """Minimal in-process metrics: counters, gauges and count/sum/max summaries.
+
+    Served as JSON from GET /health/metrics.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, Callable[[], float]] = {}
+        self._summaries: dict[str, _Summary] = {}
+
+    def inc(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name: str, fn: Callable[[], float]) -> None:
+        """Register a gauge whose value is read when metrics are collected."""
+        self._gauges[name] = fn
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self._summaries.setdefault(name, _Summary()).observe(value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            out: dict = dict(self._counters)
+            out.update({k: s.snapshot() for k, s in self._summaries.items()})
+        for name, fn in list(self._gauges.items()):
+            try:
+                out[name] = fn()
+            except Exception:
+                out[name] = None
+        return dict(sorted(out.items()))
+
+
+metrics = Metrics()
@@ -23,8 +23,12 @@ def _jwt_encode(payload: dict[str, Any], ttl_minutes: int) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
-def create_access_token(sub: str) -> str:
-    return _jwt_encode({"sub": sub, "type": "access"}, settings.access_token_ttl_minutes)
+def create_access_token(sub: str, uid: int | None = None, slug: str | None = None) -> str:
+    payload: dict[str, Any] = {"sub": sub, "type": "access"}
+    if uid is not None and slug:
+        # lets get_current_user resolve the caller without a database lookup
+        payload.update(uid=uid, slug=slug)
+    return _jwt_encode(payload, settings.access_token_ttl_minutes)
 
 
 def create_refresh_token(sub: str) -> str:
@@ -1,12 +1,99 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
 
 from ..core.config import settings
+from ..core.metrics import metrics
+
+
+def _timed_pool(base: type[Pool], name: str) -> type[Pool]:
+    """``base`` with checkout wait time recorded as ``<name>_checkout_wait_seconds``."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return base._do_get(self)
+        finally:
+            metrics.observe(f"{name}_checkout_wait_seconds", time.perf_counter() - started)
+
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def _register_pool_gauges(name: str, pool: Any) -> None:
+    capacity = settings.db_pool_size + max(settings.db_max_overflow, 0)
+    metrics.gauge(f"{name}_checked_out", lambda: pool.checkedout())
+    metrics.gauge(f"{name}_overflow", lambda: max(pool.overflow(), 0))
+    # share of the pool (including overflow) in use; at 1.0 new checkouts queue
+    metrics.gauge(f"{name}_saturation", lambda: round(pool.checkedout() / capacity, 3) if capacity else 0.0)
+
 
+def engine_options(url: str, name: str, is_async: bool = False) -> dict[str, Any]:
+    """create_engine keyword arguments from the DB_* settings.
 
-engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
+    With DB_PGBOUNCER the engine keeps no pool of its own (PgBouncer does the
+    pooling), psycopg's server-side prepared statements are disabled, and the
+    statement timeout is not sent as a startup option, because PgBouncer in
+    transaction mode rejects those. Configure it on the PgBouncer user or role
+    instead.
+    """
+    u = make_url(url)
+    postgres = u.get_backend_name() == "postgresql"
+    connect_args: dict[str, Any] = {}
+    opts: dict[str, Any] = {"pool_pre_ping": settings.db_pool_pre_ping}
+    if settings.db_pgbouncer:
+        opts["poolclass"] = NullPool
+        if postgres:
+            connect_args["prepare_threshold"] = None
+    else:
+        opts.update(
+            poolclass=_timed_pool(AsyncAdaptedQueuePool if (is_async or u.get_dialect().is_async) else QueuePool, name),
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_s,
+            pool_recycle=settings.db_pool_recycle_s,
+        )
+        if postgres and settings.db_statement_timeout_ms:
+            connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+    if connect_args:
+        opts["connect_args"] = connect_args
+    return opts
+
+
+def make_engine(url: str | None = None, name: str = "db_pool") -> Engine:
+    url = url or settings.database_url
+    eng = create_engine(url, **engine_options(url, name))
+    if not settings.db_pgbouncer:
+        _register_pool_gauges(name, eng.pool)
+    return eng
+
+
+def make_async_engine(url: str | None = None, name: str = "db_async_pool") -> AsyncEngine:
+    # postgresql+psycopg resolves to psycopg's asyncio driver
+    url = url or settings.database_url
+    eng = create_async_engine(url, **engine_options(url, name, is_async=True))
+    if not settings.db_pgbouncer:
+        _register_pool_gauges(name, eng.sync_engine.pool)
+    return eng
+
+
+engine = make_engine()
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 
+async_engine = make_async_engine()
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
 
 def get_db():
     db = SessionLocal()
@@ -15,3 +102,7 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
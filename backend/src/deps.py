@@ -1,30 +1,153 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from .core.config import settings
+from .core.metrics import metrics
 from .core.security import decode_token
-from .db.session import get_db
+from .db.session import get_async_db
 from .models.user import User
 
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+@dataclass(frozen=True)
+class CurrentUser:
+    """Identity of the caller; enough for ownership checks without loading the User row."""
+    id: int
+    email: str
+    user_slug: str
+
+
+class _IdentityCache:
+    """TTL-bounded LRU of verified access token -> CurrentUser.
+
+    Entries never outlive the token's own expiry. ``invalidate_user`` drops a
+    user's entries and refuses to re-admit their tokens for one access-token
+    lifetime, so a deleted account stops authenticating in this process at once;
+    other processes notice on their next cache miss.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, CurrentUser]] = OrderedDict()
+        self._revoked: dict[int, float] = {}
+
+    def get(self, token: str) -> CurrentUser | None:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get(token)
+            if hit is None:
+                return None
+            expires, ident = hit
+            if expires <= now:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return ident
+
+    def put(self, token: str, ident: CurrentUser, token_exp: float | None) -> None:
+        ttl = settings.auth_cache_ttl_s
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            if self.revoked(ident.id):
+                return
+            self._entries[token] = (time.monotonic() + ttl, ident)
+            self._entries.move_to_end(token)
+            while len(self._entries) > settings.auth_cache_size:
+                self._entries.popitem(last=False)
+
+    def revoked(self, user_id: int) -> bool:
+        until = self._revoked.get(user_id)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._revoked.pop(user_id, None)
+            return False
+        return True
+
+    def invalidate(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            # every revocation lasts the same time, so insertion order is expiry
+            # order: drop the lapsed ones from the front instead of keeping them
+            while self._revoked:
+                uid, until = next(iter(self._revoked.items()))
+                if until > now:
+                    break
+                del self._revoked[uid]
+            self._revoked.pop(user_id, None)
+            self._revoked[user_id] = now + settings.access_token_ttl_minutes * 60
+            for token in [t for t, (_, ident) in self._entries.items() if ident.id == user_id]:
+                del self._entries[token]
+
+
+identity_cache = _IdentityCache()
+
+
+def invalidate_user(user_id: int) -> None:
+    identity_cache.invalidate(user_id)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+async def resolve_token(token: str, db: AsyncSession) -> CurrentUser:
+    """Verify an access token and return its identity.
+
+    Cached tokens are resolved without touching the database. On a miss,
+    tokens carrying ``uid``/``slug`` claims are checked against the user's
+    primary key and older tokens fall back to a lookup by email. Either way a
+    deleted account stops authenticating in every process once its cache
+    entries expire (``auth_cache_ttl_s``).
+    """
+    ident = identity_cache.get(token)
+    if ident is not None:
+        metrics.inc("auth_cache_hits_total")
+        return ident
+    metrics.inc("auth_cache_misses_total")
     try:
         payload = decode_token(token)
     except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        raise _unauthorized("Invalid token")
 
     if payload.get("type") != "access":
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
+        raise _unauthorized("Invalid token type")
 
     sub = payload.get("sub")
     if not sub:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing subject")
+        raise _unauthorized("Missing subject")
+
+    uid, slug = payload.get("uid"), payload.get("slug")
+    if isinstance(uid, int) and slug:
+        # the claims are trusted for identity; the lookup only proves the account still exists
+        metrics.inc("auth_db_lookups_total")
+        if (await db.execute(select(User.id).where(User.id == uid))).scalar() is None:
+            raise _unauthorized("User not found")
+        ident = CurrentUser(id=uid, email=sub, user_slug=slug)
+    else:
+        metrics.inc("auth_db_lookups_total")
+        user = (await db.execute(select(User).where(User.email == sub))).scalars().first()
+        if not user:
+            raise _unauthorized("User not found")
+        ident = CurrentUser(id=user.id, email=user.email, user_slug=user.user_slug)
+    if identity_cache.revoked(ident.id):
+        raise _unauthorized("User not found")
+    identity_cache.put(token, ident, payload.get("exp"))
+    return ident
 
-    user = db.query(User).filter(User.email == sub).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
 
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)) -> CurrentUser:
+    return await resolve_token(token, db)
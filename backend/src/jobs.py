@@ -0,0 +1,111 @@
+"""Postgres-backed job queue.
+
+Jobs are rows in ``jobs``. ``enqueue`` adds one to the caller's session so it
+commits atomically with the change that needs it. Workers claim batches with
+``FOR UPDATE SKIP LOCKED`` and hold a lease while a job runs. When a worker dies,
+its running jobs become claimable again once their lease expires.
+"""
+from __future__ import annotations
+
+import uuid as _uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .core.config import settings
+from .models.job import Job
+
+_listeners: set[Callable[[], None]] = set()
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+def enqueue(db: Session | AsyncSession, kind: str, deployment_id: _uuid.UUID | None = None, payload: dict | None = None, delay_s: float = 0) -> Job:
+    """Add a job to ``db``; it becomes visible to workers when the session commits."""
+    job = Job(
+        id=_uuid.uuid4(),
+        kind=kind,
+        deployment_id=deployment_id,
+        payload=payload or {},
+        status="queued",
+        attempts=0,
+        run_after=_now() + timedelta(seconds=delay_s),
+    )
+    db.add(job)
+    return job
+
+
+def on_enqueue(callback: Callable[[], None]) -> None:
+    _listeners.add(callback)
+
+
+def notify() -> None:
+    """Wake in-process workers after committing new jobs (others pick them up on their next poll)."""
+    for cb in list(_listeners):
+        cb()
+
+
+async def claim(db: AsyncSession, worker_id: str, limit: int) -> list[Job]:
+    now = _now()
+    ids = (
+        select(Job.id)
+        .where(or_(
+            and_(Job.status == "queued", Job.run_after <= now),
+            and_(Job.status == "running", Job.locked_until < now),
+        ))
+        .order_by(Job.run_after)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    rows = (await db.execute(
+        update(Job)
+        .where(Job.id.in_(ids))
+        .values(
+            status="running",
+            attempts=Job.attempts + 1,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=settings.job_lease_s),
+        )
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )).scalars().all()
+    await db.commit()
+    return list(rows)
+
+
+async def extend_lease(db: AsyncSession, job_id: _uuid.UUID, worker_id: str) -> None:
+    await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.locked_by == worker_id, Job.status == "running")
+        .values(locked_until=_now() + timedelta(seconds=settings.job_lease_s))
+    )
+    await db.commit()
+
+
+async def save_progress(db: AsyncSession, job: Job, progress: dict) -> None:
+    """Store ``progress`` under ``payload["progress"]`` for clients polling the job."""
+    job.payload = {**job.payload, "progress": progress}
+    await db.execute(update(Job).where(Job.id == job.id).values(payload=job.payload))
+    await db.commit()
+
+
+async def complete(db: AsyncSession, job_id: _uuid.UUID) -> None:
+    await db.execute(update(Job).where(Job.id == job_id).values(status="done", locked_by=None, locked_until=None, last_error=None))
+    await db.commit()
+
+
+async def fail(db: AsyncSession, job: Job, error: str) -> None:
+    """Requeue with exponential backoff, or mark failed after ``job_max_attempts``."""
+    if job.attempts >= settings.job_max_attempts:
+        values = {"status": "failed"}
+    else:
+        delay = min(settings.job_retry_base_s * 2 ** (job.attempts - 1), 300)
+        values = {"status": "queued", "run_after": _now() + timedelta(seconds=delay)}
+    await db.execute(update(Job).where(Job.id == job.id).values(locked_by=None, locked_until=None, last_error=error[:4000], **values))
+    await db.commit()
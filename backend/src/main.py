@@ -1,17 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .core.config import settings
+from .reconciler import Reconciler
 from .routers import auth, deployments, health
+from .services.charts import chart_engine
+from .services.informer import tenant_cache
+from .services.status_feed import status_feed
+from .worker import Worker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.helm_enabled and settings.helm_mode != "cli":
+        chart_engine.preload([settings.helm_chart_path, settings.helm_chart_path_tomcat])
+    if settings.informer_enabled:
+        tenant_cache.start()
+    status_feed.start()
+    worker = Worker() if settings.worker_embedded else None
+    worker_task = asyncio.create_task(worker.run()) if worker else None
+    reconciler = Reconciler() if (settings.worker_embedded and settings.reconcile_enabled) else None
+    reconciler_task = asyncio.create_task(reconciler.run()) if reconciler else None
+    try:
+        yield
+    finally:
+        if reconciler and reconciler_task:
+            reconciler.stop()
+            await reconciler_task
+        if worker and worker_task:
+            await worker.stop()
+            await worker_task
+        await status_feed.stop()
+        tenant_cache.stop()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Multitenant SaaS Simulator API")
+    app = FastAPI(title="Multitenant SaaS Simulator API", lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],  # dev: public; tighten in prod
         allow_credentials=False,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
     app.include_router(auth.router, prefix="/auth", tags=["auth"])
     app.include_router(deployments.router, prefix="", tags=["deployments"])
@@ -20,3 +54,4 @@ def create_app() -> FastAPI:
 
 
 app = create_app()
+
@@ -1,12 +1,19 @@
 import uuid as _uuid
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, func, Integer, ForeignKey, Text
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
 from .user import Base
 
 
 class Deployment(Base):
     __tablename__ = "deployments"
+    __table_args__ = (
+        Index("ix_deployments_user_created", "user_id", "created_at", "id"),
+        Index("ix_deployments_user_status_created", "user_id", "status", "created_at", "id"),
+        Index("ix_deployments_status", "status"),
+    )
 
     id: Mapped[_uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=_uuid.uuid4)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
@@ -18,6 +25,10 @@ class Deployment(Base):
     status: Mapped[str] = mapped_column(String(32), default="PENDING")
     last_error: Mapped[str | None] = mapped_column(Text())
     server_type: Mapped[str | None] = mapped_column(String(32))
+    index_html: Mapped[str | None] = mapped_column(Text())
+    # last values applied through the chart, minus replicaCount (see services.profiles)
+    values_fingerprint: Mapped[str | None] = mapped_column(String(64))
+    applied_replicas: Mapped[int | None] = mapped_column(Integer)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -0,0 +1,28 @@
+import uuid as _uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .user import Base
+
+
+class DeploymentStatusEvent(Base):
+    """One deployment status transition, written by a trigger on ``deployments``.
+
+    The same trigger sends the row as a ``deployment_status`` notification; the
+    table lets listeners catch up on notifications they missed.
+    """
+
+    __tablename__ = "deployment_status_events"
+    __table_args__ = (Index("ix_deployment_status_events_created", "created_at"),)
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    # no FK: the event for a deleted row outlives it
+    deployment_id: Mapped[_uuid.UUID] = mapped_column(UUID(as_uuid=True))
+    user_id: Mapped[int] = mapped_column(Integer)
+    # NULL old_status: created; NULL new_status: deleted
+    old_status: Mapped[str | None] = mapped_column(String(32))
+    new_status: Mapped[str | None] = mapped_column(String(32))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
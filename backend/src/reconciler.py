@@ -0,0 +1,150 @@
+"""Drive non-terminal deployment rows to their cluster state in bulk.
+
+One pass selects every CREATING/PENDING row and resolves all of them with a
+single batched report lookup, which the watch cache answers while it is fresh.
+Every status change is written in one UPDATE. DELETING rows that have no live
+delete job get one re-enqueued, and old status change events are pruned.
+Passes run every ``reconcile_interval_s`` and also after informer changes,
+coalesced to at most one pass per ``reconcile_min_interval_s``. Running a reconciler in several
+processes is safe, because updates only apply to rows whose status is still
+non-terminal.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, case, delete, select, update
+
+from . import jobs
+from .core.config import settings
+from .core.metrics import metrics
+from .db.session import AsyncSessionLocal
+from .models.deployment import Deployment
+from .models.job import Job
+from .models.status_event import DeploymentStatusEvent
+from .services.informer import tenant_cache
+from .services.k8s import report_state
+from .services.report_cache import report_cache
+
+log = logging.getLogger(__name__)
+
+CREATE_STATES = ("CREATING", "PENDING")
+
+
+def resolve(report: dict | None, created_at: datetime, now: datetime) -> tuple[str, str | None] | None:
+    """New (status, last_error) for a row being created, or None to leave it as is."""
+    if report is None or report.get("endpoints") is None:
+        return None  # lookup incomplete: decide on a later pass
+    if report_state(report) == "READY" and report["endpoints"] > 0:
+        return "READY", None
+    if created_at is not None and now - created_at > timedelta(seconds=settings.deployment_ready_timeout_s):
+        return "ERROR", f"deployment not ready after {settings.deployment_ready_timeout_s}s: ready {report.get('ready_replicas')}/{report.get('replicas')}, endpoints {report['endpoints']}"
+    return None
+
+
+class Reconciler:
+    def __init__(self) -> None:
+        self._wake: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopping = False
+        self._pruned_at = 0.0
+
+    def wake(self) -> None:
+        if self._loop and self._wake:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        tenant_cache.subscribe(self.wake)
+        try:
+            while not self._stopping:
+                self._wake.clear()
+                started = time.monotonic()
+                try:
+                    await self.reconcile_once()
+                except Exception as e:
+                    log.warning("reconcile pass failed: %s", e)
+                metrics.observe("reconcile_seconds", time.monotonic() - started)
+                await asyncio.sleep(settings.reconcile_min_interval_s)
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=settings.reconcile_interval_s)
+                except TimeoutError:
+                    pass
+        finally:
+            tenant_cache.unsubscribe(self.wake)
+
+    def stop(self) -> None:
+        self._stopping = True
+        self.wake()
+
+    async def reconcile_once(self) -> int:
+        """One pass; returns the number of rows updated."""
+        metrics.inc("reconcile_runs_total")
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(Deployment.id, Deployment.namespace, Deployment.slug, Deployment.created_at)
+                .where(Deployment.status.in_(CREATE_STATES))
+            )).all()
+            updated = await self._finish_creates(db, rows) if rows else 0
+            requeued = await self._requeue_orphaned_deletes(db)
+            if time.monotonic() - self._pruned_at > 60:
+                self._pruned_at = time.monotonic()
+                await self._prune_status_events(db)
+        if requeued:
+            jobs.notify()
+        return updated
+
+    async def _finish_creates(self, db, rows) -> int:
+        reports = await report_cache.get_many([(r.namespace, r.slug) for r in rows])
+        now = datetime.now(UTC)
+        changes: dict = {}
+        for r in rows:
+            created = r.created_at
+            if created is not None and created.tzinfo is None:
+                created = created.replace(tzinfo=UTC)
+            verdict = resolve(reports.get((r.namespace, r.slug)), created, now)
+            if verdict is not None:
+                changes[r.id] = verdict
+        if not changes:
+            return 0
+        ids = list(changes)
+        result = await db.execute(
+            update(Deployment)
+            .where(Deployment.id.in_(ids), Deployment.status.in_(CREATE_STATES))
+            .values(
+                status=case({i: s for i, (s, _) in changes.items()}, value=Deployment.id),
+                last_error=case({i: e for i, (_, e) in changes.items()}, value=Deployment.id),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        metrics.inc("reconcile_updates_total", result.rowcount)
+        return result.rowcount
+
+    async def _prune_status_events(self, db) -> None:
+        # the change feed only reads this table to catch up after a reconnect
+        cutoff = datetime.now(UTC) - timedelta(seconds=settings.status_events_retention_s)
+        await db.execute(delete(DeploymentStatusEvent).where(DeploymentStatusEvent.created_at < cutoff))
+        await db.commit()
+
+    async def _requeue_orphaned_deletes(self, db) -> int:
+        # DELETING rows that have sat for a lease period with no live delete job,
+        # e.g. an inline delete whose process died
+        cutoff = datetime.now(UTC) - timedelta(seconds=settings.job_lease_s)
+        live = (
+            select(Job.id)
+            .where(and_(Job.deployment_id == Deployment.id, Job.kind == "delete", Job.status.in_(("queued", "running"))))
+            .exists()
+        )
+        orphans = (await db.execute(
+            select(Deployment.id).where(Deployment.status == "DELETING", Deployment.updated_at < cutoff, ~live)
+        )).scalars().all()
+        for dep_id in orphans:
+            jobs.enqueue(db, "delete", dep_id, delay_s=settings.job_retry_base_s)
+        if orphans:
+            await db.commit()
+        return len(orphans)
@@ -1,13 +1,29 @@
+import uuid as _uuid
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from .. import jobs
+from ..core.security import (
+    create_access_token,
+    create_refresh_token,
+    hash_password,
+    slugify,
+    verify_password,
+)
 from ..db.session import get_db
-from ..models.user import User
-from ..schemas.auth import RegisterRequest, LoginRequest, TokenPair, MeResponse, RefreshRequest, ThemeUpdate
-from ..deps import get_current_user
-from ..core.security import hash_password, verify_password, create_access_token, create_refresh_token, slugify
+from ..deps import CurrentUser, get_current_user, invalidate_user
+from ..models.job import Job
 from ..models.settings import UserSetting
-
+from ..models.user import User
+from ..schemas.auth import (
+    LoginRequest,
+    MeResponse,
+    RefreshRequest,
+    RegisterRequest,
+    ThemeUpdate,
+    TokenPair,
+)
 
 router = APIRouter()
 
@@ -20,7 +36,7 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
     db.add(user)
     db.commit()
     db.refresh(user)
-    access = create_access_token(sub=user.email)
+    access = create_access_token(sub=user.email, uid=user.id, slug=user.user_slug)
     refresh = create_refresh_token(sub=user.email)
     return TokenPair(access_token=access, refresh_token=refresh)
 
@@ -30,11 +46,11 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == payload.email).first()
     if not user or not verify_password(payload.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    return TokenPair(access_token=create_access_token(sub=user.email), refresh_token=create_refresh_token(sub=user.email))
+    return TokenPair(access_token=create_access_token(sub=user.email, uid=user.id, slug=user.user_slug), refresh_token=create_refresh_token(sub=user.email))
 
 
 @router.get("/me", response_model=MeResponse)
-def me(current_user: User = Depends(get_current_user)):
+def me(current_user: CurrentUser = Depends(get_current_user)):
     return MeResponse(id=current_user.id, email=current_user.email, user_slug=current_user.user_slug)
 
 
@@ -53,39 +69,55 @@ def refresh(payload: RefreshRequest, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == sub).first()
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-    return TokenPair(access_token=create_access_token(sub=sub), refresh_token=create_refresh_token(sub=sub))
+    return TokenPair(access_token=create_access_token(sub=sub, uid=user.id, slug=user.user_slug), refresh_token=create_refresh_token(sub=sub))
 
 
-@router.delete("/account")
-def delete_account(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    # delete all namespaces for this user, then remove user record
+@router.delete("/account", status_code=202)
+def delete_account(current_user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
+    # hand every namespace to a teardown job, then remove the user record (cascades to deployments)
     from ..models.deployment import Deployment
-    from ..services.k8s import delete_namespace, wait_namespace_gone
 
+    user = db.get(User, current_user.id)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
     deps = db.query(Deployment).filter(Deployment.user_id == current_user.id).all()
-    errors = []
-    for d in deps:
-        try:
-            delete_namespace(d.namespace)
-            wait_namespace_gone(d.namespace)
-        except Exception as e:
-            errors.append({"namespace": d.namespace, "error": str(e)})
-    # delete user regardless; record errors if any
-    db.delete(current_user)
+    job = jobs.enqueue(db, "teardown", payload={
+        "deployments": [{"namespace": d.namespace, "release": d.slug} for d in deps],
+    })
+    db.delete(user)
     db.commit()
-    if errors:
-        return {"ok": True, "warnings": errors}
-    return {"ok": True}
+    invalidate_user(current_user.id)
+    jobs.notify()
+    return {"ok": True, "job_id": str(job.id), "status_url": f"/auth/account/teardown/{job.id}"}
+
+
+@router.get("/account/teardown/{job_id}")
+def get_teardown(job_id: _uuid.UUID, db: Session = Depends(get_db)):
+    # unauthenticated: the account is already gone, the job id is the capability
+    job = db.get(Job, job_id)
+    if not job or job.kind != "teardown":
+        raise HTTPException(status_code=404, detail="Not found")
+    items = job.payload.get("deployments", [])
+    progress = job.payload.get("progress") or {"phase": "queued", "total": len(items), "deleted": [], "errors": {}}
+    return {
+        "id": str(job.id),
+        "status": job.status,
+        "phase": progress["phase"],
+        "total": progress["total"],
+        "deleted": len(progress["deleted"]),
+        "remaining": progress["total"] - len(progress["deleted"]) - len(progress["errors"]),
+        "errors": [{"namespace": ns, "error": err} for ns, err in progress["errors"].items()],
+    }
 
 
 @router.get("/me/settings")
-def get_settings(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_settings(current_user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
     s = db.query(UserSetting).filter(UserSetting.user_id == current_user.id).first()
     return {"theme": getattr(s, "theme", None)}
 
 
 @router.post("/me/settings")
-def update_settings(payload: ThemeUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def update_settings(payload: ThemeUpdate, current_user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
     s = db.query(UserSetting).filter(UserSetting.user_id == current_user.id).first()
     if not s:
         s = UserSetting(user_id=current_user.id, theme=payload.theme)
@@ -1,123 +1,123 @@
+import asyncio
+import base64
+import json
+import logging
+import time
 import uuid as _uuid
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from datetime import datetime
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi import status as http_status
+from sqlalchemy import literal, select, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import HTTPConnection
 from starlette.responses import StreamingResponse
-from sqlalchemy.orm import Session
 
-from ..deps import get_current_user
-from ..core.security import decode_token
-from ..db.session import get_db
-from ..models.deployment import Deployment
-from ..models.user import User
-from ..schemas.deployments import DeploymentCreate, DeploymentOut, DeploymentStatus, ScaleRequest
-from ..core.security import slugify, short_id
+from .. import jobs
 from ..core.config import settings
-from ..services.k8s import (
-    ensure_namespace,
+from ..core.security import short_id, slugify
+from ..db.session import AsyncSessionLocal, get_async_db
+from ..deps import CurrentUser, get_current_user, resolve_token
+from ..models.deployment import Deployment
+from ..schemas.deployments import (
+    BatchCreateRequest,
+    BatchCreateResult,
+    BatchScaleRequest,
+    BatchScaleResult,
+    DeploymentCreate,
+    DeploymentOut,
+    DeploymentSelector,
+    DeploymentStatus,
+    ScaleRequest,
+)
+from ..services import k8s_async
+from ..services.event_hub import (
+    HEARTBEAT,
+    deployment_events,
+    deployment_logs,
+    merge,
+    merge_patch,
+    user_events,
+)
+from ..services.helm_executor import helm_executor
+from ..services.k8s import report_state
+from ..services.k8s_async import (
     apply_nginx,
-    NginxSpec,
-    check_ready_strict,
-    delete_namespace,
-    wait_namespace_gone,
-    get_deployment_report,
+    ensure_namespace,
+)
+from ..services.log_stream import follow_logs
+from ..services.profiles import (
+    chart_dir_for,
+    chart_values,
+    nginx_spec,
+    values_fingerprint,
 )
-from kubernetes import client as k8s_client
-from kubernetes.client import ApiException as K8sApiException
-from ..services.helm import helm_upgrade_install, helm_uninstall
-from kubernetes import client as k8s
+from ..services.report_cache import report_cache
+from ..services.status_feed import status_feed
 
+log = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-@router.post("/deployments", response_model=DeploymentOut)
-def create_deployment(payload: DeploymentCreate, background: BackgroundTasks, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+def _new_deployment(user: CurrentUser, payload: DeploymentCreate) -> Deployment:
     unique = short_id(5)
     user_slug = user.user_slug
     dep_slug = slugify(payload.displayName)
-    namespace = f"tenant-{user_slug}-{unique}"
-    host = f"{user_slug}-{unique}.{settings.cluster_domain}"
-    name = dep_slug or f"{user_slug}-{unique}"
-
-    # choose image and port based on server type
     st = (payload.serverType or "nginx").lower()
-    image = "nginx:alpine"
-    port = 80
-    doc_root = "/usr/share/nginx/html"
-    readiness_path = "/"
-    readiness_delay = 5
-    replicas = payload.replicas or 1
-    if st in ("apache", "httpd"):
-        image = "httpd:alpine"
-        port = 80
-        doc_root = "/usr/local/apache2/htdocs"
-    elif st == "tomcat":
-        image = "tomcat:9.0"
-        port = 8080
-        readiness_delay = 20
-
     d = Deployment(
         user_id=user.id,
         display_name=payload.displayName,
-        slug=name,
-        namespace=namespace,
+        slug=dep_slug or f"{user_slug}-{unique}",
+        namespace=f"{settings.tenant_namespace_prefix}{user_slug}-{unique}",
         unique_id=unique,
-        ingress_host=host,
+        ingress_host=f"{user_slug}-{unique}.{settings.cluster_domain}",
         status="CREATING",
     )
     d.server_type = st
-    db.add(d)
-    db.commit()
-    db.refresh(d)
+    d.index_html = payload.indexHtml if (payload.indexHtml and st != "tomcat") else None
+    return d
+
 
+async def _provision(d: Deployment, replicas: int) -> None:
+    """Create the namespace and apply the chart (or raw objects); records the outcome on ``d``."""
+    st, name, namespace, host = d.server_type, d.slug, d.namespace, d.ingress_host
     try:
         if settings.helm_enabled:
-            values = {
-                "nameOverride": name,
-                "namespace": namespace,
-                "host": host,
-                "image": image,
-                "containerPort": port,
-                "servicePort": 80 if st=="tomcat" else port,
-                "replicaCount": replicas,
-                "readiness": {"path": readiness_path, "initialDelaySeconds": readiness_delay},
-                "docRootPath": doc_root,
-            }
-            if payload.indexHtml and st != "tomcat":
-                values["indexHtml"] = payload.indexHtml
-            if st == "tomcat":
-                values["command"] = ["catalina.sh","run"]
-                values["lifecycle"] = {
-                    "postStart": {
-                        "enabled": True,
-                        "command": [
-                            "bash","-c",
-                            "if [ ! -d /usr/local/tomcat/webapps/ROOT ]; then cp -r /usr/local/tomcat/webapps.dist/* /usr/local/tomcat/webapps/; fi"
-                        ]
-                    }
-                }
-            chart_dir = settings.helm_chart_path_tomcat if st == "tomcat" else settings.helm_chart_path
+            values = chart_values(st, name, namespace, host, replicas, d.index_html)
+            chart_dir = chart_dir_for(st)
             try:
-                helm_upgrade_install(namespace=namespace, release=name, chart_dir=chart_dir, values=values)
+                await helm_executor.run(namespace=namespace, release=name, chart_dir=chart_dir, values=values)
+                d.values_fingerprint = values_fingerprint(chart_dir, values)
             except Exception as e:
                 # Fallback to raw K8s apply if Helm fails
-                ensure_namespace(namespace)
-                apply_nginx(NginxSpec(namespace=namespace, name=name, host=host, image=image, port=port, index_html=payload.indexHtml if (payload.indexHtml and st!="tomcat") else None, doc_root_path=doc_root, readiness_path=readiness_path, readiness_delay=readiness_delay, command=["catalina.sh","run"] if st=="tomcat" else None, lifecycle_post_start=["bash","-c","if [ ! -d /usr/local/tomcat/webapps/ROOT ]; then cp -r /usr/local/tomcat/webapps.dist/* /usr/local/tomcat/webapps/; fi"] if st=="tomcat" else None, replicas=replicas))
+                await ensure_namespace(namespace)
+                await apply_nginx(nginx_spec(st, name, namespace, host, replicas, d.index_html))
                 d.last_error = f"Helm fallback: {e}"
         else:
-            ensure_namespace(namespace)
-            apply_nginx(NginxSpec(namespace=namespace, name=name, host=host, image=image, port=port, index_html=payload.indexHtml if (payload.indexHtml and st!="tomcat") else None, doc_root_path=doc_root, readiness_path=readiness_path, readiness_delay=readiness_delay, command=["catalina.sh","run"] if st=="tomcat" else None, lifecycle_post_start=["bash","-c","if [ ! -d /usr/local/tomcat/webapps/ROOT ]; then cp -r /usr/local/tomcat/webapps.dist/* /usr/local/tomcat/webapps/; fi"] if st=="tomcat" else None, replicas=replicas))
-        # Do not block HTTP: finalize in background to set READY strictly when done
-        from ..tasks import finalize_deployment
-        background.add_task(finalize_deployment, str(d.id))
+            await ensure_namespace(namespace)
+            await apply_nginx(nginx_spec(st, name, namespace, host, replicas, d.index_html))
+        # every path above sets the replica count; batch scale compares against it
+        d.applied_replicas = replicas
+        # Do not block HTTP: the reconciler marks the row READY/ERROR
         d.status = "CREATING"
         d.last_error = None
     except Exception as e:
         d.status = "ERROR"
         d.last_error = str(e)
-    finally:
-        db.add(d)
-        db.commit()
 
+
+def _out(d: Deployment) -> DeploymentOut:
     return DeploymentOut(
         id=d.id,
         display_name=d.display_name,
@@ -131,22 +131,92 @@ def create_deployment(payload: DeploymentCreate, background: BackgroundTasks, db
     )
 
 
+@router.post("/deployments", response_model=DeploymentOut)
+async def create_deployment(payload: DeploymentCreate, db: AsyncSession = Depends(get_async_db), user: CurrentUser = Depends(get_current_user)):
+    d = _new_deployment(user, payload)
+    db.add(d)
+    await db.commit()
+    try:
+        await _provision(d, payload.replicas or 1)
+    finally:
+        db.add(d)
+        await db.commit()
+    return _out(d)
+
+
+@router.post("/deployments:batch", response_model=list[BatchCreateResult])
+async def create_deployments_batch(payload: BatchCreateRequest, db: AsyncSession = Depends(get_async_db), user: CurrentUser = Depends(get_current_user)):
+    if len(payload.items) > settings.batch_max_items:
+        raise HTTPException(status_code=413, detail=f"at most {settings.batch_max_items} items per batch")
+    ds = [_new_deployment(user, item) for item in payload.items]
+    db.add_all(ds)
+    await db.commit()
+
+    limit = asyncio.Semaphore(settings.batch_concurrency)
+
+    async def provision(d: Deployment, item: DeploymentCreate) -> None:
+        async with limit:
+            await _provision(d, item.replicas or 1)
+
+    # each item records its own outcome, so one failure does not stop the rest
+    await asyncio.gather(*(provision(d, item) for d, item in zip(ds, payload.items)))
+    db.add_all(ds)
+    await db.commit()
+    return [
+        BatchCreateResult(index=i, ok=d.status != "ERROR", deployment=_out(d), error=d.last_error if d.status == "ERROR" else None)
+        for i, d in enumerate(ds)
+    ]
+
+
+def _encode_cursor(d: Deployment) -> str:
+    raw = json.dumps({"c": d.created_at.isoformat(), "i": str(d.id)}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, _uuid.UUID]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(raw["c"]), _uuid.UUID(raw["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/deployments", response_model=list[DeploymentOut])
-def list_deployments(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    ds = (
-        db.query(Deployment)
-        .filter(Deployment.user_id == user.id)
-        .order_by(Deployment.created_at.desc())
-        .all()
-    )
-    items: list[DeploymentOut] = []
-    for d in ds:
-        reps = None
+async def list_deployments(
+    response: Response,
+    limit: int = Query(settings.list_page_size, ge=1, le=settings.list_max_page_size),
+    cursor: str | None = None,
+    status: str | None = Query(None, description="comma-separated statuses"),
+    server_type: str | None = None,
+    live: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    # newest first, keyset-paginated on (created_at, id); the next page's cursor is in X-Next-Cursor
+    q = select(Deployment).where(Deployment.user_id == user.id)
+    if status:
+        q = q.where(Deployment.status.in_([x.strip().upper() for x in status.split(",") if x.strip()]))
+    if server_type:
+        q = q.where(Deployment.server_type == server_type.lower())
+    if cursor:
+        created, last_id = _decode_cursor(cursor)
+        q = q.where(tuple_(Deployment.created_at, Deployment.id) < tuple_(
+            literal(created, Deployment.created_at.type), literal(last_id, Deployment.id.type),
+        ))
+    q = q.order_by(Deployment.created_at.desc(), Deployment.id.desc()).limit(limit + 1)
+    ds = (await db.execute(q)).scalars().all()
+    if len(ds) > limit:
+        ds = ds[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(ds[-1])
+    reports: dict = {}
+    if live and ds:
         try:
-            rep = get_deployment_report(d.namespace, d.slug)
-            reps = rep
+            reports = await report_cache.get_many([(d.namespace, d.slug) for d in ds])
         except Exception:
-            reps = None
+            reports = {}
+    items: list[DeploymentOut] = []
+    for d in ds:
+        reps = reports.get((d.namespace, d.slug))
         items.append(
             DeploymentOut(
                 id=d.id,
@@ -169,14 +239,14 @@ def list_deployments(db: Session = Depends(get_db), user: User = Depends(get_cur
 
 
 @router.get("/deployments/{id}", response_model=DeploymentOut)
-def get_deployment(id: _uuid.UUID, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    d = db.query(Deployment).filter(Deployment.id == id, Deployment.user_id == user.id).first()
+async def get_deployment(id: _uuid.UUID, db: AsyncSession = Depends(get_async_db), user: CurrentUser = Depends(get_current_user)):
+    d = (await db.execute(select(Deployment).where(Deployment.id == id, Deployment.user_id == user.id))).scalars().first()
     if not d:
         raise HTTPException(status_code=404, detail="Not found")
     # include live counts in the single get response
     reps = None
     try:
-        reps = get_deployment_report(d.namespace, d.slug)
+        reps = await report_cache.get(d.namespace, d.slug)
     except Exception:
         reps = None
     return DeploymentOut(
@@ -198,16 +268,17 @@ def get_deployment(id: _uuid.UUID, db: Session = Depends(get_db), user: User = D
 
 
 @router.get("/deployments/{id}/status", response_model=DeploymentStatus)
-def get_deployment_status(id: _uuid.UUID, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    d = db.query(Deployment).filter(Deployment.id == id, Deployment.user_id == user.id).first()
+async def get_deployment_status(id: _uuid.UUID, db: AsyncSession = Depends(get_async_db), user: CurrentUser = Depends(get_current_user)):
+    d = (await db.execute(select(Deployment).where(Deployment.id == id, Deployment.user_id == user.id))).scalars().first()
     if not d:
         raise HTTPException(status_code=404, detail="Not found")
     # best-effort live check
     status = d.status
     report = None
     try:
-        status = check_ready_strict(d.namespace, d.slug)
-        report = get_deployment_report(d.namespace, d.slug)
+        report = await report_cache.get(d.namespace, d.slug)
+        if d.status != "DELETING":
+            status = report_state(report)
     except Exception:
         pass
     return DeploymentStatus(
@@ -224,57 +295,53 @@ def get_deployment_status(id: _uuid.UUID, db: Session = Depends(get_db), user: U
 
 
 @router.patch("/deployments/{id}/scale", response_model=DeploymentOut)
-def scale_deployment(id: _uuid.UUID, payload: ScaleRequest, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    d = db.query(Deployment).filter(Deployment.id == id, Deployment.user_id == user.id).first()
+async def scale_deployment(id: _uuid.UUID, payload: ScaleRequest, db: AsyncSession = Depends(get_async_db), user: CurrentUser = Depends(get_current_user)):
+    d = (await db.execute(select(Deployment).where(Deployment.id == id, Deployment.user_id == user.id))).scalars().first()
     if not d:
         raise HTTPException(status_code=404, detail="Not found")
     n = max(1, int(payload.replicas))
-    st = (d.server_type or "nginx").lower()
-
-    image = "nginx:alpine"
-    port = 80
-    doc_root = "/usr/share/nginx/html"
-    readiness_path = "/"
-    readiness_delay = 5
-    if st in ("apache", "httpd"):
-        image = "httpd:alpine"
-        port = 80
-        doc_root = "/usr/local/apache2/htdocs"
-    elif st == "tomcat":
-        image = "tomcat:9.0"
-        port = 8080
-        readiness_delay = 20
-    chart_dir = settings.helm_chart_path_tomcat if st == "tomcat" else settings.helm_chart_path
 
+    changed = True
     if settings.helm_enabled:
+        chart_dir = chart_dir_for(d.server_type)
+        values = chart_values(d.server_type, d.slug, d.namespace, d.ingress_host, n, d.index_html)
+        fingerprint = values_fingerprint(chart_dir, values)
         try:
-            values = {
-                "nameOverride": d.slug,
-                "namespace": d.namespace,
-                "host": d.ingress_host,
-                "image": image,
-                "containerPort": port,
-                "servicePort": 80 if st=="tomcat" else port,
-                "replicaCount": n,
-                "readiness": {"path": readiness_path, "initialDelaySeconds": readiness_delay},
-                "docRootPath": doc_root,
-            }
-            helm_upgrade_install(namespace=d.namespace, release=d.slug, chart_dir=chart_dir, values=values)
+            if fingerprint is not None and fingerprint == d.values_fingerprint:
+                # Same chart and values: at most the replica count differs. The
+                # stored count is carried into the next full upgrade, which
+                # keeps the release in line with the scale patch.
+                changed = d.applied_replicas != n
+                if changed:
+                    await k8s_async.patch_replicas(d.namespace, d.slug, n)
+            else:
+                await helm_executor.run(namespace=d.namespace, release=d.slug, chart_dir=chart_dir, values=values)
+                d.values_fingerprint = fingerprint
+            d.applied_replicas = n
         except Exception as e:
             try:
-                k8s.AppsV1Api().patch_namespaced_deployment(name=d.slug, namespace=d.namespace, body={"spec": {"replicas": n}})
+                await k8s_async.patch_replicas(d.namespace, d.slug, n)
+                d.applied_replicas = n
                 d.last_error = f"Scale fallback: {e}"
             except Exception as ee:
                 raise HTTPException(status_code=500, detail=str(ee))
     else:
         try:
-            k8s.AppsV1Api().patch_namespaced_deployment(name=d.slug, namespace=d.namespace, body={"spec": {"replicas": n}})
+            await k8s_async.patch_replicas(d.namespace, d.slug, n)
         except Exception as ee:
             raise HTTPException(status_code=500, detail=str(ee))
+        d.applied_replicas = n
+    if changed:
+        # a worker follows the rollout and records the resulting status
+        jobs.enqueue(db, "scale", d.id, {"replicas": n})
+    db.add(d)
+    await db.commit()
+    jobs.notify()
+    await report_cache.invalidate(d.namespace, d.slug)
 
     rep = None
     try:
-        rep = get_deployment_report(d.namespace, d.slug)
+        rep = await report_cache.get(d.namespace, d.slug)
     except Exception:
         rep = None
     return DeploymentOut(
@@ -295,112 +362,359 @@ def scale_deployment(id: _uuid.UUID, payload: ScaleRequest, db: Session = Depend
     )
 
 
+@router.post("/deployments:scale", response_model=list[BatchScaleResult])
+async def scale_deployments_batch(payload: BatchScaleRequest, db: AsyncSession = Depends(get_async_db), user: CurrentUser = Depends(get_current_user)):
+    q = select(Deployment).where(Deployment.user_id == user.id, Deployment.status != "DELETING")
+    if payload.items is not None:
+        targets = {item.id: max(1, int(item.replicas)) for item in payload.items}
+        q = q.where(Deployment.id.in_(list(targets)))
+    else:
+        if payload.replicas is None:
+            raise HTTPException(status_code=422, detail="replicas is required with a selector")
+        sel = payload.selector or DeploymentSelector()
+        if sel.server_type:
+            q = q.where(Deployment.server_type == sel.server_type.lower())
+        if sel.status:
+            q = q.where(Deployment.status == sel.status)
+        targets = None
+    ds = (await db.execute(q)).scalars().all()
+    if targets is None:
+        targets = {d.id: max(1, int(payload.replicas or 1)) for d in ds}
+    if len(targets) > settings.batch_max_items:
+        raise HTTPException(status_code=413, detail=f"at most {settings.batch_max_items} items per batch")
+    found = {d.id: d for d in ds}
+    results = {i: BatchScaleResult(id=i, ok=False, replicas=n, error="Not found") for i, n in targets.items() if i not in found}
+    limit = asyncio.Semaphore(settings.batch_concurrency)
+    changed: list[Deployment] = []
+
+    async def scale(d: Deployment, n: int) -> None:
+        # scale subresource only; the values fingerprint does not cover replicas, and the
+        # stored count is carried into the next full upgrade
+        async with limit:
+            try:
+                if d.applied_replicas != n:
+                    await k8s_async.patch_replicas(d.namespace, d.slug, n)
+                    d.applied_replicas = n
+                    changed.append(d)
+                results[d.id] = BatchScaleResult(id=d.id, ok=True, replicas=n)
+            except Exception as e:
+                results[d.id] = BatchScaleResult(id=d.id, ok=False, replicas=n, error=str(e))
+
+    await asyncio.gather(*(scale(d, targets[d.id]) for d in ds))
+    for d in changed:
+        await report_cache.invalidate(d.namespace, d.slug)
+
+    if payload.wait and changed:
+        async def ready(d: Deployment) -> None:
+            try:
+                await k8s_async.wait_deployment_ready(d.namespace, d.slug, timeout_s=payload.timeout_s)
+                results[d.id].ready = True
+            except Exception as e:
+                results[d.id].ready = False
+                results[d.id].error = str(e)
+
+        # one combined wait: every rollout is followed at once against the same deadline
+        await asyncio.gather(*(ready(d) for d in changed))
+    else:
+        for d in changed:
+            # a worker follows the rollout and records the resulting status
+            jobs.enqueue(db, "scale", d.id, {"replicas": d.applied_replicas})
+    await db.commit()
+    jobs.notify()
+    return [results[i] for i in targets]
+
+
+def _event_producer(id: _uuid.UUID, namespace: str, name: str, recorded_status: str):
+    # one poller per deployment, shared by every open stream through deployment_events;
+    # a frame is only produced when the status or report changed
+    async def produce():
+        last = None
+        with status_feed.watch(lambda ev: ev.get("id") == str(id)) as changed:
+            while True:
+                try:
+                    report = await report_cache.get(namespace, name)
+                    status = report_state(report)
+                except Exception:
+                    status = recorded_status
+                    report = None
+                # like GET /status, a DELETING row stays DELETING; an ERROR verdict
+                # written while this stream is open (e.g. the ready timeout) is shown too
+                if changed.last and changed.last["new"] in ("DELETING", "ERROR"):
+                    status = changed.last["new"]
+                elif not changed.last and recorded_status == "DELETING":
+                    status = recorded_status
+                if (status, report) != last:
+                    last = (status, report)
+                    yield {
+                        "id": str(id),
+                        "status": status,
+                        "report": report or {},
+                        "ts": int(time.time()),
+                    }
+                if status in {"READY", "ERROR"}:
+                    return
+                # status writes anywhere wake this early (services/status_feed.py)
+                await changed.wait(settings.sse_interval_s)
+
+    return produce
+
+
+def _log_producer(namespace: str, name: str):
+    # one set of follow-mode log streams per deployment, shared through deployment_logs
+    async def produce():
+        async for lines in follow_logs(namespace, name):
+            yield {"lines": lines}
+
+    return produce
+
+
+_LIVE_FIELDS = ("replicas", "ready_replicas", "available_replicas", "updated_replicas", "endpoints")
+
+
+def _user_producer(user_id: int):
+    # one poller per user, shared by all of that user's dashboard connections through user_events;
+    # a frame is only produced when some deployment's status or replica counts changed
+    async def produce():
+        last = None
+        with status_feed.watch(lambda ev: ev.get("user_id") == user_id) as changed:
+            while True:
+                try:
+                    async with AsyncSessionLocal() as db:
+                        rows = (await db.execute(
+                            select(Deployment.id, Deployment.namespace, Deployment.slug, Deployment.status, Deployment.last_error)
+                            .where(Deployment.user_id == user_id)
+                            .order_by(Deployment.created_at.desc(), Deployment.id.desc())
+                            .limit(settings.list_max_page_size)
+                        )).all()
+                except (SQLAlchemyError, OSError) as e:
+                    # the producer is shared by every dashboard of this user: keep it alive
+                    # and retry on the next tick rather than ending the list channel
+                    log.warning("deployment list for user %s failed: %s", user_id, e)
+                    await changed.wait(settings.sse_interval_s)
+                    continue
+                try:
+                    reports = await report_cache.get_many([(r.namespace, r.slug) for r in rows]) if rows else {}
+                except Exception:
+                    reports = {}
+                snapshot = {}
+                for r in rows:
+                    rep = reports.get((r.namespace, r.slug)) or {}
+                    snapshot[str(r.id)] = {"status": r.status, "last_error": r.last_error, **{k: rep.get(k) for k in _LIVE_FIELDS}}
+                if snapshot != last:
+                    last = snapshot
+                    yield snapshot
+                await changed.wait(settings.sse_interval_s)
+
+    return produce
+
+
+def _stream_token(conn: HTTPConnection) -> str | None:
+    # Authorization header or token query parameter (EventSource and WebSocket cannot set headers)
+    auth = conn.headers.get("authorization") or ""
+    if auth.lower().startswith("bearer ") and len(auth.split()) > 1:
+        return auth.split()[1]
+    return conn.query_params.get("token")
+
+
+async def _tagged(kind: str, frames):
+    async for cursor, frame in frames:
+        yield kind, cursor, frame
+
+
 @router.get("/deployments/{id}/events")
-def stream_deployment_events(id: _uuid.UUID, request: Request, db: Session = Depends(get_db)):
-    # authenticate via Authorization header or token query parameter
-    auth = request.headers.get("authorization") or ""
-    token = request.query_params.get("token")
-    sub = None
-    if auth.lower().startswith("bearer "):
-        try:
-            sub = decode_token(auth.split()[1]).get("sub")
-        except Exception:
-            sub = None
-    if not sub and token:
-        try:
-            sub = decode_token(token).get("sub")
-        except Exception:
-            sub = None
-    if not sub:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user = db.query(User).filter(User.email == sub).first()
-    if not user:
+async def stream_deployment_events(id: _uuid.UUID, request: Request, logs: bool = True, db: AsyncSession = Depends(get_async_db)):
+    token = _stream_token(request)
+    if not token:
         raise HTTPException(status_code=401, detail="Unauthorized")
+    user = await resolve_token(token, db)
 
-    d = db.query(Deployment).filter(Deployment.id == id, Deployment.user_id == user.id).first()
+    d = (await db.execute(select(Deployment).where(Deployment.id == id, Deployment.user_id == user.id))).scalars().first()
     if not d:
         raise HTTPException(status_code=404, detail="Not found")
 
-    def iter_events():
-        import json
-        import time
-        deadline = time.time() + 180
-        while time.time() < deadline:
-            try:
-                status = check_ready_strict(d.namespace, d.slug)
-                report = get_deployment_report(d.namespace, d.slug)
-                # Tail last N lines of pod logs for deeper insight
-                logs: dict = {}
-                try:
-                    core = k8s_client.CoreV1Api()
-                    pods = core.list_namespaced_pod(d.namespace, label_selector=f"app={d.slug}").items
-                    for p in pods:
-                        pod_logs = {}
-                        spec = p.spec or None
-                        containers = getattr(spec, 'containers', []) or []
-                        for c in containers:
-                            try:
-                                text = core.read_namespaced_pod_log(p.metadata.name, d.namespace, container=c.name, tail_lines=40, timestamps=True)
-                                pod_logs[c.name] = text
-                            except K8sApiException:
-                                pod_logs[c.name] = ''
-                        logs[p.metadata.name] = pod_logs
-                except Exception:
-                    logs = {}
-            except Exception:
-                status = d.status
-                report = None
-                logs = {}
-            payload = {
-                "id": str(d.id),
-                "status": status,
-                "report": report or {},
-                "logs": logs,
-                "ts": int(time.time()),
-            }
-            yield f"data: {json.dumps(payload)}\n\n"
-            if status in {"READY", "ERROR"}:
-                break
-            time.sleep(2)
+    # resume: the browser sends back the id of the last event it received
+    last_id = request.headers.get("last-event-id") or request.query_params.get("lastEventId") or ""
+    status_after, _, logs_after = last_id.partition(".")
+
+    async def iter_events():
+        # The first status frame is a full "snapshot"; later ones are "patch"
+        # events carrying a JSON merge patch against what this client already
+        # has, and unchanged ticks send nothing. The status frames end at
+        # READY/ERROR. New log lines are "log" events and keep flowing until
+        # the client leaves or SSE_MAX_DURATION_S. Event ids are
+        # "<status cursor>.<log cursor>" so a reconnect resumes both.
+        timeout_s = settings.sse_max_duration_s
+        state = deployment_events.lookup(d.id, status_after)
+        cursors = [status_after if state is not None else "", logs_after]
+        streams = [_tagged("status", deployment_events.subscribe(d.id, _event_producer(d.id, d.namespace, d.slug, d.status), timeout_s=timeout_s, after=status_after))]
+        if logs:
+            streams.append(_tagged("log", deployment_logs.subscribe(d.id, _log_producer(d.namespace, d.slug), timeout_s=timeout_s, after=logs_after)))
+        async for frame in merge(*streams, heartbeat_s=settings.sse_heartbeat_s):
+            if frame is HEARTBEAT:
+                yield ": ping\n\n"
+                continue
+            kind, cursor, payload = frame
+            if kind == "status":
+                cursors[0] = cursor
+                if state is None:
+                    event, data = "snapshot", payload
+                else:
+                    event, data = "patch", merge_patch(state, payload)
+                state = payload
+                if not data:
+                    continue
+            else:
+                cursors[1] = cursor
+                event, data = kind, payload
+            yield f"id: {cursors[0]}.{cursors[1]}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
         yield "event: end\n\n"
 
     return StreamingResponse(iter_events(), media_type="text/event-stream")
 
 
+@router.websocket("/deployments/stream")
+async def deployments_stream(ws: WebSocket):
+    """One connection per dashboard.
+
+    Pushes ``list`` (then ``list_patch``) messages with the status and replica
+    counts of all of the user's deployments. The client can send
+    ``{"op": "subscribe", "id": ..., "logs": true}`` to also get that
+    deployment's ``snapshot``/``patch``/``log`` messages, and
+    ``{"op": "unsubscribe", "id": ...}`` to stop them. The pollers behind it
+    are the same shared ones the SSE endpoint uses.
+    """
+    token = _stream_token(ws)
+    try:
+        if not token:
+            raise HTTPException(status_code=401, detail="Unauthorized")
+        async with AsyncSessionLocal() as db:
+            user = await resolve_token(token, db)
+    except HTTPException:
+        await ws.close(code=http_status.WS_1008_POLICY_VIOLATION)
+        return
+    await ws.accept()
+
+    out: asyncio.Queue = asyncio.Queue(maxsize=max(1, settings.sse_queue_size))
+    subs: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def pump(kind: str, id: str, frames) -> None:
+        async for _, frame in frames:
+            await out.put((kind, id, frame))
+        await out.put((kind, id, None))
+
+    def start(kind: str, id: str, frames) -> None:
+        if (kind, id) not in subs:
+            subs[(kind, id)] = asyncio.create_task(pump(kind, id, frames))
+
+    def stop(kind: str, id: str) -> None:
+        task = subs.pop((kind, id), None)
+        if task:
+            task.cancel()
+
+    async def subscribe(msg: dict) -> None:
+        try:
+            did = _uuid.UUID(str(msg.get("id")))
+        except ValueError:
+            await out.put(("error", str(msg.get("id")), "Invalid id"))
+            return
+        id = str(did)
+        if len({i for _, i in subs} - {"", id}) >= settings.ws_max_subscriptions:
+            await out.put(("error", id, "Too many subscriptions"))
+            return
+        async with AsyncSessionLocal() as db:
+            d = (await db.execute(select(Deployment).where(Deployment.id == did, Deployment.user_id == user.id))).scalars().first()
+        if not d:
+            await out.put(("error", id, "Not found"))
+            return
+        start("status", id, deployment_events.subscribe(d.id, _event_producer(d.id, d.namespace, d.slug, d.status)))
+        if msg.get("logs"):
+            start("log", id, deployment_logs.subscribe(d.id, _log_producer(d.namespace, d.slug)))
+
+    async def read() -> None:
+        while True:
+            try:
+                msg = await ws.receive_json()
+            except ValueError:
+                await out.put(("error", "", "Invalid message"))
+                continue
+            op = msg.get("op") if isinstance(msg, dict) else None
+            if op == "subscribe":
+                await subscribe(msg)
+            elif op == "unsubscribe":
+                id = str(msg.get("id"))
+                stop("status", id)
+                stop("log", id)
+            else:
+                await out.put(("error", "", f"Unknown op: {op}"))
+
+    start("list", "", user_events.subscribe(user.id, _user_producer(user.id)))
+    reader = asyncio.create_task(read())
+    states: dict[tuple[str, str], dict] = {}
+    get: asyncio.Task | None = None
+    try:
+        while True:
+            get = get or asyncio.create_task(out.get())
+            done, _ = await asyncio.wait({get, reader}, return_when=asyncio.FIRST_COMPLETED)
+            if get not in done:
+                break  # the client went away (or the reader failed)
+            kind, id, frame = get.result()
+            get = None
+            if kind == "error":
+                msg = {"type": "error", "id": id or None, "detail": frame}
+            elif frame is None:
+                subs.pop((kind, id), None)
+                states.pop((kind, id), None)
+                msg = {"type": "end", "channel": kind, "id": id or None}
+            elif kind == "log":
+                msg = {"type": "log", "id": id, "lines": frame["lines"]}
+            else:
+                prev = states.get((kind, id))
+                states[(kind, id)] = frame
+                name = "list" if kind == "list" else "snapshot"
+                if prev is None:
+                    msg = {"type": name, "id": id or None, "data": frame}
+                else:
+                    patch = merge_patch(prev, frame)
+                    if not patch:
+                        continue
+                    msg = {"type": f"{name}_patch" if kind == "list" else "patch", "id": id or None, "data": patch}
+            await ws.send_text(json.dumps(msg, separators=(",", ":")))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # the subscription tasks unsubscribe as they unwind; nothing to wait for
+        for task in [reader, *subs.values(), *([get] if get else [])]:
+            task.cancel()
+        if reader.done() and not reader.cancelled():
+            reader.exception()
+
+
 @router.get("/deployments/{id}/details")
-def get_deployment_details(id: _uuid.UUID, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    d = db.query(Deployment).filter(Deployment.id == id, Deployment.user_id == user.id).first()
+async def get_deployment_details(id: _uuid.UUID, db: AsyncSession = Depends(get_async_db), user: CurrentUser = Depends(get_current_user)):
+    d = (await db.execute(select(Deployment).where(Deployment.id == id, Deployment.user_id == user.id))).scalars().first()
     if not d:
         raise HTTPException(status_code=404, detail="Not found")
-    from ..services.k8s import get_deployment_report, get_pod_details, get_namespace_events
     try:
-        report = get_deployment_report(d.namespace, d.slug)
-        pods = get_pod_details(d.namespace, d.slug)
-        events = get_namespace_events(d.namespace, field_selector=f"involvedObject.kind=Pod,involvedObject.namespace={d.namespace}")
+        return await k8s_async.get_deployment_details(d.namespace, d.slug)
     except Exception:
-        report, pods, events = {}, [], []
-    return {"report": report, "pods": pods, "events": events}
+        return {"report": {}, "pods": [], "events": []}
 
 
-@router.delete("/deployments/{id}")
-def delete_deployment(id: _uuid.UUID, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    d = db.query(Deployment).filter(Deployment.id == id, Deployment.user_id == user.id).first()
+@router.delete("/deployments/{id}", status_code=202)
+async def delete_deployment(id: _uuid.UUID, response: Response, db: AsyncSession = Depends(get_async_db), user: CurrentUser = Depends(get_current_user)):
+    d = (await db.execute(select(Deployment).where(Deployment.id == id, Deployment.user_id == user.id))).scalars().first()
     if not d:
         raise HTTPException(status_code=404, detail="Not found")
+    status_url = f"/deployments/{d.id}/status"
+    response.headers["Location"] = status_url
+    if d.status == "DELETING":
+        # already in the pipeline; repeat requests do not queue a second teardown
+        return {"id": str(d.id), "status": d.status, "status_url": status_url}
+    # the delete job uninstalls, deletes the namespace, waits for it, then drops the row;
+    # the status URL answers 404 once that is done
     d.status = "DELETING"
-    db.commit()
-    try:
-        if settings.helm_enabled:
-            helm_uninstall(namespace=d.namespace, release=d.slug)
-        delete_namespace(d.namespace)
-        wait_namespace_gone(d.namespace)
-        # scrub from DB after confirmed deletion
-        db.delete(d)
-        db.commit()
-        return {"ok": True}
-    except Exception as e:
-        d.status = "ERROR"
-        d.last_error = str(e)
-        db.add(d)
-        db.commit()
-        raise HTTPException(status_code=500, detail=str(e))
+    d.last_error = None
+    jobs.enqueue(db, "delete", d.id)
+    await db.commit()
+    jobs.notify()
+    return {"id": str(d.id), "status": d.status, "status_url": status_url}
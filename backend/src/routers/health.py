@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
-from kubernetes import client, config
+from ..core.metrics import metrics
+from ..services.informer import tenant_cache
+from ..services.kube_client import kube
 
 router = APIRouter()
 
@@ -9,12 +11,8 @@ router = APIRouter()
 def cluster_health():
     info = {"k8s": False, "ingress": False}
     try:
-        try:
-            config.load_incluster_config()
-        except Exception:
-            config.load_kube_config()
+        apps = kube.apps
         info["k8s"] = True
-        apps = client.AppsV1Api()
         # Prefer Traefik (k3d/k3s), fall back to ingress-nginx
         try:
             dep = apps.read_namespaced_deployment("traefik", "kube-system")
@@ -25,3 +23,13 @@ def cluster_health():
     except Exception as e:
         info["error"] = str(e)
     return info
+
+
+@router.get("/cache")
+def cache_health():
+    return tenant_cache.status()
+
+
+@router.get("/metrics")
+def process_metrics():
+    return metrics.snapshot()
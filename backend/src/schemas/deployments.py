@@ -1,4 +1,5 @@
 import uuid as _uuid
+
 from pydantic import BaseModel
 
 
@@ -27,6 +28,17 @@ class DeploymentOut(BaseModel):
     endpoints: int | None = None
 
 
+class BatchCreateRequest(BaseModel):
+    items: list[DeploymentCreate]
+
+
+class BatchCreateResult(BaseModel):
+    index: int
+    ok: bool
+    deployment: DeploymentOut | None = None
+    error: str | None = None
+
+
 class DeploymentStatus(BaseModel):
     id: _uuid.UUID
     status: str
@@ -41,3 +53,31 @@ class DeploymentStatus(BaseModel):
 
 class ScaleRequest(BaseModel):
     replicas: int
+
+
+class BatchScaleItem(BaseModel):
+    id: _uuid.UUID
+    replicas: int
+
+
+class DeploymentSelector(BaseModel):
+    # all of the caller's deployments when both are empty
+    server_type: str | None = None
+    status: str | None = None
+
+
+class BatchScaleRequest(BaseModel):
+    # either explicit items, or a selector plus one replica count
+    items: list[BatchScaleItem] | None = None
+    selector: DeploymentSelector | None = None
+    replicas: int | None = None
+    wait: bool = False
+    timeout_s: int = 180
+
+
+class BatchScaleResult(BaseModel):
+    id: _uuid.UUID
+    ok: bool
+    replicas: int
+    ready: bool | None = None
+    error: str | None = None
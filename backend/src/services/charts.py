@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+import yaml
+
+from ..core.config import settings
+from .k8s import MANAGED_LABEL, MANAGED_VALUE, apply_manifests
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Chart:
+    name: str
+    path: str
+    version: str
+    digest: str
+    defaults: dict
+
+
+class ChartEngine:
+    """Render the tenant charts in-process and apply them with server-side apply.
+
+    Chart metadata and default values are read once per chart directory and the
+    directory contents are hashed into a digest. Rendering is done by a Python
+    renderer per chart that mirrors its templates (the Go templates themselves
+    are not executed), and rendered manifests are kept in an LRU keyed by
+    chart digest plus a hash of the release inputs. A template edit therefore
+    needs the matching renderer change; tests/test_charts.py compares both
+    charts against ``helm template`` and fails on any difference.
+
+    No Helm release is recorded, so there is nothing for ``helm uninstall`` to
+    remove: engine-mode objects go away with the tenant namespace.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._charts: dict[str, Chart] = {}
+        self._rendered: OrderedDict[tuple[str, str], list[dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, chart_dir: str) -> Chart:
+        chart = self._charts.get(chart_dir)
+        if chart is not None:
+            return chart
+        with open(os.path.join(chart_dir, "Chart.yaml")) as f:
+            meta = yaml.safe_load(f) or {}
+        defaults: dict = {}
+        values_path = os.path.join(chart_dir, "values.yaml")
+        if os.path.exists(values_path):
+            with open(values_path) as f:
+                defaults = yaml.safe_load(f) or {}
+        if meta.get("name") not in _RENDERERS:
+            raise ValueError(f"no in-process renderer for chart {meta.get('name')!r}")
+        chart = Chart(name=meta["name"], path=chart_dir, version=str(meta.get("version", "")), digest=_dir_digest(chart_dir), defaults=defaults)
+        with self._lock:
+            self._charts[chart_dir] = chart
+        return chart
+
+    def preload(self, chart_dirs: list[str]) -> None:
+        for chart_dir in chart_dirs:
+            try:
+                self.load(chart_dir)
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                log.warning("chart %s not preloaded: %s", chart_dir, e)
+
+    def reload(self) -> None:
+        with self._lock:
+            self._charts.clear()
+            self._rendered.clear()
+
+    def render(self, chart_dir: str, namespace: str, release: str, values: Mapping[str, object]) -> list[dict]:
+        chart = self.load(chart_dir)
+        key = (chart.digest, _values_hash({"namespace": namespace, "release": release, "values": values}))
+        with self._lock:
+            cached = self._rendered.get(key)
+            if cached is not None:
+                self._rendered.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(cached)
+        merged = _merge(chart.defaults, values)
+        objs = _RENDERERS[chart.name](merged, chart)
+        for obj in objs:
+            obj["metadata"]["namespace"] = namespace
+        with self._lock:
+            self.misses += 1
+            self._rendered[key] = objs
+            while len(self._rendered) > settings.chart_render_cache_size:
+                self._rendered.popitem(last=False)
+        return copy.deepcopy(objs)
+
+    def install(self, namespace: str, release: str, chart_dir: str, values: Mapping[str, object]) -> None:
+        apply_manifests(self.render(chart_dir, namespace, release, values))
+
+
+def _dir_digest(path: str) -> str:
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for fn in sorted(files):
+            full = os.path.join(root, fn)
+            h.update(os.path.relpath(full, path).encode())
+            with open(full, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def _values_hash(values: Mapping[str, object]) -> str:
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _merge(base: Mapping, override: Mapping) -> dict:
+    # Helm semantics: maps merge recursively, everything else is replaced
+    out = copy.deepcopy(dict(base))
+    for k, v in override.items():
+        if isinstance(v, Mapping) and isinstance(out.get(k), Mapping):
+            out[k] = _merge(out[k], v)
+        else:
+            out[k] = copy.deepcopy(v)
+    return out
+
+
+def _fullname(v: dict, chart: Chart) -> str:
+    name = v.get("nameOverride") or chart.name
+    return str(name)[:63].removesuffix("-")
+
+
+def _labels(name: str) -> dict:
+    return {"app": name, MANAGED_LABEL: MANAGED_VALUE}
+
+
+def _service(name: str, port: int, target_port: int) -> dict:
+    return {
+        "apiVersion": "v1",
+        "kind": "Service",
+        "metadata": {"name": name, "labels": _labels(name)},
+        "spec": {"selector": {"app": name}, "ports": [{"port": port, "targetPort": target_port}]},
+    }
+
+
+def _ingress(name: str, host: str, port: int, ingress_class: str | None = None) -> dict:
+    spec: dict = {
+        "rules": [{
+            "host": host,
+            "http": {"paths": [{
+                "path": "/",
+                "pathType": "Prefix",
+                "backend": {"service": {"name": name, "port": {"number": port}}},
+            }]},
+        }],
+    }
+    if ingress_class:
+        spec["ingressClassName"] = ingress_class
+    return {
+        "apiVersion": "networking.k8s.io/v1",
+        "kind": "Ingress",
+        "metadata": {"name": name, "labels": _labels(name)},
+        "spec": spec,
+    }
+
+
+def _deployment(name: str, v: dict, container: dict, volumes: list | None = None) -> dict:
+    pod_spec: dict = {"containers": [container]}
+    if volumes:
+        pod_spec["volumes"] = volumes
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {"name": name, "labels": _labels(name)},
+        "spec": {
+            "replicas": v.get("replicaCount"),
+            "selector": {"matchLabels": {"app": name}},
+            "template": {"metadata": {"labels": _labels(name)}, "spec": pod_spec},
+        },
+    }
+
+
+def _render_tenant_nginx(v: dict, chart: Chart) -> list[dict]:
+    """Mirror of helm/tenant-nginx/templates."""
+    name = _fullname(v, chart)
+    port = v.get("containerPort") or 80
+    readiness = v.get("readiness") or {}
+    container: dict = {
+        "name": "web",
+        "image": v.get("image"),
+        "ports": [{"containerPort": port}],
+        "readinessProbe": {
+            "httpGet": {"path": readiness.get("path") or "/", "port": port},
+            "initialDelaySeconds": readiness.get("initialDelaySeconds") or 5,
+            "periodSeconds": 5,
+            "failureThreshold": 6,
+        },
+        "resources": v.get("resources") or {},
+    }
+    if v.get("command"):
+        container["command"] = v["command"]
+    post_start = ((v.get("lifecycle") or {}).get("postStart") or {})
+    if post_start.get("enabled"):
+        container["lifecycle"] = {"postStart": {"exec": {"command": post_start.get("command") or []}}}
+    objs: list[dict] = []
+    volumes = None
+    if v.get("indexHtml"):
+        objs.append({
+            "apiVersion": "v1",
+            "kind": "ConfigMap",
+            "metadata": {"name": f"{name}-index", "labels": _labels(name)},
+            "data": {"index.html": str(v["indexHtml"]).rstrip("\n") + "\n"},
+        })
+        container["volumeMounts"] = [{"name": "html", "mountPath": v.get("docRootPath") or "/usr/share/nginx/html"}]
+        volumes = [{"name": "html", "configMap": {"name": f"{name}-index"}}]
+    service_port = v.get("servicePort") or 80
+    objs += [
+        _deployment(name, v, container, volumes),
+        _service(name, service_port, port),
+        _ingress(name, v.get("host"), service_port, v.get("ingressClass")),
+    ]
+    return objs
+
+
+# the template's folded (>-) block keeps the newlines around its indented line
+_TOMCAT_POST_START = (
+    "if [ ! -d /usr/local/tomcat/webapps/ROOT ]; then\n"
+    "  cp -r /usr/local/tomcat/webapps.dist/* /usr/local/tomcat/webapps/;\n"
+    "fi"
+)
+
+
+def _render_tenant_tomcat(v: dict, chart: Chart) -> list[dict]:
+    """Mirror of helm/tenant-tomcat/templates."""
+    name = _fullname(v, chart)
+    port = v.get("containerPort") or 8080
+    readiness = v.get("readiness") or {}
+    container = {
+        "name": "tomcat",
+        "image": v.get("image"),
+        "command": ["catalina.sh", "run"],
+        "ports": [{"containerPort": port}],
+        "readinessProbe": {
+            "httpGet": {"path": readiness.get("path") or "/", "port": port},
+            "initialDelaySeconds": readiness.get("initialDelaySeconds") or 20,
+            "periodSeconds": 5,
+            "failureThreshold": 6,
+        },
+        "lifecycle": {"postStart": {"exec": {"command": ["bash", "-c", _TOMCAT_POST_START]}}},
+    }
+    service_port = v.get("servicePort") or 80
+    return [
+        _deployment(name, v, container),
+        _service(name, service_port, port),
+        _ingress(name, v.get("host"), service_port),
+    ]
+
+
+_RENDERERS: dict[str, Callable[[dict, Chart], list[dict]]] = {
+    "tenant-nginx": _render_tenant_nginx,
+    "tenant-tomcat": _render_tenant_tomcat,
+}
+
+
+chart_engine = ChartEngine()
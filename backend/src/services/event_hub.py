@@ -0,0 +1,210 @@
+"""Per-key broadcast of server-sent event frames.
+
+The first subscriber to a key starts one producer task; later subscribers
+attach to it and first get the last ``replay`` frames. Each subscriber reads
+from a bounded queue. When a slow reader's queue is full, its oldest frame is
+dropped, which loses nothing for snapshot frames (only the newest matters)
+and trims the backlog for incremental ones such as log lines. When the last
+subscriber leaves, the channel lingers for ``linger_s`` with its producer still
+running, so a client that reconnects in that window resumes without a gap;
+after it the producer is cancelled and the channel dropped.
+
+Every frame gets a cursor, ``<epoch>-<seq>``, where the epoch identifies one
+producer run. A subscriber passing the cursor of a frame still held in the
+channel's ``history`` resumes right after it; any other cursor (an older run,
+or a frame already evicted) gets the normal replay.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Hashable
+from typing import Any
+
+from ..core.config import settings
+from ..core.metrics import metrics
+
+log = logging.getLogger(__name__)
+
+Producer = Callable[[], AsyncIterator[Any]]
+
+_END = object()
+HEARTBEAT = object()
+
+
+class _Channel:
+    def __init__(self, history: int) -> None:
+        self.subscribers: set[asyncio.Queue] = set()
+        self.epoch = f"{time.time_ns():x}"
+        self.seq = 0
+        self.recent: deque[tuple[int, Any]] = deque(maxlen=history)
+        self.task: asyncio.Task | None = None
+        self.expiry: asyncio.TimerHandle | None = None
+        self.done = False
+
+    def cursor(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def position(self, cursor: str | None) -> int | None:
+        """Index in ``recent`` just after the frame ``cursor`` names, if it is still held."""
+        epoch, _, seq = (cursor or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        for i, (s, _) in enumerate(self.recent):
+            if s == int(seq):
+                return i + 1
+        return None
+
+
+class EventHub:
+    def __init__(self, name: str, replay: int = 1, history: int | None = None, linger_s: float = 0) -> None:
+        self._name = name
+        self._replay = replay
+        self._linger_s = linger_s
+        self._history = max(history or replay, replay, 1)
+        self._channels: dict[Hashable, _Channel] = {}
+        metrics.gauge(f"{name}_channels", lambda: len(self._channels))
+        metrics.gauge(f"{name}_subscribers", lambda: sum(len(c.subscribers) for c in self._channels.values()))
+
+    def _offer(self, q: asyncio.Queue, item: Any) -> None:
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except asyncio.QueueFull:
+                q.get_nowait()
+                metrics.inc(f"{self._name}_dropped_total")
+
+    async def _pump(self, key: Hashable, ch: _Channel, producer: Producer) -> None:
+        try:
+            async for item in producer():
+                ch.seq += 1
+                ch.recent.append((ch.seq, item))
+                frame = (ch.cursor(ch.seq), item)
+                for q in list(ch.subscribers):
+                    self._offer(q, frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("%s: producer for %s failed", self._name, key)
+        finally:
+            ch.done = True
+            for q in list(ch.subscribers):
+                self._offer(q, _END)
+            if self._channels.get(key) is ch:
+                del self._channels[key]
+
+    def _close(self, key: Hashable, ch: _Channel) -> None:
+        ch.expiry = None
+        if ch.subscribers or ch.done:
+            return
+        ch.task.cancel()
+        if self._channels.get(key) is ch:
+            del self._channels[key]
+
+    def lookup(self, key: Hashable, cursor: str | None) -> Any | None:
+        """The frame ``cursor`` names, if its channel still holds it."""
+        ch = self._channels.get(key)
+        i = ch.position(cursor) if ch else None
+        return ch.recent[i - 1][1] if i else None
+
+    async def subscribe(self, key: Hashable, producer: Producer, timeout_s: float | None = None, after: str | None = None) -> AsyncIterator[tuple[str, Any]]:
+        """Yield ``(cursor, frame)`` for ``key``, starting ``producer`` if nobody is watching it yet.
+
+        The iteration ends when the producer finishes or after ``timeout_s``.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s if timeout_s is not None else None
+        ch = self._channels.get(key)
+        if ch is None:
+            ch = self._channels[key] = _Channel(self._history)
+        if ch.expiry is not None:
+            ch.expiry.cancel()
+            ch.expiry = None
+        start = ch.position(after)
+        backlog = list(ch.recent)[start:] if start is not None else list(ch.recent)[-self._replay:]
+        q: asyncio.Queue = asyncio.Queue(maxsize=max(1, settings.sse_queue_size, len(backlog)))
+        ch.subscribers.add(q)
+        for seq, item in backlog:
+            q.put_nowait((ch.cursor(seq), item))
+        if ch.task is None:
+            ch.task = asyncio.create_task(self._pump(key, ch, producer))
+        try:
+            while True:
+                if deadline is None:
+                    item = await q.get()
+                else:
+                    try:
+                        item = await asyncio.wait_for(q.get(), max(deadline - loop.time(), 0))
+                    except TimeoutError:
+                        return
+                if item is _END:
+                    return
+                yield item
+        finally:
+            ch.subscribers.discard(q)
+            if not ch.subscribers and not ch.done:
+                if self._linger_s > 0:
+                    ch.expiry = loop.call_later(self._linger_s, self._close, key, ch)
+                else:
+                    self._close(key, ch)
+
+
+deployment_events = EventHub("sse", history=settings.sse_resume_history, linger_s=settings.sse_resume_linger_s)
+deployment_logs = EventHub("sse_logs", replay=settings.sse_log_replay, history=settings.sse_resume_history, linger_s=settings.sse_resume_linger_s)
+user_events = EventHub("ws_user")
+
+
+async def merge(*streams: AsyncIterator[Any], heartbeat_s: float | None = None) -> AsyncIterator[Any]:
+    """Interleave ``streams`` until all of them end.
+
+    With ``heartbeat_s``, yields ``HEARTBEAT`` after that long without an item.
+    """
+    q: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    async def drain(stream: AsyncIterator[Any]) -> None:
+        try:
+            async for item in stream:
+                await q.put(item)
+        except Exception:
+            log.exception("stream failed")
+        await q.put(_END)
+
+    tasks = [asyncio.create_task(drain(s)) for s in streams]
+    try:
+        left = len(tasks)
+        while left:
+            try:
+                item = await asyncio.wait_for(q.get(), heartbeat_s)
+            except TimeoutError:
+                yield HEARTBEAT
+                continue
+            if item is _END:
+                left -= 1
+            else:
+                yield item
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def merge_patch(old: Any, new: Any) -> Any:
+    """RFC 7386 JSON merge patch turning ``old`` into ``new``; ``{}`` when they are equal.
+
+    Nested objects are diffed key by key, removed keys become ``None`` and
+    lists are replaced whole.
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return new
+    patch: dict = {}
+    for k, v in new.items():
+        if k not in old:
+            patch[k] = v
+        elif old[k] != v:
+            patch[k] = merge_patch(old[k], v)
+    for k in old.keys() - new.keys():
+        patch[k] = None
+    return patch
@@ -1,10 +1,13 @@
+import asyncio
 import os
 import subprocess
 import tempfile
-from typing import Mapping
+from collections.abc import Mapping
 
-from ..core.config import settings
 import yaml
+
+from ..core.config import settings
+from .charts import chart_engine
 from .k8s import ensure_namespace
 
 
@@ -15,30 +18,72 @@ def _helm_env() -> dict:
     return env
 
 
-def helm_upgrade_install(namespace: str, release: str, chart_dir: str, values: Mapping[str, object]) -> None:
-    ensure_namespace(namespace)
+def _write_values(values: Mapping[str, object]) -> str:
     os.makedirs("/tmp", exist_ok=True)
     with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as f:
         f.write(_values_yaml(values))
-        values_file = f.name
+        return f.name
+
+
+def _upgrade_cmd(namespace: str, release: str, chart_dir: str, values_file: str) -> list[str]:
+    return [
+        "helm", "upgrade", "--install", release, chart_dir,
+        "-n", namespace,
+        "-f", values_file,
+    ]
+
+
+def _unlink(path: str) -> None:
     try:
-        cmd = [
-            "helm", "upgrade", "--install", release, chart_dir,
-            "-n", namespace,
-            "-f", values_file,
-        ]
+        os.unlink(path)
+    except Exception:
+        pass
+
+
+def _use_cli() -> bool:
+    # "engine" renders in-process (services/charts.py); "cli" forks the helm binary
+    return settings.helm_mode == "cli"
+
+
+def helm_upgrade_install(namespace: str, release: str, chart_dir: str, values: Mapping[str, object]) -> None:
+    ensure_namespace(namespace)
+    if not _use_cli():
+        chart_engine.install(namespace, release, chart_dir, values)
+        return
+    values_file = _write_values(values)
+    try:
+        cmd = _upgrade_cmd(namespace, release, chart_dir, values_file)
         subprocess.run(cmd, check=True, env=_helm_env(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     finally:
-        try:
-            os.unlink(values_file)
-        except Exception:
-            pass
+        _unlink(values_file)
 
 
 def helm_uninstall(namespace: str, release: str) -> None:
+    """Remove a CLI-mode release.
+
+    A no-op in engine mode: no release exists, and the applied objects are
+    deleted together with the tenant namespace.
+    """
+    if not _use_cli():
+        return
     cmd = ["helm", "uninstall", release, "-n", namespace]
     subprocess.run(cmd, check=False, env=_helm_env(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
 
 
+async def _run_async(cmd: list[str], check: bool) -> None:
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, env=_helm_env(), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+    out, _ = await proc.communicate()
+    if check and proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=out)
+
+
+async def helm_uninstall_async(namespace: str, release: str) -> None:
+    if not _use_cli():
+        return
+    await _run_async(["helm", "uninstall", release, "-n", namespace], check=False)
+
+
 def _values_yaml(values: Mapping[str, object]) -> str:
     return yaml.safe_dump(dict(values), sort_keys=False)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from .helm import helm_upgrade_install
+
+
+@dataclass
+class _Job:
+    namespace: str
+    release: str
+    chart_dir: str
+    values: Mapping[str, object]
+    enqueued: float = field(default_factory=time.monotonic)
+    future: Future = field(default_factory=Future)
+
+
+class HelmExecutor:
+    """Bounded pool for helm upgrades with per-release coalescing.
+
+    At most ``helm_max_concurrency`` upgrades run at once and a release never
+    has two upgrades in flight. While an upgrade for a release is still queued,
+    later submissions replace its values and share its future, so a burst of
+    scale clicks results in one upgrade with the last desired values.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="helm")
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], _Job] = {}
+        self._running: set[tuple[str, str]] = set()
+        metrics.gauge("helm_queue_depth", lambda: len(self._pending))
+        metrics.gauge("helm_running", lambda: len(self._running))
+
+    def submit(self, namespace: str, release: str, chart_dir: str, values: Mapping[str, object]) -> Future:
+        key = (namespace, release)
+        with self._lock:
+            job = self._pending.get(key)
+            if job is not None:
+                job.chart_dir, job.values = chart_dir, values
+                metrics.inc("helm_coalesced_total")
+                return job.future
+            job = _Job(namespace, release, chart_dir, values)
+            self._pending[key] = job
+            metrics.inc("helm_submitted_total")
+            if key in self._running:
+                # started once the in-flight upgrade for this release finishes
+                return job.future
+        self._pool.submit(self._run, key)
+        return job.future
+
+    async def run(self, namespace: str, release: str, chart_dir: str, values: Mapping[str, object]) -> None:
+        await asyncio.wrap_future(self.submit(namespace, release, chart_dir, values))
+
+    def _run(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            job = self._pending.pop(key)
+            self._running.add(key)
+        metrics.observe("helm_queue_wait_seconds", time.monotonic() - job.enqueued)
+        started = time.monotonic()
+        try:
+            helm_upgrade_install(namespace=job.namespace, release=job.release, chart_dir=job.chart_dir, values=job.values)
+            job.future.set_result(None)
+        except Exception as e:
+            metrics.inc("helm_failed_total")
+            job.future.set_exception(e)
+        finally:
+            metrics.observe("helm_run_seconds", time.monotonic() - started)
+            with self._lock:
+                self._running.discard(key)
+                follow_up = key in self._pending
+            if follow_up:
+                self._pool.submit(self._run, key)
+
+
+helm_executor = HelmExecutor(settings.helm_max_concurrency)
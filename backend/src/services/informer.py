@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from kubernetes import watch
+from kubernetes.client import ApiException
+
+from ..core.config import settings
+from .kube_client import MANAGED_SELECTOR, kube
+
+log = logging.getLogger(__name__)
+
+
+class Informer:
+    """List+watch one resource kind across all namespaces into a local store.
+
+    Objects are kept as the typed client models, indexed by namespace then
+    name, and only for namespaces starting with ``namespace_prefix``. The watch
+    resumes from the last seen resourceVersion and falls back to a full relist
+    when the server reports it as expired (410 Gone).
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        list_fn: Callable[[], Callable[..., Any]],
+        label_selector: str | None,
+        namespace_prefix: str,
+        on_change: Callable[[], None] | None = None,
+    ) -> None:
+        self.kind = kind
+        self._list_fn = list_fn
+        self._label_selector = label_selector
+        self._prefix = namespace_prefix
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._store: dict[str, dict[str, Any]] = {}
+        self._rv: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._watch: watch.Watch | None = None
+        self.synced = False
+        self.watching = False
+        self.last_contact: float | None = None
+        self.relists = 0
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"informer-{self.kind}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watch:
+            self._watch.stop()
+
+    def get(self, namespace: str, name: str) -> Any | None:
+        with self._lock:
+            return self._store.get(namespace, {}).get(name)
+
+    def list(self, namespace: str) -> list[Any]:
+        with self._lock:
+            return list(self._store.get(namespace, {}).values())
+
+    def _bucket(self, obj: Any) -> str | None:
+        # cluster-scoped kinds (Namespace) live in the "" bucket, filtered by their own name
+        ns = obj.metadata.namespace
+        scope = ns or obj.metadata.name
+        if not scope or not scope.startswith(self._prefix):
+            return None
+        return ns or ""
+
+    def _changed(self) -> None:
+        if self._on_change:
+            self._on_change()
+
+    def staleness(self) -> float | None:
+        if not self.synced or self.last_contact is None:
+            return None
+        if self.watching:
+            return 0.0
+        return time.monotonic() - self.last_contact
+
+    def fresh(self) -> bool:
+        age = self.staleness()
+        return age is not None and age <= settings.informer_max_staleness_s
+
+    def status(self) -> dict:
+        with self._lock:
+            count = sum(len(v) for v in self._store.values())
+        age = self.staleness()
+        return {
+            "synced": self.synced,
+            "watching": self.watching,
+            "fresh": self.fresh(),
+            "staleness_s": round(age, 3) if age is not None else None,
+            "objects": count,
+            "resource_version": self._rv,
+            "relists": self.relists,
+        }
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                if self._rv is None:
+                    self._relist()
+                    backoff = 1.0
+                self._stream()
+                backoff = 1.0
+            except ApiException as e:
+                self.watching = False
+                if e.status == 410:
+                    # resourceVersion too old: start over from a fresh list
+                    self._rv = None
+                    continue
+                log.warning("informer %s: %s", self.kind, e)
+                self._rv = None
+            except Exception as e:
+                self.watching = False
+                log.warning("informer %s: %s", self.kind, e)
+                self._rv = None
+            if self._stop.wait(backoff):
+                return
+            backoff = min(backoff * 2, 30.0)
+
+    def _relist(self) -> None:
+        resp = self._list_fn()(label_selector=self._label_selector)
+        store: dict[str, dict[str, Any]] = {}
+        for obj in resp.items:
+            ns = self._bucket(obj)
+            if ns is not None:
+                store.setdefault(ns, {})[obj.metadata.name] = obj
+        with self._lock:
+            self._store = store
+        self._rv = resp.metadata.resource_version
+        self.relists += 1
+        self.synced = True
+        self.last_contact = time.monotonic()
+        self._changed()
+
+    def _stream(self) -> None:
+        timeout = settings.informer_watch_timeout_s
+        self._watch = watch.Watch()
+        self.watching = True
+        self.last_contact = time.monotonic()
+        try:
+            for ev in self._watch.stream(
+                self._list_fn(),
+                label_selector=self._label_selector,
+                resource_version=self._rv,
+                allow_watch_bookmarks=True,
+                timeout_seconds=timeout,
+                _request_timeout=timeout + 10,
+            ):
+                self.last_contact = time.monotonic()
+                if ev["type"] == "BOOKMARK":
+                    # Watch leaves bookmark objects undecoded
+                    self._rv = ev["raw_object"]["metadata"]["resourceVersion"]
+                    continue
+                obj = ev["object"]
+                self._rv = obj.metadata.resource_version
+                ns = self._bucket(obj)
+                if ns is None:
+                    continue
+                with self._lock:
+                    if ev["type"] == "DELETED":
+                        bucket = self._store.get(ns, {})
+                        bucket.pop(obj.metadata.name, None)
+                        if not bucket:
+                            self._store.pop(ns, None)
+                    else:
+                        self._store.setdefault(ns, {})[obj.metadata.name] = obj
+                self._changed()
+                if self._stop.is_set():
+                    break
+        finally:
+            self.watching = False
+            self.last_contact = time.monotonic()
+
+
+class TenantCache:
+    """Watch cache of tenant Namespaces, Deployments, Endpoints and Pods."""
+
+    def __init__(self) -> None:
+        prefix = settings.tenant_namespace_prefix
+        # only objects this API manages: every apply path stamps the label, and
+        # Endpoints inherit it from their Service
+        selector = MANAGED_SELECTOR
+        self.namespaces = Informer("namespaces", lambda: kube.core.list_namespace, None, prefix, self._notify)
+        self.deployments = Informer("deployments", lambda: kube.apps.list_deployment_for_all_namespaces, selector, prefix, self._notify)
+        self.endpoints = Informer("endpoints", lambda: kube.core.list_endpoints_for_all_namespaces, selector, prefix, self._notify)
+        self.pods = Informer("pods", lambda: kube.core.list_pod_for_all_namespaces, selector, prefix, self._notify)
+        self._subscribers: set[Callable[[], None]] = set()
+        self.started = False
+
+    def _informers(self) -> list[Informer]:
+        return [self.namespaces, self.deployments, self.endpoints, self.pods]
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` (from an informer thread) after every store change."""
+        self._subscribers.add(callback)
+
+    def unsubscribe(self, callback: Callable[[], None]) -> None:
+        self._subscribers.discard(callback)
+
+    def _notify(self) -> None:
+        for cb in list(self._subscribers):
+            try:
+                cb()
+            except Exception:
+                log.exception("tenant cache subscriber failed")
+
+    def start(self) -> None:
+        for inf in self._informers():
+            inf.start()
+        self.started = True
+
+    def stop(self) -> None:
+        for inf in self._informers():
+            inf.stop()
+        self.started = False
+
+    def serves(self, namespace: str) -> bool:
+        """True when reads for this namespace may be answered from memory."""
+        return (
+            self.started
+            and namespace.startswith(settings.tenant_namespace_prefix)
+            and all(inf.fresh() for inf in self._informers())
+        )
+
+    def pods_for(self, namespace: str, app: str) -> list[Any]:
+        return [p for p in self.pods.list(namespace) if (p.metadata.labels or {}).get("app") == app]
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.started,
+            "max_staleness_s": settings.informer_max_staleness_s,
+            **{inf.kind: inf.status() for inf in self._informers()},
+        }
+
+
+tenant_cache = TenantCache()
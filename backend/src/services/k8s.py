@@ -1,36 +1,24 @@
 from __future__ import annotations
-import os
+
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
 from dataclasses import dataclass
- 
 
-from kubernetes import client, config
+from kubernetes import client, watch
 from kubernetes.client import ApiException
 from tenacity import retry, stop_after_attempt, wait_fixed
-import time
 
 from ..core.config import settings
+from .informer import tenant_cache
+from .kube_client import MANAGED_LABEL, MANAGED_SELECTOR, MANAGED_VALUE, kube
 
+# server-side apply field manager for every object this API writes
+FIELD_MANAGER = "sas-k8s-sim-api"
+_PLURALS = {"ConfigMap": "configmaps", "Deployment": "deployments", "Service": "services", "Ingress": "ingresses"}
 
-def _load_kube() -> None:
-    if settings.kubeconfig and os.path.exists(settings.kubeconfig):
-        config.load_kube_config(config_file=settings.kubeconfig)
-    else:
-        # Try in-cluster (if running with proper ServiceAccount)
-        try:
-            config.load_incluster_config()
-        except Exception:
-            # Fallback to default kubeconfig location
-            try:
-                config.load_kube_config()
-            except Exception as e:
-                raise RuntimeError(f"Failed to load kube config: {e}")
-    if settings.insecure_kube:
-        try:
-            cfg = client.Configuration.get_default_copy()
-            cfg.verify_ssl = False
-            client.Configuration.set_default(cfg)
-        except Exception:
-            pass
+_fanout = ThreadPoolExecutor(max_workers=16, thread_name_prefix="k8s-fanout")
 
 
 @dataclass
@@ -51,8 +39,7 @@ class NginxSpec:
 
 @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
 def ensure_namespace(name: str) -> None:
-    _load_kube()
-    core = client.CoreV1Api()
+    core = kube.core
     try:
         core.read_namespace(name)
         return
@@ -63,19 +50,22 @@ def ensure_namespace(name: str) -> None:
     core.create_namespace(body)
 
 
-def apply_nginx(spec: NginxSpec) -> None:
-    _load_kube()
-    apps = client.AppsV1Api()
-    core = client.CoreV1Api()
-    net = client.NetworkingV1Api()
+def build_nginx_manifests(spec: NginxSpec) -> list[dict]:
+    """Complete object set for a raw (non-Helm) tenant, in apply order.
 
-    labels = {"app": spec.name}
+    The ConfigMap comes first and the Deployment already mounts it, so a create
+    is a single rollout.
+    """
+    selector = {"app": spec.name}
+    labels = {**selector, MANAGED_LABEL: MANAGED_VALUE}
 
     dep = client.V1Deployment(
+        api_version="apps/v1",
+        kind="Deployment",
         metadata=client.V1ObjectMeta(name=spec.name, labels=labels),
         spec=client.V1DeploymentSpec(
             replicas=spec.replicas,
-            selector=client.V1LabelSelector(match_labels=labels),
+            selector=client.V1LabelSelector(match_labels=selector),
             template=client.V1PodTemplateSpec(
                 metadata=client.V1ObjectMeta(labels=labels),
                 spec=client.V1PodSpec(
@@ -105,20 +95,25 @@ def apply_nginx(spec: NginxSpec) -> None:
         dep.spec.template.spec.containers[0].command = spec.command
     if spec.lifecycle_post_start:
         dep.spec.template.spec.containers[0].lifecycle = client.V1Lifecycle(
-            post_start=client.V1Handler(exec=client.V1ExecAction(command=spec.lifecycle_post_start))
+            post_start=client.V1LifecycleHandler(exec=client.V1ExecAction(command=spec.lifecycle_post_start))
         )
 
     svc = client.V1Service(
+        api_version="v1",
+        kind="Service",
         metadata=client.V1ObjectMeta(name=spec.name, labels=labels),
         spec=client.V1ServiceSpec(
-            selector=labels,
+            selector=selector,
             ports=[client.V1ServicePort(port=spec.port, target_port=spec.port)],
         ),
     )
 
     ing = client.V1Ingress(
+        api_version="networking.k8s.io/v1",
+        kind="Ingress",
         metadata=client.V1ObjectMeta(
             name=spec.name,
+            labels=labels,
         ),
         spec=client.V1IngressSpec(
             rules=[
@@ -143,182 +138,391 @@ def apply_nginx(spec: NginxSpec) -> None:
         ),
     )
 
-    # Create or patch
-    try:
-        apps.create_namespaced_deployment(namespace=spec.namespace, body=dep)
-    except ApiException as e:
-        if e.status == 409:
-            apps.patch_namespaced_deployment(name=spec.name, namespace=spec.namespace, body=dep)
-        else:
-            raise
-
-    # Optional index.html via ConfigMap
+    objs: list = []
     if spec.index_html:
-        cm = client.V1ConfigMap(
-            metadata=client.V1ObjectMeta(name=f"{spec.name}-index"),
+        objs.append(client.V1ConfigMap(
+            api_version="v1",
+            kind="ConfigMap",
+            metadata=client.V1ObjectMeta(name=f"{spec.name}-index", labels=labels),
             data={"index.html": spec.index_html},
-        )
-        try:
-            client.CoreV1Api().create_namespaced_config_map(namespace=spec.namespace, body=cm)
-        except ApiException as e:
-            if e.status == 409:
-                client.CoreV1Api().patch_namespaced_config_map(name=f"{spec.name}-index", namespace=spec.namespace, body=cm)
-            else:
-                raise
-        # patch deployment to mount
-        dep.spec.template.spec.volumes = (dep.spec.template.spec.volumes or []) + [
+        ))
+        dep.spec.template.spec.volumes = [
             client.V1Volume(name="html", config_map=client.V1ConfigMapVolumeSource(name=f"{spec.name}-index"))
         ]
         for c in dep.spec.template.spec.containers:
-            c.volume_mounts = (c.volume_mounts or []) + [client.V1VolumeMount(name="html", mount_path=spec.doc_root_path)]
-        try:
-            apps.patch_namespaced_deployment(name=spec.name, namespace=spec.namespace, body=dep)
-        except ApiException:
-            pass
+            c.volume_mounts = [client.V1VolumeMount(name="html", mount_path=spec.doc_root_path)]
+    objs += [dep, svc, ing]
+
+    for obj in objs:
+        obj.metadata.namespace = spec.namespace
+    return [kube.api_client.sanitize_for_serialization(obj) for obj in objs]
+
+
+def _apply_path(obj: dict) -> str:
+    group_version = obj["apiVersion"]
+    prefix = "/api/v1" if group_version == "v1" else f"/apis/{group_version}"
+    meta = obj["metadata"]
+    return f"{prefix}/namespaces/{meta['namespace']}/{_PLURALS[obj['kind']]}/{meta['name']}"
+
+
+def server_side_apply(obj: dict) -> dict:
+    """Create or update one object in a single server-side apply request."""
+    return kube.api_client.call_api(
+        _apply_path(obj),
+        "PATCH",
+        query_params=[("fieldManager", FIELD_MANAGER), ("force", "true")],
+        header_params={"Content-Type": "application/apply-patch+yaml", "Accept": "application/json"},
+        body=obj,
+        auth_settings=["BearerToken"],
+        response_type="object",
+        _return_http_data_only=True,
+    )
 
-    try:
-        core.create_namespaced_service(namespace=spec.namespace, body=svc)
-    except ApiException as e:
-        if e.status == 409:
-            core.patch_namespaced_service(name=spec.name, namespace=spec.namespace, body=svc)
-        else:
-            raise
 
-    try:
-        net.create_namespaced_ingress(namespace=spec.namespace, body=ing)
-    except ApiException as e:
-        if e.status == 409:
-            net.patch_namespaced_ingress(name=spec.name, namespace=spec.namespace, body=ing)
-        else:
-            raise
+# objects the workloads mount or reference; they must exist before the pods start
+_CONFIG_KINDS = ("ConfigMap",)
 
 
-def wait_deployment_ready(namespace: str, name: str, timeout_s: int = 180) -> None:
-    _load_kube()
-    apps = client.AppsV1Api()
-    start = time.time()
+def apply_manifests(objs: list[dict], parallel: bool | None = None) -> None:
+    """Server-side apply every object once; concurrently unless APPLY_PARALLEL is off.
+
+    Config objects are always applied first, in order, so a Deployment never
+    starts pods before the ConfigMap its volumes point at exists.
+    """
+    if parallel is None:
+        parallel = settings.apply_parallel
+    config = [o for o in objs if o["kind"] in _CONFIG_KINDS]
+    rest = [o for o in objs if o["kind"] not in _CONFIG_KINDS]
+    for obj in config:
+        server_side_apply(obj)
+    if not parallel or len(rest) < 2:
+        for obj in rest:
+            server_side_apply(obj)
+        return
+    for fut in [_fanout.submit(server_side_apply, obj) for obj in rest]:
+        fut.result()
+
+
+def apply_nginx(spec: NginxSpec) -> None:
+    apply_manifests(build_nginx_manifests(spec))
+
+
+def _wait_for(read, list_fn, list_args: tuple, name: str, check, timeout_s: float) -> str | None:
+    """Block until ``check(obj)`` reports done, driven by a watch on the object.
+
+    ``read`` fetches the current object (404 is passed to ``check`` as None) and
+    its resourceVersion seeds a name-field-selected watch, so the wait wakes as
+    soon as the object changes. If the watch cannot be opened or breaks, the
+    loop degrades to re-reading every couple of seconds. Returns None when done,
+    otherwise the last progress message after ``timeout_s``.
+    """
+    deadline = time.monotonic() + timeout_s
     last = None
-    while time.time() - start < timeout_s:
+    while (remaining := deadline - time.monotonic()) > 0:
+        rv = None
         try:
-            d = apps.read_namespaced_deployment(name=name, namespace=namespace)
-            desired = d.spec.replicas or 1
-            available = d.status.available_replicas or 0
-            ready = d.status.ready_replicas or 0
-            updated = d.status.updated_replicas or 0
-            if available >= desired and ready >= desired and updated >= desired:
-                return
-            last = f"available={available}/{desired}, ready={ready}, updated={updated}"
+            obj = read()
+            rv = obj.metadata.resource_version
         except ApiException as e:
             if e.status != 404:
-                last = f"apps error {e}"
-        time.sleep(2)
-    raise TimeoutError(f"deployment not ready: {name} {last}")
+                last = f"read error {e}"
+                time.sleep(min(2, remaining))
+                continue
+            obj = None
+        done, last = check(obj, last)
+        if done:
+            return None
+        try:
+            kwargs: dict = {
+                "field_selector": f"metadata.name={name}",
+                "timeout_seconds": max(1, int(remaining)),
+                "_request_timeout": remaining + 5,
+            }
+            if rv:
+                kwargs["resource_version"] = rv
+            w = watch.Watch()
+            for ev in w.stream(list_fn, *list_args, **kwargs):
+                done, last = check(None if ev["type"] == "DELETED" else ev["object"], last)
+                if done:
+                    w.stop()
+                    return None
+        except Exception as e:
+            # watch unavailable or expired (410): fall back to polling
+            if not (isinstance(e, ApiException) and e.status == 410):
+                last = last or f"watch error {e}"
+                time.sleep(min(2, max(0, deadline - time.monotonic())))
+    return last or "timed out"
+
+
+def deployment_progress(d) -> tuple[bool, str | None]:
+    desired = d.spec.replicas or 1
+    available = d.status.available_replicas or 0
+    ready = d.status.ready_replicas or 0
+    updated = d.status.updated_replicas or 0
+    if available >= desired and ready >= desired and updated >= desired:
+        return True, None
+    return False, f"available={available}/{desired}, ready={ready}, updated={updated}"
+
+
+def endpoint_count(ep) -> int:
+    addrs = 0
+    for s in ep.subsets or []:
+        addrs += len(s.addresses or [])
+    return addrs
+
+
+def endpoints_progress(ep) -> tuple[bool, str | None]:
+    addrs = endpoint_count(ep)
+    return addrs > 0, f"endpoints={addrs}"
+
+
+def wait_deployment_ready(namespace: str, name: str, timeout_s: int = 180) -> None:
+    apps = kube.apps
+
+    def check(d, last):
+        return deployment_progress(d) if d is not None else (False, last)
+
+    last = _wait_for(
+        lambda: apps.read_namespaced_deployment(name=name, namespace=namespace),
+        apps.list_namespaced_deployment, (namespace,), name, check, timeout_s,
+    )
+    if last is not None:
+        raise TimeoutError(f"deployment not ready: {name} {last}")
 
 
 def wait_namespace_gone(name: str, timeout_s: int = 120) -> None:
-    _load_kube()
-    core = client.CoreV1Api()
-    start = time.time()
-    while time.time() - start < timeout_s:
+    core = kube.core
+    last = _wait_for(
+        lambda: core.read_namespace(name),
+        core.list_namespace, (), name, lambda ns, last: (ns is None, None), timeout_s,
+    )
+    if last is not None:
+        raise TimeoutError(f"namespace still exists: {name}")
+
+
+def wait_namespaces_gone(names: Iterable[str], timeout_s: float = 600, on_gone: Callable[[str], None] | None = None) -> set[str]:
+    """Wait for many namespaces to disappear over a single namespace watch.
+
+    One list gives the starting point and its resourceVersion seeds a watch
+    whose DELETED events tick names off; an expired or broken watch relists.
+    ``on_gone`` is called for each name as it goes. Returns the names still
+    present at the deadline.
+    """
+    core = kube.core
+    remaining = set(names)
+    deadline = time.monotonic() + timeout_s
+
+    def gone(name: str) -> None:
+        remaining.discard(name)
+        if on_gone:
+            on_gone(name)
+
+    while remaining and (left := deadline - time.monotonic()) > 0:
+        listed = core.list_namespace(_request_timeout=min(left, 30))
+        present = {ns.metadata.name for ns in listed.items}
+        for name in remaining - present:
+            gone(name)
+        if not remaining:
+            break
+        w = watch.Watch()
         try:
-            core.read_namespace(name)
-        except ApiException as e:
-            if e.status == 404:
-                return
-        time.sleep(2)
-    raise TimeoutError(f"namespace still exists: {name}")
+            for ev in w.stream(
+                core.list_namespace,
+                resource_version=listed.metadata.resource_version,
+                timeout_seconds=max(1, int(left)),
+                _request_timeout=left + 5,
+            ):
+                if ev["type"] == "DELETED" and ev["object"].metadata.name in remaining:
+                    gone(ev["object"].metadata.name)
+                    if not remaining:
+                        w.stop()
+                        break
+        except Exception as e:
+            if not (isinstance(e, ApiException) and e.status == 410):
+                time.sleep(min(2, max(0, deadline - time.monotonic())))
+    return remaining
 
 
 def wait_service_endpoints_ready(namespace: str, service: str, timeout_s: int = 120) -> None:
-    _load_kube()
-    core = client.CoreV1Api()
-    start = time.time()
-    last = None
-    while time.time() - start < timeout_s:
-        try:
-            ep = core.read_namespaced_endpoints(service, namespace)
-            subsets = ep.subsets or []
-            addrs = 0
-            for s in subsets:
-                addrs += len(s.addresses or [])
-            if addrs > 0:
-                return
-            last = f"endpoints={addrs}"
-        except ApiException as e:
-            if e.status != 404:
-                last = f"ep error {e}"
-        time.sleep(2)
-    raise TimeoutError(f"service endpoints not ready: {service} {last}")
+    core = kube.core
+
+    def check(ep, last):
+        return endpoints_progress(ep) if ep is not None else (False, last)
+
+    last = _wait_for(
+        lambda: core.read_namespaced_endpoints(service, namespace),
+        core.list_namespaced_endpoints, (namespace,), service, check, timeout_s,
+    )
+    if last is not None:
+        raise TimeoutError(f"service endpoints not ready: {service} {last}")
+
+
+def _strict_state(d) -> str:
+    return "READY" if deployment_progress(d)[0] else "CREATING"
 
 
 def check_ready_strict(namespace: str, name: str) -> str:
-    _load_kube()
-    apps = client.AppsV1Api()
+    if tenant_cache.serves(namespace):
+        d = tenant_cache.deployments.get(namespace, name)
+        return _strict_state(d) if d is not None else "PENDING"
+    apps = kube.apps
     try:
         d = apps.read_namespaced_deployment(name=name, namespace=namespace)
     except ApiException as e:
         if e.status == 404:
             return "PENDING"
         raise
-    desired = d.spec.replicas or 1
-    available = d.status.available_replicas or 0
-    ready = d.status.ready_replicas or 0
-    updated = d.status.updated_replicas or 0
-    if available >= desired and ready >= desired and updated >= desired:
-        return "READY"
-    return "CREATING"
+    return _strict_state(d)
 
 
-def get_deployment_report(namespace: str, name: str) -> dict:
-    _load_kube()
-    apps = client.AppsV1Api()
-    core = client.CoreV1Api()
+def _build_report(d, ep, pods) -> dict:
     report: dict = {"replicas": None, "ready_replicas": None, "available_replicas": None, "updated_replicas": None, "endpoints": 0, "pods": []}
-    try:
-        d = apps.read_namespaced_deployment(name=name, namespace=namespace)
+    if d is not None:
         report.update(
             replicas=d.spec.replicas or 0,
             ready_replicas=d.status.ready_replicas or 0,
             available_replicas=d.status.available_replicas or 0,
             updated_replicas=d.status.updated_replicas or 0,
         )
-    except ApiException:
-        pass
+    if ep is not None:
+        report["endpoints"] = endpoint_count(ep)
+    for p in pods or []:
+        statuses = p.status.container_statuses or []
+        ready = sum(1 for s in statuses if getattr(s, "ready", False))
+        total = len(statuses)
+        restarts = sum(int(getattr(s, "restart_count", 0)) for s in statuses)
+        report["pods"].append({
+            "name": p.metadata.name,
+            "phase": p.status.phase,
+            "ready": ready,
+            "total": total,
+            "restarts": restarts,
+        })
+    return report
 
-    try:
-        ep = core.read_namespaced_endpoints(name, namespace)
-        subsets = ep.subsets or []
-        addrs = 0
-        for s in subsets:
-            addrs += len(s.addresses or [])
-        report["endpoints"] = addrs
-    except ApiException:
-        pass
 
+def report_state(report: dict) -> str:
+    """check_ready_strict's verdict derived from an already-fetched report."""
+    if report.get("replicas") is None:
+        return "PENDING"
+    desired = report["replicas"] or 1
+    if min(report["available_replicas"], report["ready_replicas"], report["updated_replicas"]) >= desired:
+        return "READY"
+    return "CREATING"
+
+
+def get_deployment_report(namespace: str, name: str) -> dict:
+    if tenant_cache.serves(namespace):
+        d = tenant_cache.deployments.get(namespace, name)
+        # the watch cache only holds labelled objects; a namespace it knows with no
+        # Deployment in it may be a tenant created before the label, so read it live
+        if d is not None or tenant_cache.namespaces.get("", namespace) is None:
+            return _build_report(d, tenant_cache.endpoints.get(namespace, name), tenant_cache.pods_for(namespace, name))
+    d, ep, pods = _fetch_live(namespace, name)
+    return _build_report(d, ep, pods)
+
+
+def _quiet(fn, *args, **kwargs):
     try:
-        pods = core.list_namespaced_pod(namespace, label_selector=f"app={name}").items
-        for p in pods:
-            statuses = p.status.container_statuses or []
-            ready = sum(1 for s in statuses if getattr(s, "ready", False))
-            total = len(statuses)
-            restarts = sum(int(getattr(s, "restart_count", 0)) for s in statuses)
-            report["pods"].append({
-                "name": p.metadata.name,
-                "phase": p.status.phase,
-                "ready": ready,
-                "total": total,
-                "restarts": restarts,
-            })
+        return fn(*args, **kwargs)
     except ApiException:
-        pass
-
-    return report
+        return None
+
+
+def _fetch_live(namespace: str, name: str, *extra):
+    """Read the Deployment, its Endpoints and its pods concurrently.
+
+    ``extra`` callables are run on the same fan-out (errors become None) and
+    their results appended, so composed views pay for the slowest call only.
+    """
+    core = kube.core
+    futs = [
+        _fanout.submit(_quiet, kube.apps.read_namespaced_deployment, name=name, namespace=namespace),
+        _fanout.submit(_quiet, core.read_namespaced_endpoints, name, namespace),
+        _fanout.submit(_quiet, lambda: core.list_namespaced_pod(namespace, label_selector=f"app={name}").items),
+    ] + [_fanout.submit(_quiet, fn) for fn in extra]
+    return tuple(f.result() for f in futs)
+
+
+def _read_unlabelled(namespace: str, name: str) -> dict:
+    # runs on _fanout itself, so the reads stay sequential rather than nesting
+    d = _quiet(kube.apps.read_namespaced_deployment, name=name, namespace=namespace)
+    if d is None:
+        return _build_report(None, None, [])
+    ep = _quiet(kube.core.read_namespaced_endpoints, name, namespace)
+    pods = _quiet(lambda: kube.core.list_namespaced_pod(namespace, label_selector=f"app={name}").items)
+    return _build_report(d, ep, pods)
+
+
+def get_deployment_reports(targets: Iterable[tuple[str, str]], timeout_s: float | None = None) -> dict[tuple[str, str], dict | None]:
+    """Reports for many (namespace, name) pairs from three cluster-wide lists.
+
+    Deployments, Endpoints and Pods carrying the managed-by label are listed
+    concurrently and joined in memory. Lists that miss the ``timeout_s`` budget
+    are skipped: their fields come back as None (the whole report is None when
+    the Deployments list is missing), so a slow API server still yields a
+    partial answer on time.
+
+    Targets absent from the labelled list (tenants created before the label
+    existed, or not created yet) are read per namespace within what is left of
+    the budget.
+    """
+    targets = list(dict.fromkeys(targets))
+    if not targets:
+        return {}
+    if all(tenant_cache.serves(ns) for ns, _ in targets):
+        return {t: get_deployment_report(*t) for t in targets}
+    budget = timeout_s if timeout_s is not None else settings.report_batch_timeout_s
+    deadline = time.monotonic() + budget
+    kw = {"label_selector": MANAGED_SELECTOR, "_request_timeout": budget}
+    futures = {
+        "deployments": _fanout.submit(kube.apps.list_deployment_for_all_namespaces, **kw),
+        "endpoints": _fanout.submit(kube.core.list_endpoints_for_all_namespaces, **kw),
+        "pods": _fanout.submit(kube.core.list_pod_for_all_namespaces, **kw),
+    }
+    wait_futures(futures.values(), timeout=budget)
+    wanted = {ns for ns, _ in targets}
+    lists: dict[str, dict | None] = {}
+    for kind, fut in futures.items():
+        if not fut.done() or fut.exception() is not None:
+            fut.cancel()
+            lists[kind] = None
+            continue
+        by_key: dict = {}
+        for obj in fut.result().items:
+            ns = obj.metadata.namespace
+            if ns not in wanted:
+                continue
+            if kind == "pods":
+                by_key.setdefault((ns, (obj.metadata.labels or {}).get("app")), []).append(obj)
+            else:
+                by_key[(ns, obj.metadata.name)] = obj
+        lists[kind] = by_key
+
+    out: dict[tuple[str, str], dict | None] = {}
+    deps, eps, pods = lists["deployments"], lists["endpoints"], lists["pods"]
+    unlabelled = {key: _fanout.submit(_read_unlabelled, *key) for key in targets if deps is not None and key not in deps}
+    if unlabelled:
+        wait_futures(unlabelled.values(), timeout=max(deadline - time.monotonic(), 0))
+    for key in targets:
+        if deps is None:
+            out[key] = None
+            continue
+        if key in unlabelled:
+            fut = unlabelled[key]
+            out[key] = fut.result() if fut.done() and fut.exception() is None else None
+            fut.cancel()
+            continue
+        report = _build_report(deps.get(key), (eps or {}).get(key), (pods or {}).get(key, []))
+        if eps is None:
+            report["endpoints"] = None
+        if pods is None:
+            report["pods"] = None
+        out[key] = report
+    return out
 
 
-def get_pod_details(namespace: str, app_name: str) -> list[dict]:
-    _load_kube()
-    core = client.CoreV1Api()
-    pods = core.list_namespaced_pod(namespace, label_selector=f"app={app_name}").items
+def _pod_details(pods) -> list[dict]:
     out = []
     for p in pods:
         statuses = p.status.container_statuses or []
@@ -351,9 +555,47 @@ def get_pod_details(namespace: str, app_name: str) -> list[dict]:
     return out
 
 
+def get_pod_details(namespace: str, app_name: str) -> list[dict]:
+    if tenant_cache.serves(namespace):
+        return _pod_details(tenant_cache.pods_for(namespace, app_name))
+    core = kube.core
+    pods = core.list_namespaced_pod(namespace, label_selector=f"app={app_name}").items
+    return _pod_details(pods)
+
+
+def log_sources(namespace: str, app_name: str) -> list[tuple[str, str]]:
+    """(pod, container) pairs whose log can be read: containers that have started."""
+    if tenant_cache.serves(namespace):
+        pods = tenant_cache.pods_for(namespace, app_name)
+    else:
+        pods = kube.core.list_namespaced_pod(namespace, label_selector=f"app={app_name}").items
+    out = []
+    for p in pods:
+        if p.metadata.deletion_timestamp:
+            continue
+        for cs in (p.status.container_statuses if p.status else None) or []:
+            if cs.state and (cs.state.running or cs.state.terminated):
+                out.append((p.metadata.name, cs.name))
+    return out
+
+
+def open_pod_log(namespace: str, pod: str, container: str, tail_lines: int | None = None, since_seconds: int | None = None, read_timeout_s: float | None = None):
+    """Follow one container's log with timestamps; iterate the returned response for lines."""
+    return kube.core.read_namespaced_pod_log(
+        pod,
+        namespace,
+        container=container,
+        follow=True,
+        timestamps=True,
+        tail_lines=tail_lines,
+        since_seconds=since_seconds,
+        _preload_content=False,
+        _request_timeout=(10, read_timeout_s),
+    )
+
+
 def get_namespace_events(namespace: str, field_selector: str | None = None) -> list[dict]:
-    _load_kube()
-    core = client.CoreV1Api()
+    core = kube.core
     events = core.list_namespaced_event(namespace, field_selector=field_selector).items
     out = []
     for e in events[-40:]:  # last 40
@@ -370,9 +612,30 @@ def get_namespace_events(namespace: str, field_selector: str | None = None) -> l
     return out
 
 
+def get_deployment_details(namespace: str, name: str) -> dict:
+    """Report, pod details and recent pod events from one concurrent fan-out.
+
+    A single pod list feeds both the report and the pod details.
+    """
+    def load_events():
+        return get_namespace_events(namespace, field_selector=f"involvedObject.kind=Pod,involvedObject.namespace={namespace}")
+
+    if tenant_cache.serves(namespace):
+        d = tenant_cache.deployments.get(namespace, name)
+        ep = tenant_cache.endpoints.get(namespace, name)
+        pods = tenant_cache.pods_for(namespace, name)
+        events = _quiet(load_events)
+    else:
+        d, ep, pods, events = _fetch_live(namespace, name, load_events)
+    return {
+        "report": _build_report(d, ep, pods),
+        "pods": _pod_details(pods or []),
+        "events": events or [],
+    }
+
+
 def check_ready(namespace: str, name: str) -> str:
-    _load_kube()
-    apps = client.AppsV1Api()
+    apps = kube.apps
     try:
         d = apps.read_namespaced_deployment(name=name, namespace=namespace)
     except ApiException as e:
@@ -386,9 +649,13 @@ def check_ready(namespace: str, name: str) -> str:
     return "APPLYING"
 
 
+def patch_replicas(namespace: str, name: str, replicas: int) -> None:
+    # scale subresource: touches only spec.replicas, no pod template rollout
+    kube.apps.patch_namespaced_deployment_scale(name=name, namespace=namespace, body={"spec": {"replicas": replicas}})
+
+
 def delete_namespace(name: str) -> None:
-    _load_kube()
-    core = client.CoreV1Api()
+    core = kube.core
     try:
         core.delete_namespace(name)
     except ApiException as e:
@@ -0,0 +1,217 @@
+"""Async facade over services.k8s for the request path.
+
+Reads the watch cache can answer are served inline on the event loop. Calls
+that need the API server run on a dedicated executor, so slow cluster I/O never
+takes slots from the AnyIO thread limiter shared by the rest of the app. Waits
+sleep on informer change notifications instead of holding a thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from kubernetes.client import ApiException
+
+from ..core.config import settings
+from . import k8s
+from .informer import tenant_cache
+from .kube_client import kube
+
+_executor = ThreadPoolExecutor(max_workers=settings.kube_async_threads, thread_name_prefix="k8s-io")
+
+
+async def run(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def ensure_namespace(name: str) -> None:
+    await run(k8s.ensure_namespace, name)
+
+
+async def apply_nginx(spec: k8s.NginxSpec) -> None:
+    await run(k8s.apply_nginx, spec)
+
+
+async def delete_namespace(name: str) -> None:
+    await run(k8s.delete_namespace, name)
+
+
+async def patch_replicas(namespace: str, name: str, replicas: int) -> None:
+    await run(k8s.patch_replicas, namespace, name, replicas)
+
+
+async def check_ready_strict(namespace: str, name: str) -> str:
+    if tenant_cache.serves(namespace):
+        return k8s.check_ready_strict(namespace, name)
+    return await run(k8s.check_ready_strict, namespace, name)
+
+
+async def get_deployment_report(namespace: str, name: str) -> dict:
+    if tenant_cache.serves(namespace):
+        return k8s.get_deployment_report(namespace, name)
+    return await run(k8s.get_deployment_report, namespace, name)
+
+
+async def get_deployment_reports(targets: list[tuple[str, str]], timeout_s: float | None = None) -> dict[tuple[str, str], dict | None]:
+    if all(tenant_cache.serves(ns) for ns, _ in targets):
+        return k8s.get_deployment_reports(targets)
+    return await run(k8s.get_deployment_reports, targets, timeout_s=timeout_s)
+
+
+async def get_pod_details(namespace: str, app_name: str) -> list[dict]:
+    if tenant_cache.serves(namespace):
+        return k8s.get_pod_details(namespace, app_name)
+    return await run(k8s.get_pod_details, namespace, app_name)
+
+
+async def get_deployment_details(namespace: str, name: str) -> dict:
+    return await run(k8s.get_deployment_details, namespace, name)
+
+
+async def log_sources(namespace: str, app_name: str) -> list[tuple[str, str]]:
+    if tenant_cache.serves(namespace):
+        return k8s.log_sources(namespace, app_name)
+    return await run(k8s.log_sources, namespace, app_name)
+
+
+async def get_namespace_events(namespace: str, field_selector: str | None = None) -> list[dict]:
+    return await run(k8s.get_namespace_events, namespace, field_selector=field_selector)
+
+
+def _read_or_none(read: Callable[[], Any]) -> Any | None:
+    try:
+        return read()
+    except ApiException as e:
+        if e.status == 404:
+            return None
+        raise
+
+
+async def _wait_for(namespace: str, cached: Callable[[], Any], read: Callable[[], Any], check, timeout_s: float) -> str | None:
+    """Await ``check(obj)`` without holding a thread.
+
+    While the watch cache serves ``namespace`` the object is read from memory
+    and the coroutine sleeps until the next informer update; otherwise it falls
+    back to an API read on the k8s executor every couple of seconds. Returns
+    None when done, else the last progress message.
+    """
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+
+    def wake() -> None:
+        loop.call_soon_threadsafe(changed.set)
+
+    deadline = time.monotonic() + timeout_s
+    last = None
+    tenant_cache.subscribe(wake)
+    try:
+        while (remaining := deadline - time.monotonic()) > 0:
+            changed.clear()
+            serving = tenant_cache.serves(namespace)
+            try:
+                obj = cached() if serving else await run(_read_or_none, read)
+            except ApiException as e:
+                obj, last = None, f"read error {e}"
+            done, last = check(obj, last)
+            if done:
+                return None
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=remaining if serving else min(2, remaining))
+            except TimeoutError:
+                pass
+    finally:
+        tenant_cache.unsubscribe(wake)
+    return last or "timed out"
+
+
+async def wait_deployment_ready(namespace: str, name: str, timeout_s: int = 180) -> None:
+    last = await _wait_for(
+        namespace,
+        lambda: tenant_cache.deployments.get(namespace, name),
+        lambda: kube.apps.read_namespaced_deployment(name=name, namespace=namespace),
+        lambda d, last: k8s.deployment_progress(d) if d is not None else (False, last),
+        timeout_s,
+    )
+    if last is not None:
+        raise TimeoutError(f"deployment not ready: {name} {last}")
+
+
+async def wait_service_endpoints_ready(namespace: str, service: str, timeout_s: int = 120) -> None:
+    last = await _wait_for(
+        namespace,
+        lambda: tenant_cache.endpoints.get(namespace, service),
+        lambda: kube.core.read_namespaced_endpoints(service, namespace),
+        lambda ep, last: k8s.endpoints_progress(ep) if ep is not None else (False, last),
+        timeout_s,
+    )
+    if last is not None:
+        raise TimeoutError(f"service endpoints not ready: {service} {last}")
+
+
+async def wait_namespace_gone(name: str, timeout_s: int = 120) -> None:
+    last = await _wait_for(
+        name,
+        lambda: tenant_cache.namespaces.get("", name),
+        lambda: kube.core.read_namespace(name),
+        lambda ns, last: (ns is None, None),
+        timeout_s,
+    )
+    if last is not None:
+        raise TimeoutError(f"namespace still exists: {name}")
+
+
+async def namespaces_gone(names: Iterable[str], timeout_s: float = 600) -> AsyncIterator[set[str]]:
+    """Yield batches of ``names`` as the namespaces disappear, until all are gone or the deadline.
+
+    Answered from the namespace informer while it is fresh, otherwise from one
+    namespace watch on the k8s executor (``k8s.wait_namespaces_gone``).
+    """
+    remaining = set(names)
+    if not remaining:
+        return
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+    deadline = time.monotonic() + timeout_s
+    if all(tenant_cache.serves(n) for n in remaining):
+        def wake() -> None:
+            loop.call_soon_threadsafe(changed.set)
+
+        tenant_cache.subscribe(wake)
+        try:
+            while remaining and (left := deadline - time.monotonic()) > 0:
+                changed.clear()
+                gone = {n for n in remaining if tenant_cache.namespaces.get("", n) is None}
+                if gone:
+                    remaining -= gone
+                    yield gone
+                    continue
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=left)
+                except TimeoutError:
+                    pass
+        finally:
+            tenant_cache.unsubscribe(wake)
+        return
+
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    fut = loop.run_in_executor(
+        _executor,
+        functools.partial(k8s.wait_namespaces_gone, set(remaining), timeout_s, lambda n: loop.call_soon_threadsafe(queue.put_nowait, n)),
+    )
+    while remaining and not (fut.done() and queue.empty()):
+        getter = asyncio.ensure_future(queue.get())
+        await asyncio.wait({getter, fut}, return_when=asyncio.FIRST_COMPLETED)
+        if not getter.done():
+            getter.cancel()
+            continue
+        gone = {getter.result()}
+        while not queue.empty():
+            gone.add(queue.get_nowait())
+        remaining -= gone
+        yield gone
+    await fut
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+
+from kubernetes import client, config
+from kubernetes.config.kube_config import KUBE_CONFIG_DEFAULT_LOCATION
+from urllib3.connection import HTTPConnection
+
+from ..core.config import settings
+
+# stamped on every tenant object (raw apply and both charts) so cluster-wide
+# lists and watches can select exactly the objects this API manages
+MANAGED_LABEL = "sas-k8s-sim/managed-by"
+MANAGED_VALUE = "sas-k8s-sim-api"
+MANAGED_SELECTOR = f"{MANAGED_LABEL}={MANAGED_VALUE}"
+
+
+class KubeClients:
+    """Process-wide Kubernetes API clients.
+
+    The kubeconfig is parsed once and a single ApiClient (one urllib3 pool) is
+    shared by every caller. The config file's mtime is re-checked at most every
+    ``kube_config_check_interval_s`` seconds and the clients are rebuilt when it
+    changes; ``reload()`` forces a rebuild.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._api: client.ApiClient | None = None
+        self._core: client.CoreV1Api | None = None
+        self._apps: client.AppsV1Api | None = None
+        self._net: client.NetworkingV1Api | None = None
+        self._source: str | None = None
+        self._mtime: float | None = None
+        self._checked_at = 0.0
+
+    def _load_configuration(self) -> client.Configuration:
+        cfg = client.Configuration()
+        source = None
+        if settings.kubeconfig and os.path.exists(settings.kubeconfig):
+            config.load_kube_config(config_file=settings.kubeconfig, client_configuration=cfg)
+            source = settings.kubeconfig
+        else:
+            # Try in-cluster (if running with proper ServiceAccount)
+            try:
+                config.load_incluster_config(client_configuration=cfg)
+            except Exception:
+                # Fallback to default kubeconfig location
+                try:
+                    config.load_kube_config(client_configuration=cfg)
+                    source = os.path.expanduser(KUBE_CONFIG_DEFAULT_LOCATION)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to load kube config: {e}")
+        if settings.insecure_kube:
+            cfg.verify_ssl = False
+        cfg.connection_pool_maxsize = settings.kube_pool_maxsize
+        self._source = source
+        self._mtime = _mtime(source)
+        return cfg
+
+    def _build(self) -> None:
+        api = client.ApiClient(configuration=self._load_configuration())
+        # TCP keep-alive so idle pooled connections survive NAT/LB idle timeouts
+        api.rest_client.pool_manager.connection_pool_kw["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        self._api = api
+        self._core = client.CoreV1Api(api)
+        self._apps = client.AppsV1Api(api)
+        self._net = client.NetworkingV1Api(api)
+        self._checked_at = time.monotonic()
+
+    def _stale(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at < settings.kube_config_check_interval_s:
+            return False
+        self._checked_at = now
+        return self._source is not None and _mtime(self._source) != self._mtime
+
+    def _ensure(self) -> None:
+        if self._api is not None and not self._stale():
+            return
+        with self._lock:
+            if self._api is None or self._mtime != _mtime(self._source):
+                self._build()
+
+    def reload(self) -> None:
+        with self._lock:
+            self._build()
+
+    @property
+    def api_client(self) -> client.ApiClient:
+        self._ensure()
+        return self._api  # type: ignore[return-value]
+
+    @property
+    def core(self) -> client.CoreV1Api:
+        self._ensure()
+        return self._core  # type: ignore[return-value]
+
+    @property
+    def apps(self) -> client.AppsV1Api:
+        self._ensure()
+        return self._apps  # type: ignore[return-value]
+
+    @property
+    def networking(self) -> client.NetworkingV1Api:
+        self._ensure()
+        return self._net  # type: ignore[return-value]
+
+
+def _mtime(path: str | None) -> float | None:
+    if not path:
+        return None
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+kube = KubeClients()
@@ -0,0 +1,229 @@
+"""Follow-mode pod log streaming.
+
+``follow_logs`` keeps one ``follow=True`` log stream open per started
+container of a deployment and yields only new lines. Pods are rediscovered
+every few seconds, so containers that start during a rollout get followed,
+and streams of pods that go away are stopped. When a stream drops (idle read
+timeout, API server restart), it reopens with ``since_seconds`` from the last
+line seen and skips lines it already sent. Each pod is capped at
+``log_max_lines_per_s``; lines over the cap are dropped and reported as one
+marker line.
+
+The streams block, so they run on their own executor and never take threads
+from the k8s executor used by request handlers. At most
+``log_follow_max_streams`` run per process; a container over the limit gets
+a marker line saying its logs are unavailable and is retried on the next
+pod scan. Stopping a stream shuts its response down, which frees the thread
+at once instead of after the next line or read timeout.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+
+from kubernetes.client import ApiException
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from . import k8s, k8s_async
+
+log = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.log_follow_max_streams, thread_name_prefix="k8s-logs")
+# one slot per executor thread, so a stream either starts now or is refused
+_slots = threading.BoundedSemaphore(settings.log_follow_max_streams)
+
+LogTime = tuple[int, int]  # (unix seconds, nanoseconds)
+
+
+def _split(raw: str) -> tuple[LogTime | None, str]:
+    # lines look like "2024-05-01T10:00:00.123456789Z message" with timestamps=True
+    stamp, _, text = raw.partition(" ")
+    try:
+        base, _, frac = stamp.rstrip("Z").partition(".")
+        secs = int(datetime.fromisoformat(base).replace(tzinfo=UTC).timestamp())
+        return (secs, int(frac[:9].ljust(9, "0") or 0)), text
+    except ValueError:
+        return None, raw
+
+
+class _RateLimit:
+    """Token bucket shared by the containers of one pod."""
+
+    def __init__(self, per_s: float) -> None:
+        self._rate = per_s
+        self._tokens = per_s
+        self._at = time.monotonic()
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._rate, self._tokens + (now - self._at) * self._rate)
+            self._at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.skipped += 1
+            return False
+
+    def take_skipped(self) -> int:
+        with self._lock:
+            n, self.skipped = self.skipped, 0
+            return n
+
+
+class _Stream:
+    """Stop flag of one followed container plus the response it is reading."""
+
+    def __init__(self) -> None:
+        self.stopped = threading.Event()
+        self._resp = None
+        self._lock = threading.Lock()
+
+    def attach(self, resp) -> bool:
+        with self._lock:
+            if self.stopped.is_set():
+                return False
+            self._resp = resp
+            return True
+
+    def detach(self) -> None:
+        with self._lock:
+            self._resp = None
+
+    def stop(self) -> None:
+        with self._lock:
+            self.stopped.set()
+            resp = self._resp
+        if resp is not None:
+            # unblocks the reading thread; shutdown() is urllib3 >= 2.3
+            (getattr(resp, "shutdown", None) or resp.close)()
+
+
+def _follow(namespace: str, pod: str, container: str, push: Callable[[dict], None], limit: _RateLimit, stream: _Stream) -> None:
+    try:
+        _follow_until_stopped(namespace, pod, container, push, limit, stream)
+    finally:
+        _slots.release()
+
+
+def _follow_until_stopped(namespace: str, pod: str, container: str, push: Callable[[dict], None], limit: _RateLimit, stream: _Stream) -> None:
+    stop = stream.stopped
+    last: LogTime | None = None
+    first = True
+    while not stop.is_set():
+        since = None
+        if last is not None:
+            since = max(1, math.ceil(time.time() - last[0]) + 1)
+        sent = 0
+        try:
+            resp = k8s.open_pod_log(
+                namespace,
+                pod,
+                container,
+                tail_lines=settings.log_follow_tail_lines if first else None,
+                since_seconds=since,
+                read_timeout_s=settings.log_follow_idle_s,
+            )
+            first = False
+            if not stream.attach(resp):
+                resp.release_conn()
+                return
+            try:
+                for chunk in resp:
+                    if stop.is_set():
+                        return
+                    ts, text = _split(chunk.decode("utf-8", "replace").rstrip("\n"))
+                    if ts is not None:
+                        if last is not None and ts <= last:
+                            continue
+                        last = ts
+                    sent += 1
+                    if limit.allow():
+                        push({"pod": pod, "container": container, "line": text})
+            finally:
+                stream.detach()
+                resp.release_conn()
+        except ApiException as e:
+            if e.status == 404:
+                return
+            log.debug("log stream %s/%s/%s: %s", namespace, pod, container, e)
+        except Exception as e:
+            # read timeouts on idle containers land here too; reopen from the last line
+            log.debug("log stream %s/%s/%s dropped: %s", namespace, pod, container, e)
+        if not sent:
+            # container exited or not ready yet; do not spin
+            stop.wait(settings.sse_interval_s)
+
+
+async def follow_logs(namespace: str, app_name: str) -> AsyncIterator[list[dict]]:
+    """Yield batches of new ``{"pod", "container", "line"}`` entries until closed."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[dict] = asyncio.Queue()
+    streams: dict[tuple[str, str], _Stream] = {}
+    refused: set[tuple[str, str]] = set()
+    limits: dict[str, _RateLimit] = {}
+
+    def push(entry: dict) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, entry)
+        except RuntimeError:
+            pass  # loop closed while a stream was still reading
+
+    def stop(key: tuple[str, str]) -> None:
+        streams.pop(key).stop()
+        metrics.inc("log_streams_closed_total")
+
+    next_scan = 0.0
+    try:
+        while True:
+            if loop.time() >= next_scan:
+                next_scan = loop.time() + settings.sse_interval_s
+                try:
+                    sources = set(await k8s_async.log_sources(namespace, app_name))
+                except Exception as e:
+                    log.debug("log sources for %s/%s: %s", namespace, app_name, e)
+                    sources = set(streams)
+                for key in set(streams) - sources:
+                    stop(key)
+                refused &= sources
+                for key in sources - set(streams):
+                    pod, container = key
+                    if not _slots.acquire(blocking=False):
+                        if key not in refused:
+                            refused.add(key)
+                            metrics.inc("log_streams_refused_total")
+                            queue.put_nowait({"pod": pod, "container": container, "line": "[logs unavailable: too many log streams open, retrying]"})
+                        continue
+                    refused.discard(key)
+                    stream = streams[key] = _Stream()
+                    limit = limits.setdefault(pod, _RateLimit(settings.log_max_lines_per_s))
+                    _executor.submit(_follow, namespace, pod, container, push, limit, stream)
+                    metrics.inc("log_streams_opened_total")
+                live = {pod for pod, _ in streams}
+                for pod in set(limits) - live:
+                    del limits[pod]
+            try:
+                first = await asyncio.wait_for(queue.get(), timeout=max(next_scan - loop.time(), 0.01))
+            except TimeoutError:
+                first = None
+            batch = [first] if first else []
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for pod, limit in limits.items():
+                if skipped := limit.take_skipped():
+                    metrics.inc("log_lines_skipped_total", skipped)
+                    batch.append({"pod": pod, "container": "", "line": f"[{skipped} lines skipped: rate limit]"})
+            if batch:
+                yield batch
+    finally:
+        for key in list(streams):
+            stop(key)
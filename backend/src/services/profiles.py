@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+import yaml
+
+from ..core.config import settings
+from .charts import chart_engine
+from .k8s import NginxSpec
+
+_TOMCAT_POST_START = [
+    "bash", "-c",
+    "if [ ! -d /usr/local/tomcat/webapps/ROOT ]; then cp -r /usr/local/tomcat/webapps.dist/* /usr/local/tomcat/webapps/; fi",
+]
+
+
+def server_profile(server_type: str | None) -> dict:
+    """Image, ports and probe settings for a server type."""
+    st = (server_type or "nginx").lower()
+    profile = {
+        "image": "nginx:alpine",
+        "port": 80,
+        "doc_root": "/usr/share/nginx/html",
+        "readiness_path": "/",
+        "readiness_delay": 5,
+    }
+    if st in ("apache", "httpd"):
+        profile.update(image="httpd:alpine", doc_root="/usr/local/apache2/htdocs")
+    elif st == "tomcat":
+        profile.update(image="tomcat:9.0", port=8080, readiness_delay=20)
+    return profile
+
+
+def chart_dir_for(server_type: str | None) -> str:
+    return settings.helm_chart_path_tomcat if (server_type or "").lower() == "tomcat" else settings.helm_chart_path
+
+
+def chart_values(server_type: str | None, name: str, namespace: str, host: str, replicas: int, index_html: str | None = None) -> dict:
+    st = (server_type or "nginx").lower()
+    p = server_profile(st)
+    values = {
+        "nameOverride": name,
+        "namespace": namespace,
+        "host": host,
+        "image": p["image"],
+        "containerPort": p["port"],
+        "servicePort": 80 if st == "tomcat" else p["port"],
+        "replicaCount": replicas,
+        "readiness": {"path": p["readiness_path"], "initialDelaySeconds": p["readiness_delay"]},
+        "docRootPath": p["doc_root"],
+    }
+    if index_html and st != "tomcat":
+        values["indexHtml"] = index_html
+    if st == "tomcat":
+        values["command"] = ["catalina.sh", "run"]
+        values["lifecycle"] = {"postStart": {"enabled": True, "command": _TOMCAT_POST_START}}
+    return values
+
+
+def nginx_spec(server_type: str | None, name: str, namespace: str, host: str, replicas: int, index_html: str | None = None) -> NginxSpec:
+    """Raw-manifest equivalent of ``chart_values`` for when Helm is off or failed."""
+    st = (server_type or "nginx").lower()
+    p = server_profile(st)
+    tomcat = st == "tomcat"
+    return NginxSpec(
+        namespace=namespace,
+        name=name,
+        host=host,
+        image=p["image"],
+        port=p["port"],
+        index_html=index_html if (index_html and not tomcat) else None,
+        doc_root_path=p["doc_root"],
+        readiness_path=p["readiness_path"],
+        readiness_delay=p["readiness_delay"],
+        command=["catalina.sh", "run"] if tomcat else None,
+        lifecycle_post_start=_TOMCAT_POST_START if tomcat else None,
+        replicas=replicas,
+    )
+
+
+def values_fingerprint(chart_dir: str, values: dict) -> str | None:
+    """Hash of the chart contents and every value except ``replicaCount``.
+
+    Two upgrades with the same fingerprint render the same objects apart from
+    the replica count. Returns None when the chart cannot be read, so callers
+    fall back to a full upgrade.
+    """
+    try:
+        digest = chart_engine.load(chart_dir).digest
+    except (OSError, ValueError, yaml.YAMLError):
+        return None
+    rest = {k: v for k, v in values.items() if k != "replicaCount"}
+    payload = json.dumps({"chart": digest, "values": rest}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -0,0 +1,185 @@
+"""Short-TTL, single-flight cache of deployment reports.
+
+Concurrent callers asking for the same (namespace, name) share one upstream
+fetch, and results are kept for ``report_cache_ttl_s``. With ``redis_url``
+set, entries are also written to Redis so every API process and worker sees
+them. While the watch cache serves a namespace, reads go straight to it: that
+is already an in-memory lookup and never stale.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from . import k8s_async
+from .informer import tenant_cache
+
+log = logging.getLogger(__name__)
+
+Key = tuple[str, str]
+
+
+class ReportCache:
+    def __init__(self) -> None:
+        self._local: dict[Key, tuple[float, dict]] = {}
+        self._inflight: dict[Key, asyncio.Future] = {}
+        self._fetches: set[asyncio.Task] = set()
+        self._redis: Any = None
+        self._redis_failed = False
+        self._redis_errors: tuple[type[Exception], ...] = ()
+        self._redis_down_until = 0.0
+
+    def _client(self) -> Any:
+        if time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None and settings.redis_url and not self._redis_failed:
+            try:
+                import redis.asyncio as redis  # optional dependency
+                from redis.exceptions import RedisError
+                self._redis = redis.from_url(settings.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+                self._redis_errors = (RedisError, OSError)
+            except (ImportError, ValueError) as e:
+                log.warning("report cache: redis unavailable, using the local cache only: %s", e)
+                self._redis_failed = True
+        return self._redis
+
+    def _trip(self, op: str, e: Exception) -> None:
+        # skip Redis for a while instead of paying its timeout on every request
+        log.warning("report cache: redis %s failed, local cache only for 30s: %s", op, e)
+        self._redis_down_until = time.monotonic() + 30
+
+    @staticmethod
+    def _redis_key(key: Key) -> str:
+        return f"report:{key[0]}:{key[1]}"
+
+    def _get_local(self, key: Key) -> dict | None:
+        hit = self._local.get(key)
+        if hit is None:
+            return None
+        if hit[0] <= time.monotonic():
+            self._local.pop(key, None)
+            return None
+        return hit[1]
+
+    async def _get_shared(self, keys: list[Key]) -> dict[Key, dict]:
+        client = self._client()
+        if client is None or not keys:
+            return {}
+        try:
+            raw = await client.mget([self._redis_key(k) for k in keys])
+        except self._redis_errors as e:
+            self._trip("read", e)
+            return {}
+        found = {k: json.loads(v) for k, v in zip(keys, raw) if v is not None}
+        for k, report in found.items():
+            self._put_local(k, report)
+        return found
+
+    def _put_local(self, key: Key, report: dict) -> None:
+        self._local[key] = (time.monotonic() + settings.report_cache_ttl_s, report)
+        if len(self._local) > settings.report_cache_size:
+            now = time.monotonic()
+            for k in [k for k, (exp, _) in self._local.items() if exp <= now]:
+                del self._local[k]
+
+    async def _put(self, found: dict[Key, dict]) -> None:
+        for key, report in found.items():
+            self._put_local(key, report)
+        client = self._client()
+        if client is None or not found:
+            return
+        ttl_ms = max(1, int(settings.report_cache_ttl_s * 1000))
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, report in found.items():
+                    pipe.set(self._redis_key(key), json.dumps(report), px=ttl_ms)
+                await pipe.execute()
+        except self._redis_errors as e:
+            self._trip("write", e)
+
+    async def get(self, namespace: str, name: str) -> dict:
+        report = (await self.get_many([(namespace, name)]))[(namespace, name)]
+        if report is None:
+            raise RuntimeError(f"no report for {namespace}/{name}")
+        return report
+
+    async def get_many(self, targets: list[Key]) -> dict[Key, dict | None]:
+        """Reports for ``targets``; missing or unavailable ones come back as None."""
+        targets = list(dict.fromkeys(targets))
+        out: dict[Key, dict | None] = {}
+        direct = [t for t in targets if tenant_cache.serves(t[0])]
+        if direct:
+            out.update(await k8s_async.get_deployment_reports(direct))
+        todo = [t for t in targets if t not in out]
+        for t in list(todo):
+            report = self._get_local(t)
+            if report is not None:
+                out[t] = report
+        todo = [t for t in todo if t not in out]
+        if todo:
+            shared = await self._get_shared(todo)
+            out.update(shared)
+            todo = [t for t in todo if t not in shared]
+        metrics.inc("report_cache_hits_total", len(targets) - len(direct) - len(todo))
+        if not todo:
+            return out
+
+        waiting = {t: self._inflight[t] for t in todo if t in self._inflight}
+        fetch = [t for t in todo if t not in waiting]
+        metrics.inc("report_cache_coalesced_total", len(waiting))
+        metrics.inc("report_cache_misses_total", len(fetch))
+        if fetch:
+            loop = asyncio.get_running_loop()
+            futures = {t: loop.create_future() for t in fetch}
+            self._inflight.update(futures)
+            # the fetch is its own task, so a caller that is cancelled does not
+            # take the result away from the others waiting on it
+            task = asyncio.create_task(self._fetch(futures))
+            self._fetches.add(task)
+            task.add_done_callback(self._fetches.discard)
+            waiting.update(futures)
+        for t, fut in waiting.items():
+            out[t] = await asyncio.shield(fut)
+        return out
+
+    async def _fetch(self, futures: dict[Key, asyncio.Future]) -> None:
+        fetch = list(futures)
+        try:
+            if len(fetch) == 1:
+                ns, name = fetch[0]
+                fetched: dict[Key, dict | None] = {fetch[0]: await k8s_async.get_deployment_report(ns, name)}
+            else:
+                fetched = await k8s_async.get_deployment_reports(fetch)
+            await self._put({k: v for k, v in fetched.items() if v is not None})
+            for t, fut in futures.items():
+                fut.set_result(fetched.get(t))
+        except Exception as e:
+            for fut in futures.values():
+                if not fut.done():
+                    fut.set_exception(e)
+                    # waiters may be gone; do not warn about an unretrieved exception
+                    fut.exception()
+        finally:
+            for t, fut in futures.items():
+                if not fut.done():
+                    fut.cancel()
+                self._inflight.pop(t, None)
+
+    async def invalidate(self, namespace: str, name: str) -> None:
+        """Forget a report after a change made through this API (scale, delete)."""
+        key = (namespace, name)
+        self._local.pop(key, None)
+        client = self._client()
+        if client is not None:
+            try:
+                await client.delete(self._redis_key(key))
+            except self._redis_errors as e:
+                self._trip("delete", e)
+
+
+report_cache = ReportCache()
@@ -0,0 +1,183 @@
+"""Push-based deployment status changes across processes.
+
+A trigger on ``deployments`` (migration 0007) records every status transition
+in ``deployment_status_events`` and sends it as a ``deployment_status``
+notification on commit. ``StatusFeed`` holds one LISTEN connection per
+process and hands each event to the local streams that watch it. After a
+reconnect it reads the events it missed from the table, so a dropped
+connection delays delivery but loses nothing.
+
+LISTEN needs a session-level connection, which PgBouncer in transaction
+pooling mode does not give. With DB_PGBOUNCER set, the listener connects to
+STATUS_FEED_DATABASE_URL (a direct Postgres DSN); without one the feed is off.
+Without Postgres (or with STATUS_FEED_ENABLED off) the feed stays idle and
+streams fall back to their poll interval.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import psycopg
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..db.session import AsyncSessionLocal
+from ..models.status_event import DeploymentStatusEvent
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "deployment_status"
+_PAGE = 1000
+
+
+async def events_since(db: AsyncSession, after_id: int, limit: int = _PAGE) -> list[dict]:
+    """Status events with an id above ``after_id``, oldest first, in notification payload form."""
+    rows = (await db.execute(
+        select(DeploymentStatusEvent)
+        .where(DeploymentStatusEvent.id > after_id)
+        .order_by(DeploymentStatusEvent.id)
+        .limit(limit)
+    )).scalars().all()
+    return [
+        {"event_id": r.id, "id": str(r.deployment_id), "user_id": r.user_id, "old": r.old_status, "new": r.new_status}
+        for r in rows
+    ]
+
+
+class _Watch:
+    def __init__(self, match: Callable[[dict], bool]) -> None:
+        self.match = match
+        self.event = asyncio.Event()
+        self.last: dict | None = None
+
+    async def wait(self, timeout_s: float) -> None:
+        """Return after a matching event or ``timeout_s``, whichever comes first."""
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout=timeout_s)
+        except TimeoutError:
+            pass
+        self.event.clear()
+
+
+class StatusFeed:
+    def __init__(self) -> None:
+        self._watches: set[_Watch] = set()
+        self._task: asyncio.Task | None = None
+        self._last_id: int | None = None
+        self._floor = 0
+        self._seen: deque[int] = deque(maxlen=10000)
+        self._seen_set: set[int] = set()
+        self.connected = False
+        metrics.gauge("status_feed_connected", lambda: int(self.connected))
+
+    @staticmethod
+    def _listen_url() -> str | None:
+        if settings.status_feed_database_url:
+            return settings.status_feed_database_url
+        return None if settings.db_pgbouncer else settings.database_url
+
+    @classmethod
+    def available(cls) -> bool:
+        url = cls._listen_url()
+        return settings.status_feed_enabled and url is not None and make_url(url).get_backend_name() == "postgresql"
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        if self.available():
+            self._task = asyncio.create_task(self._run())
+        elif settings.status_feed_enabled and settings.db_pgbouncer and not settings.status_feed_database_url:
+            log.warning("status feed off: LISTEN does not work through PgBouncer; set STATUS_FEED_DATABASE_URL to a direct connection")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.connected = False
+
+    @contextmanager
+    def watch(self, match: Callable[[dict], bool]) -> Iterator[_Watch]:
+        """Register interest in events for which ``match(event)`` is true."""
+        w = _Watch(match)
+        self._watches.add(w)
+        try:
+            yield w
+        finally:
+            self._watches.discard(w)
+
+    def _dispatch(self, event: dict[str, Any]) -> None:
+        event_id = event.get("event_id")
+        if isinstance(event_id, int):
+            if event_id in self._seen_set:
+                return
+            if len(self._seen) == self._seen.maxlen:
+                self._seen_set.discard(self._seen[0])
+            self._seen.append(event_id)
+            self._seen_set.add(event_id)
+            self._last_id = max(self._last_id or 0, event_id)
+        metrics.inc("status_feed_events_total")
+        for w in list(self._watches):
+            try:
+                if w.match(event):
+                    w.last = event
+                    w.event.set()
+            except Exception:
+                log.exception("status feed: watch failed")
+
+    async def _catch_up(self) -> None:
+        async with AsyncSessionLocal() as db:
+            if self._last_id is None:
+                # first connect: nothing was missed, start from the newest event
+                self._last_id = (await db.execute(
+                    select(DeploymentStatusEvent.id).order_by(DeploymentStatusEvent.id.desc()).limit(1)
+                )).scalar() or 0
+                self._floor = self._last_id
+                return
+            # ids come from a sequence and can commit out of order, so look back a
+            # little (never past the first connect); events already delivered are
+            # dropped by _dispatch
+            after = max(self._last_id - settings.status_feed_catchup_overlap, self._floor)
+            while True:
+                batch = await events_since(db, after)
+                for event in batch:
+                    self._dispatch(event)
+                metrics.inc("status_feed_caught_up_total", len(batch))
+                if len(batch) < _PAGE:
+                    return
+                after = batch[-1]["event_id"]
+
+    async def _run(self) -> None:
+        dsn = make_url(self._listen_url()).set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    # listening before the catch-up query leaves no gap between them
+                    await self._catch_up()
+                    self.connected = True
+                    async for n in conn.notifies():
+                        try:
+                            self._dispatch(json.loads(n.payload))
+                        except ValueError:
+                            log.warning("status feed: bad payload %r", n.payload)
+            except asyncio.CancelledError:
+                raise
+            except (psycopg.Error, SQLAlchemyError, OSError) as e:
+                log.warning("status feed: listener connection lost, reconnecting: %s", e)
+            self.connected = False
+            metrics.inc("status_feed_reconnects_total")
+            await asyncio.sleep(settings.status_feed_reconnect_s)
+
+
+status_feed = StatusFeed()
@@ -1,34 +1,130 @@
 from __future__ import annotations
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
 
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import delete, update
+
+from . import jobs
 from .core.config import settings
+from .db.session import AsyncSessionLocal
 from .models.deployment import Deployment
-from .services.k8s import (
-    wait_deployment_ready,
-    wait_service_endpoints_ready,
-    check_ready_strict,
-)
-
-
-def finalize_deployment(deployment_id: str) -> None:
-    """Background task: wait for K8s readiness then mark DB record READY/ERROR."""
-    engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
-    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
-    db = SessionLocal()
+from .models.job import Job
+from .services import k8s_async
+from .services.helm import helm_uninstall_async
+
+# rows a rollout follow-up may still write to; a DELETING row is never brought back
+LIVE_STATES = ("CREATING", "PENDING", "READY", "ERROR")
+
+
+async def finalize_deployment(job: Job) -> None:
+    """Wait for a rollout then record the resulting READY/ERROR status.
+
+    No session is held during the waits. The result is only written if the
+    row is still live, so a delete issued meanwhile wins. New deployments are
+    finalized in bulk by the reconciler instead.
+    """
+    async with AsyncSessionLocal() as db:
+        d = await db.get(Deployment, job.deployment_id)
+        if not d or d.status not in LIVE_STATES:
+            return
+        namespace, name = d.namespace, d.slug
     try:
-        d = db.query(Deployment).filter(Deployment.id == deployment_id).first()
+        await k8s_async.wait_deployment_ready(namespace, name)
+        await k8s_async.wait_service_endpoints_ready(namespace, name)
+        status, error = await k8s_async.check_ready_strict(namespace, name), None
+    except Exception as e:
+        status, error = "ERROR", str(e)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Deployment)
+            .where(Deployment.id == job.deployment_id, Deployment.status.in_(LIVE_STATES))
+            .values(status=status, last_error=error)
+        )
+        await db.commit()
+
+
+async def create_deployment(job: Job) -> None:
+    """``create`` jobs queued before the reconciler took over new deployments.
+
+    Their rows are CREATING, which the reconciler resolves on its next pass;
+    without a reconciler the rollout is followed here as before.
+    """
+    if not settings.reconcile_enabled:
+        await finalize_deployment(job)
+
+
+async def delete_deployment(job: Job) -> None:
+    """Uninstall the release, delete the namespace, wait for it to go, then drop the row.
+
+    The row is read and written in short sessions; none is held during the waits.
+    """
+    async with AsyncSessionLocal() as db:
+        d = await db.get(Deployment, job.deployment_id)
         if not d:
             return
-        try:
-            wait_deployment_ready(d.namespace, d.slug)
-            wait_service_endpoints_ready(d.namespace, d.slug)
-            d.status = check_ready_strict(d.namespace, d.slug)
-            d.last_error = None
-        except Exception as e:
-            d.status = "ERROR"
-            d.last_error = str(e)
-        db.add(d)
-        db.commit()
-    finally:
-        db.close()
+        namespace, release = d.namespace, d.slug
+    try:
+        if settings.helm_enabled:
+            await helm_uninstall_async(namespace=namespace, release=release)
+        await k8s_async.delete_namespace(namespace)
+        await k8s_async.wait_namespace_gone(namespace)
+    except Exception as e:
+        # stays DELETING while the job still has retries left
+        values: dict = {"last_error": str(e)}
+        if job.attempts >= settings.job_max_attempts:
+            values["status"] = "ERROR"
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(Deployment).where(Deployment.id == job.deployment_id).values(**values))
+            await db.commit()
+        raise
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Deployment).where(Deployment.id == job.deployment_id))
+        await db.commit()
+
+
+async def teardown_account(job: Job) -> None:
+    """Uninstall and delete every namespace of a closed account, then wait for all of them.
+
+    At most ``teardown_concurrency`` uninstall/delete pairs run at once. The
+    waits share one namespace watch. Progress is saved on the job for
+    GET /auth/account/teardown/{id}; failures are reported there, not retried.
+    """
+    items = job.payload.get("deployments", [])
+    progress: dict = {"phase": "deleting", "total": len(items), "deleted": [], "errors": {}}
+    limit = asyncio.Semaphore(settings.teardown_concurrency)
+
+    async def start(item: dict) -> None:
+        async with limit:
+            try:
+                if settings.helm_enabled:
+                    await helm_uninstall_async(namespace=item["namespace"], release=item["release"])
+                await k8s_async.delete_namespace(item["namespace"])
+            except Exception as e:
+                progress["errors"][item["namespace"]] = str(e)
+
+    async with AsyncSessionLocal() as db:
+        await asyncio.gather(*(start(i) for i in items))
+        progress["phase"] = "waiting"
+        await jobs.save_progress(db, job, progress)
+        pending = [i["namespace"] for i in items if i["namespace"] not in progress["errors"]]
+        saved_at = time.monotonic()
+        async for gone in k8s_async.namespaces_gone(pending, settings.teardown_timeout_s):
+            progress["deleted"] += sorted(gone)
+            if time.monotonic() - saved_at >= 1:
+                await jobs.save_progress(db, job, progress)
+                saved_at = time.monotonic()
+        for ns in set(pending) - set(progress["deleted"]):
+            progress["errors"][ns] = "namespace still exists"
+        progress["phase"] = "done"
+        await jobs.save_progress(db, job, progress)
+
+
+# job kind -> handler; a handler that raises is retried with backoff
+HANDLERS: dict[str, Callable[[Job], Awaitable[None]]] = {
+    "create": create_deployment,
+    "scale": finalize_deployment,
+    "delete": delete_deployment,
+    "teardown": teardown_account,
+}
@@ -0,0 +1,147 @@
+"""Job worker: ``python -m src.worker``.
+
+Runs up to ``worker_concurrency`` jobs at once from the ``jobs`` table, using
+the process-wide async engine, next to the status reconciler. The API also
+embeds both (``worker_embedded``) so a single-container setup needs no extra
+process.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from . import jobs
+from .core.config import settings
+from .core.metrics import metrics
+from .db.session import AsyncSessionLocal
+from .models.job import Job
+from .reconciler import Reconciler
+from .services.charts import chart_engine
+from .services.informer import tenant_cache
+from .tasks import HANDLERS
+
+log = logging.getLogger(__name__)
+
+
+class Worker:
+    def __init__(self, concurrency: int | None = None) -> None:
+        self.concurrency = concurrency or settings.worker_concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._running: set[asyncio.Task] = set()
+        self._wake: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopping = False
+
+    def wake(self) -> None:
+        if self._loop and self._wake:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        jobs.on_enqueue(self.wake)
+        metrics.gauge("jobs_running", lambda: len(self._running))
+        log.info("worker %s started (concurrency=%d)", self.worker_id, self.concurrency)
+        while not self._stopping:
+            self._wake.clear()
+            free = self.concurrency - len(self._running)
+            claimed: list[Job] = []
+            if free > 0:
+                try:
+                    async with AsyncSessionLocal() as db:
+                        claimed = await jobs.claim(db, self.worker_id, free)
+                except (SQLAlchemyError, OSError) as e:
+                    log.warning("claiming jobs failed: %s", e)
+            for job in claimed:
+                task = asyncio.create_task(self._execute(job))
+                self._running.add(task)
+                task.add_done_callback(self._done)
+            if len(claimed) == free > 0:
+                # queue may hold more; go straight back once a slot frees up
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=settings.job_poll_interval_s)
+            except TimeoutError:
+                pass
+
+    def _done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        if self._wake:
+            self._wake.set()
+
+    async def _heartbeat(self, job: Job) -> None:
+        while True:
+            await asyncio.sleep(settings.job_lease_s / 3)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await jobs.extend_lease(db, job.id, self.worker_id)
+            except (SQLAlchemyError, OSError) as e:
+                log.warning("lease renewal for job %s failed: %s", job.id, e)
+
+    async def _execute(self, job: Job) -> None:
+        handler = HANDLERS.get(job.kind)
+        beat = asyncio.create_task(self._heartbeat(job))
+        try:
+            if handler is None:
+                raise ValueError(f"unknown job kind {job.kind!r}")
+            await handler(job)
+        except asyncio.CancelledError:
+            # shutting down: leave the row running; the lease expiry hands it to the next worker
+            raise
+        except Exception as e:
+            log.warning("job %s (%s) attempt %d failed: %s", job.id, job.kind, job.attempts, e)
+            metrics.inc("jobs_failed_total")
+            async with AsyncSessionLocal() as db:
+                await jobs.fail(db, job, str(e))
+        else:
+            metrics.inc("jobs_completed_total")
+            async with AsyncSessionLocal() as db:
+                await jobs.complete(db, job.id)
+        finally:
+            beat.cancel()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self.wake()
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+
+async def _main() -> None:
+    if settings.helm_enabled and settings.helm_mode != "cli":
+        chart_engine.preload([settings.helm_chart_path, settings.helm_chart_path_tomcat])
+    if settings.informer_enabled:
+        tenant_cache.start()
+    worker = Worker()
+    reconciler = Reconciler() if settings.reconcile_enabled else None
+    loop = asyncio.get_running_loop()
+    tasks = [asyncio.create_task(worker.run())]
+    if reconciler:
+        tasks.append(asyncio.create_task(reconciler.run()))
+
+    def shutdown() -> None:
+        if reconciler:
+            reconciler.stop()
+        asyncio.ensure_future(worker.stop())
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, shutdown)
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        tenant_cache.stop()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
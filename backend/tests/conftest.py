@@ -0,0 +1,55 @@
+import pathlib
+import sys
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """A TestClient on a file SQLite database, signed in as user ``a``.
+
+    ``api.db()`` opens a sync session on the same database for seeding and
+    checking rows; Kubernetes and Helm calls are left for each test to stub.
+    """
+    from src import deps
+    from src.db.session import get_async_db, get_db
+    from src.deps import CurrentUser, get_current_user
+    from src.main import app
+    from src.models import deployment, job  # noqa: F401
+    from src.models.user import Base, User
+    from src.routers import deployments as deployments_router
+
+    path = tmp_path / "api.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    SyncSession = sessionmaker(bind=engine, expire_on_commit=False)
+    AsyncSessionLocal = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False, class_=AsyncSession)
+    with SyncSession() as db:
+        user = User(email="a@example.com", user_slug="a", password_hash="x")
+        db.add(user)
+        db.commit()
+        current = CurrentUser(id=user.id, email=user.email, user_slug=user.user_slug)
+
+    def override_db():
+        with SyncSession() as db:
+            yield db
+
+    async def override_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    # account deletes revoke user ids process-wide; keep that inside the test
+    monkeypatch.setattr(deps, "identity_cache", deps._IdentityCache())
+    monkeypatch.setattr(deployments_router, "AsyncSessionLocal", AsyncSessionLocal)
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_async_db)
+    monkeypatch.setitem(app.dependency_overrides, get_current_user, lambda: current)
+    return SimpleNamespace(client=TestClient(app), user=current, db=SyncSession)
@@ -0,0 +1,54 @@
+from sqlalchemy import select
+
+from src.models.deployment import Deployment
+from src.models.job import Job
+from src.models.user import User
+
+
+def _seed(api, *slugs):
+    with api.db() as db:
+        db.add_all([
+            Deployment(user_id=api.user.id, display_name=s, slug=s, namespace=f"tenant-a-{s}", unique_id=s,
+                       ingress_host=f"{s}.example", status="READY")
+            for s in slugs
+        ])
+        db.commit()
+
+
+def test_account_delete_hands_namespaces_to_a_teardown_job(api):
+    _seed(api, "web", "cat")
+    res = api.client.delete("/auth/account")
+    assert res.status_code == 202
+    body = res.json()
+    assert body["status_url"] == f"/auth/account/teardown/{body['job_id']}"
+    with api.db() as db:
+        assert db.get(User, api.user.id) is None
+        assert db.execute(select(Deployment)).first() is None
+        (job,) = db.execute(select(Job)).scalars()
+    assert (str(job.id), job.kind, job.status) == (body["job_id"], "teardown", "queued")
+    assert sorted(job.payload["deployments"], key=lambda i: i["release"]) == [
+        {"namespace": "tenant-a-cat", "release": "cat"},
+        {"namespace": "tenant-a-web", "release": "web"},
+    ]
+
+
+def test_teardown_status_reports_the_job(api):
+    _seed(api, "web", "cat", "old")
+    queued = api.client.delete("/auth/account").json()
+    status_url = queued["status_url"]
+    assert api.client.get(status_url).json() == {
+        "id": queued["job_id"], "status": "queued", "phase": "queued", "total": 3, "deleted": 0, "remaining": 3, "errors": [],
+    }
+    # the teardown task records its progress in the job payload
+    with api.db() as db:
+        job = db.execute(select(Job)).scalar_one()
+        job.status = "running"
+        job.payload = {**job.payload, "progress": {"phase": "waiting", "total": 3, "deleted": ["tenant-a-web"], "errors": {"tenant-a-old": "forbidden"}}}
+        db.commit()
+    body = api.client.get(status_url).json()
+    assert (body["status"], body["phase"], body["deleted"], body["remaining"]) == ("running", "waiting", 1, 1)
+    assert body["errors"] == [{"namespace": "tenant-a-old", "error": "forbidden"}]
+
+
+def test_unknown_teardown_job_is_a_404(api):
+    assert api.client.get("/auth/account/teardown/00000000-0000-0000-0000-000000000000").status_code == 404
@@ -0,0 +1,89 @@
+import asyncio
+import pathlib
+import sys
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src import deps
+from src.core.security import create_access_token
+from src.deps import CurrentUser, _IdentityCache
+from src.models import deployment  # noqa: F401
+from src.models.user import Base, User
+
+ALICE = CurrentUser(id=1, email="a@example.com", user_slug="a")
+BOB = CurrentUser(id=2, email="b@example.com", user_slug="b")
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(deps.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(deps.settings, "auth_cache_ttl_s", 60.0)
+    cache = _IdentityCache()
+    cache.put("t1", ALICE, token_exp=None)
+    assert cache.get("t1") == ALICE
+    clock[0] += 61
+    assert cache.get("t1") is None
+
+
+def test_entry_never_outlives_its_token(monkeypatch):
+    monkeypatch.setattr(deps.settings, "auth_cache_ttl_s", 60.0)
+    cache = _IdentityCache()
+    cache.put("expired", ALICE, token_exp=deps.time.time() - 1)
+    assert cache.get("expired") is None
+
+
+def test_invalidate_drops_and_refuses_the_user():
+    cache = _IdentityCache()
+    cache.put("a1", ALICE, token_exp=None)
+    cache.put("a2", ALICE, token_exp=None)
+    cache.put("b1", BOB, token_exp=None)
+    cache.invalidate(ALICE.id)
+    assert cache.get("a1") is None and cache.get("a2") is None
+    assert cache.get("b1") == BOB
+    cache.put("a3", ALICE, token_exp=None)
+    assert cache.revoked(ALICE.id) and cache.get("a3") is None
+
+
+def test_lapsed_revocations_are_pruned(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(deps.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(deps.settings, "access_token_ttl_minutes", 1)
+    cache = _IdentityCache()
+    for uid in range(1, 4):
+        cache.invalidate(uid)
+    clock[0] += 30
+    cache.invalidate(1)  # re-revoking moves the user to the back
+    clock[0] += 31
+    cache.invalidate(4)
+    assert list(cache._revoked) == [1, 4]
+    assert cache.revoked(1) and not cache.revoked(2)
+
+
+def test_claims_token_of_deleted_account_is_refused(monkeypatch):
+    # another process deleted the account: nothing was invalidated locally
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(deps, "identity_cache", _IdentityCache())
+        async with Session() as db:
+            user = User(email="a@example.com", user_slug="a", password_hash="x")
+            db.add(user)
+            await db.commit()
+            token = create_access_token(sub=user.email, uid=user.id, slug=user.user_slug)
+            assert (await deps.resolve_token(token, db)).id == user.id
+            await db.delete(user)
+            await db.commit()
+            deps.identity_cache._entries.clear()  # as after AUTH_CACHE_TTL_S
+            with pytest.raises(HTTPException) as exc:
+                await deps.resolve_token(token, db)
+            assert exc.value.status_code == 401
+        await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from src.models.deployment import Deployment
+from src.routers import deployments as deployments_router
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    """Raw-manifest provisioning with fake namespace and apply calls."""
+    state = {"running": 0, "peak": 0, "applied": []}
+
+    async def ensure_namespace(namespace):
+        pass
+
+    async def apply_nginx(spec):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.02)
+        state["running"] -= 1
+        if spec.name == "broken":
+            raise RuntimeError("quota exceeded")
+        state["applied"].append((spec.name, spec.replicas))
+
+    monkeypatch.setattr(deployments_router.settings, "helm_enabled", False)
+    monkeypatch.setattr(deployments_router, "ensure_namespace", ensure_namespace)
+    monkeypatch.setattr(deployments_router, "apply_nginx", apply_nginx)
+    return state
+
+
+def test_each_item_gets_its_own_result(api, cluster):
+    items = [{"displayName": "Web", "replicas": 2}, {"displayName": "broken"}, {"displayName": "Cat", "serverType": "tomcat"}]
+    res = api.client.post("/deployments:batch", json={"items": items})
+    assert res.status_code == 200
+    body = res.json()
+    assert [(r["index"], r["ok"]) for r in body] == [(0, True), (1, False), (2, True)]
+    # one failure does not stop the rest, and is recorded on its own row
+    assert body[1]["error"] == "quota exceeded"
+    assert body[1]["deployment"]["status"] == "ERROR"
+    assert sorted(cluster["applied"]) == [("cat", 1), ("web", 2)]
+    with api.db() as db:
+        rows = {d.slug: (d.status, d.applied_replicas) for d in db.execute(select(Deployment)).scalars()}
+    assert rows == {"web": ("CREATING", 2), "broken": ("ERROR", None), "cat": ("CREATING", 1)}
+
+
+def test_provisioning_is_bounded_by_batch_concurrency(api, cluster, monkeypatch):
+    monkeypatch.setattr(deployments_router.settings, "batch_concurrency", 2)
+    res = api.client.post("/deployments:batch", json={"items": [{"displayName": f"w{n}"} for n in range(6)]})
+    assert all(r["ok"] for r in res.json())
+    assert cluster["peak"] == 2
+
+
+def test_oversized_batch_is_refused(api, cluster, monkeypatch):
+    monkeypatch.setattr(deployments_router.settings, "batch_max_items", 2)
+    res = api.client.post("/deployments:batch", json={"items": [{"displayName": f"w{n}"} for n in range(3)]})
+    assert res.status_code == 413
+    with api.db() as db:
+        assert db.execute(select(Deployment)).first() is None
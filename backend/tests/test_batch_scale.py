@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import select
+
+from src.models.deployment import Deployment
+from src.models.job import Job
+from src.routers import deployments as deployments_router
+
+
+def _seed(api, *specs):
+    """Deployments for ``api.user``: (slug, server_type, status, applied_replicas)."""
+    with api.db() as db:
+        ds = [
+            Deployment(user_id=api.user.id, display_name=slug, slug=slug, namespace=f"tenant-a-{slug}", unique_id=slug[:8],
+                       ingress_host=f"{slug}.example", status=status, server_type=st, applied_replicas=applied)
+            for slug, st, status, applied in specs
+        ]
+        db.add_all(ds)
+        db.commit()
+        return [str(d.id) for d in ds]
+
+
+@pytest.fixture
+def patched(monkeypatch):
+    calls = []
+
+    async def patch_replicas(namespace, name, replicas):
+        if name == "broken":
+            raise RuntimeError("api down")
+        calls.append((name, replicas))
+
+    async def invalidate(namespace, name):
+        pass
+
+    monkeypatch.setattr(deployments_router.k8s_async, "patch_replicas", patch_replicas)
+    monkeypatch.setattr(deployments_router.report_cache, "invalidate", invalidate)
+    return calls
+
+
+def test_items_skip_unchanged_and_report_errors(api, patched):
+    same, other, broken = _seed(api, ("same", "nginx", "READY", 2), ("other", "nginx", "READY", 1), ("broken", "nginx", "READY", 1))
+    missing = "00000000-0000-0000-0000-000000000000"
+    items = [{"id": i, "replicas": 2} for i in (same, other, broken, missing)]
+    res = api.client.post("/deployments:scale", json={"items": items})
+    assert res.status_code == 200
+    by_id = {r["id"]: r for r in res.json()}
+    assert [r["id"] for r in res.json()] == [same, other, broken, missing]
+    assert by_id[same]["ok"] and by_id[other]["ok"]
+    assert (by_id[broken]["ok"], by_id[broken]["error"]) == (False, "api down")
+    assert (by_id[missing]["ok"], by_id[missing]["error"]) == (False, "Not found")
+    # the stored count already matches: no patch and no follow-up job
+    assert patched == [("other", 2)]
+    with api.db() as db:
+        assert db.execute(select(Deployment.applied_replicas).where(Deployment.slug == "other")).scalar() == 2
+        assert db.execute(select(Deployment.applied_replicas).where(Deployment.slug == "broken")).scalar() == 1
+        assert [(j.kind, j.payload) for j in db.execute(select(Job)).scalars()] == [("scale", {"replicas": 2})]
+
+
+def test_selector_scales_matching_deployments(api, patched):
+    _seed(api, ("web", "nginx", "READY", 1), ("cat", "tomcat", "READY", 1), ("old", "nginx", "DELETING", 1))
+    res = api.client.post("/deployments:scale", json={"selector": {"server_type": "NGINX"}, "replicas": 3})
+    assert res.status_code == 200
+    assert [(r["ok"], r["replicas"]) for r in res.json()] == [(True, 3)]
+    assert patched == [("web", 3)]
+
+
+def test_selector_needs_a_replica_count(api, patched):
+    res = api.client.post("/deployments:scale", json={"selector": {}})
+    assert res.status_code == 422
+
+
+def test_single_scale_records_the_count_for_batch(api, patched, monkeypatch):
+    # a scale outside the chart path must keep the stored count current,
+    # otherwise a later batch scale back to the old count is skipped
+    monkeypatch.setattr(deployments_router.settings, "helm_enabled", False)
+
+    async def get(namespace, name):
+        raise RuntimeError("no report")
+
+    monkeypatch.setattr(deployments_router.report_cache, "get", get)
+    (web,) = _seed(api, ("web", "nginx", "READY", 1))
+    assert api.client.patch(f"/deployments/{web}/scale", json={"replicas": 4}).status_code == 200
+    res = api.client.post("/deployments:scale", json={"items": [{"id": web, "replicas": 1}]})
+    assert res.json()[0]["ok"]
+    assert patched == [("web", 4), ("web", 1)]
@@ -0,0 +1,79 @@
+import pathlib
+import shutil
+import subprocess
+import sys
+
+import pytest
+import yaml
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.services.charts import ChartEngine
+
+CHARTS = root.parent / "helm"
+
+
+def test_render_nginx_with_index_mounts_configmap():
+    engine = ChartEngine()
+    values = {"nameOverride": "web1", "host": "web1.example", "image": "nginx:alpine", "replicaCount": 2, "indexHtml": "<h1>hi</h1>"}
+    objs = engine.render(str(CHARTS / "tenant-nginx"), "tenant-a-1", "web1", values)
+    assert [o["kind"] for o in objs] == ["ConfigMap", "Deployment", "Service", "Ingress"]
+    dep = objs[1]
+    assert dep["metadata"]["namespace"] == "tenant-a-1"
+    assert dep["spec"]["replicas"] == 2
+    assert dep["spec"]["template"]["spec"]["volumes"][0]["configMap"]["name"] == "web1-index"
+    # second render with the same inputs comes from the cache
+    engine.render(str(CHARTS / "tenant-nginx"), "tenant-a-1", "web1", values)
+    assert (engine.hits, engine.misses) == (1, 1)
+
+
+@pytest.mark.parametrize(("override", "expected"), [
+    ("a" * 61 + "--", "a" * 61 + "-"),  # trimSuffix removes one "-" only
+    ("b" * 62 + "-" + "tail", "b" * 62),  # trunc 63 first, then the suffix
+    ("web--x", "web--x"),
+])
+def test_fullname_matches_trunc_and_trim_suffix(override, expected):
+    engine = ChartEngine()
+    objs = engine.render(str(CHARTS / "tenant-tomcat"), "tenant-a-3", "cat", {"nameOverride": override, "host": "cat.example"})
+    assert {o["metadata"]["name"] for o in objs} == {expected}
+
+
+def test_render_tomcat_defaults():
+    engine = ChartEngine()
+    objs = engine.render(str(CHARTS / "tenant-tomcat"), "tenant-a-2", "cat", {"nameOverride": "cat", "host": "cat.example"})
+    container = objs[0]["spec"]["template"]["spec"]["containers"][0]
+    assert container["ports"] == [{"containerPort": 8080}]
+    assert objs[1]["spec"]["ports"] == [{"port": 80, "targetPort": 8080}]
+
+
+PARITY_CASES = [
+    ("tenant-nginx", {"nameOverride": "web1", "host": "web1.example", "replicaCount": 2}),
+    ("tenant-nginx", {
+        "nameOverride": "web2",
+        "host": "web2.example",
+        "indexHtml": "<h1>hi</h1>\n<p>there</p>",
+        "command": ["nginx", "-g", "daemon off;"],
+        "lifecycle": {"postStart": {"enabled": True, "command": ["sh", "-c", "echo up"]}},
+        "ingressClass": "nginx",
+        "containerPort": 8081,
+    }),
+    ("tenant-tomcat", {"nameOverride": "cat", "host": "cat.example"}),
+]
+
+
+@pytest.mark.skipif(shutil.which("helm") is None, reason="helm binary not installed")
+@pytest.mark.parametrize("chart,values", PARITY_CASES)
+def test_engine_matches_helm_template(tmp_path, chart, values):
+    values_file = tmp_path / "values.yaml"
+    values_file.write_text(yaml.safe_dump(values))
+    out = subprocess.run(
+        ["helm", "template", values["nameOverride"], str(CHARTS / chart), "-n", "tenant-a-1", "-f", str(values_file)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    expected = {(o["kind"], o["metadata"]["name"]): o for o in yaml.safe_load_all(out) if o}
+    rendered = ChartEngine().render(str(CHARTS / chart), "tenant-a-1", values["nameOverride"], values)
+    for o in rendered:
+        # helm leaves the namespace to the release; the engine stamps it
+        o["metadata"].pop("namespace")
+    assert {(o["kind"], o["metadata"]["name"]): o for o in rendered} == expected
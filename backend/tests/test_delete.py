@@ -0,0 +1,30 @@
+from sqlalchemy import select
+
+from src.models.deployment import Deployment
+from src.models.job import Job
+
+
+def _seed(api, status="READY"):
+    with api.db() as db:
+        d = Deployment(user_id=api.user.id, display_name="web", slug="web", namespace="tenant-a-1", unique_id="abc",
+                       ingress_host="web.example", status=status)
+        db.add(d)
+        db.commit()
+        return str(d.id)
+
+
+def test_delete_marks_the_row_and_queues_one_job(api):
+    dep_id = _seed(api)
+    res = api.client.delete(f"/deployments/{dep_id}")
+    assert res.status_code == 202
+    assert res.headers["location"] == f"/deployments/{dep_id}/status"
+    assert res.json() == {"id": dep_id, "status": "DELETING", "status_url": f"/deployments/{dep_id}/status"}
+    # a repeat request answers the same way without queueing a second teardown
+    assert api.client.delete(f"/deployments/{dep_id}").json()["status"] == "DELETING"
+    with api.db() as db:
+        assert db.execute(select(Deployment.status)).scalar() == "DELETING"
+        assert [(j.kind, str(j.deployment_id), j.status) for j in db.execute(select(Job)).scalars()] == [("delete", dep_id, "queued")]
+
+
+def test_delete_of_unknown_deployment_is_a_404(api):
+    assert api.client.delete("/deployments/00000000-0000-0000-0000-000000000000").status_code == 404
@@ -0,0 +1,141 @@
+import asyncio
+import pathlib
+import sys
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.services.event_hub import HEARTBEAT, EventHub, merge, merge_patch
+
+
+def _counter(sent: list, started: list):
+    async def producer():
+        started.append(1)
+        n = 0
+        while True:
+            n += 1
+            sent.append(n)
+            yield n
+            await asyncio.sleep(0.01)
+    return producer
+
+
+async def _take(stream, n: int) -> list:
+    out = []
+    async for item in stream:
+        out.append(item)
+        if len(out) == n:
+            break
+    await stream.aclose()
+    return out
+
+
+def test_resume_after_last_subscriber_leaves():
+    async def run():
+        hub = EventHub("t_linger", history=100, linger_s=5)
+        sent, started = [], []
+        first = await _take(hub.subscribe("k", _counter(sent, started)), 3)
+        cursor = first[-1][0]
+        await asyncio.sleep(0.05)  # frames produced while nobody is connected
+        # the reconnect resumes right after the last frame it saw, from the same producer
+        assert hub.lookup("k", cursor) == 3
+        resumed = await _take(hub.subscribe("k", _counter(sent, started), after=cursor), 3)
+        assert [item for _, item in resumed] == [4, 5, 6]
+        assert len(started) == 1
+
+    asyncio.run(run())
+
+
+def test_channel_dropped_after_linger():
+    async def run():
+        hub = EventHub("t_expire", history=100, linger_s=0.05)
+        sent, started = [], []
+        first = await _take(hub.subscribe("k", _counter(sent, started)), 1)
+        await asyncio.sleep(0.2)
+        assert hub.lookup("k", first[0][0]) is None
+        produced = len(sent)
+        await asyncio.sleep(0.05)
+        assert len(sent) == produced  # producer stopped
+
+    asyncio.run(run())
+
+
+def test_subscribers_share_one_producer():
+    async def run():
+        hub = EventHub("t_shared")
+        sent, started = [], []
+        a = hub.subscribe("k", _counter(sent, started))
+        first = await a.__anext__()
+        b = await _take(hub.subscribe("k", _counter(sent, started)), 2)
+        # the late subscriber gets the latest frame (replay=1), then live ones
+        assert b[0][1] >= first[1]
+        assert len(started) == 1
+        await a.aclose()
+        await asyncio.sleep(0)
+        assert "k" not in hub._channels
+
+    asyncio.run(run())
+
+
+def test_slow_subscriber_drops_oldest_frames(monkeypatch):
+    monkeypatch.setattr("src.services.event_hub.settings.sse_queue_size", 3)
+
+    async def run():
+        hub = EventHub("t_drop")
+
+        async def burst():
+            for n in range(1, 11):
+                yield n
+
+        # the whole burst lands before the subscriber reads anything; its
+        # queue (3 slots, one taken by the end marker) keeps the newest frames
+        items = [item async for _, item in hub.subscribe("k", burst)]
+        assert items == [9, 10]
+
+    asyncio.run(run())
+
+
+def test_unknown_or_evicted_cursor_gets_the_normal_replay():
+    async def run():
+        hub = EventHub("t_cursor", replay=1, history=3, linger_s=5)
+        sent, started = [], []
+        frames = await _take(hub.subscribe("k", _counter(sent, started)), 6)
+        oldest = frames[0][0]
+        epoch, _, seq = frames[-1][0].partition("-")
+        assert [c for c, _ in frames] == [f"{epoch}-{n}" for n in range(1, 7)]
+        for cursor in (oldest, "0-1", "garbage", None):
+            assert hub.lookup("k", cursor) is None
+            (first,) = await _take(hub.subscribe("k", _counter(sent, started), after=cursor), 1)
+            # replay=1: the newest frame held, not a resume
+            assert int(first[0].partition("-")[2]) >= int(seq)
+
+    asyncio.run(run())
+
+
+def test_merge_interleaves_and_sends_heartbeats():
+    async def run():
+        async def slow():
+            await asyncio.sleep(0.08)
+            yield "late"
+
+        async def quick():
+            yield "now"
+
+        items = [i async for i in merge(slow(), quick(), heartbeat_s=0.03)]
+        assert items[0] == "now"
+        assert items[-1] == "late"
+        assert HEARTBEAT in items
+
+    asyncio.run(run())
+
+
+def test_merge_patch():
+    old = {"status": "CREATING", "report": {"replicas": 1, "ready_replicas": 0, "pods": [{"name": "a"}]}, "error": "x"}
+    new = {"status": "READY", "report": {"replicas": 1, "ready_replicas": 1, "pods": [{"name": "b"}]}}
+    assert merge_patch(old, new) == {
+        "status": "READY",
+        "report": {"ready_replicas": 1, "pods": [{"name": "b"}]},  # lists are replaced whole
+        "error": None,
+    }
+    assert merge_patch(new, new) == {}
+    assert merge_patch({"a": 1}, [1, 2]) == [1, 2]
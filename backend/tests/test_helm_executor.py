@@ -0,0 +1,48 @@
+import pathlib
+import sys
+import threading
+
+import pytest
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.services import helm_executor as helm_executor_mod
+from src.services.helm_executor import HelmExecutor
+
+
+def test_queued_upgrades_coalesce_to_latest_values(monkeypatch):
+    gate, started = threading.Event(), threading.Event()
+    calls = []
+    in_flight = []
+
+    def fake_upgrade(namespace, release, chart_dir, values):
+        in_flight.append(release)
+        assert in_flight.count(release) == 1  # never two upgrades of one release at once
+        calls.append((release, values["replicaCount"]))
+        started.set()
+        gate.wait(5)
+        in_flight.remove(release)
+
+    monkeypatch.setattr(helm_executor_mod, "helm_upgrade_install", fake_upgrade)
+    ex = HelmExecutor(max_workers=2)
+    first = ex.submit("ns", "web", "chart", {"replicaCount": 1})
+    # wait until the first upgrade is running, then queue a burst behind it
+    assert started.wait(5)
+    second = ex.submit("ns", "web", "chart", {"replicaCount": 2})
+    third = ex.submit("ns", "web", "chart", {"replicaCount": 3})
+    assert third is second
+    gate.set()
+    first.result(5)
+    second.result(5)
+    assert calls == [("web", 1), ("web", 3)]
+
+
+def test_upgrade_error_reaches_the_caller(monkeypatch):
+    def fail(namespace, release, chart_dir, values):
+        raise RuntimeError("helm failed")
+
+    monkeypatch.setattr(helm_executor_mod, "helm_upgrade_install", fail)
+    ex = HelmExecutor(max_workers=1)
+    with pytest.raises(RuntimeError, match="helm failed"):
+        ex.submit("ns", "web", "chart", {}).result(5)
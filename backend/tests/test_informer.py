@@ -0,0 +1,78 @@
+import pathlib
+import sys
+from types import SimpleNamespace
+from typing import ClassVar
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.services import informer as informer_mod
+from src.services import k8s
+from src.services.informer import Informer
+from src.services.kube_client import MANAGED_SELECTOR
+
+
+def _obj(ns, name, rv):
+    return SimpleNamespace(metadata=SimpleNamespace(namespace=ns, name=name, resource_version=rv))
+
+
+class FakeWatch:
+    events: ClassVar[list] = []
+
+    def stream(self, fn, **kwargs):
+        yield from self.events
+
+    def stop(self):
+        pass
+
+
+def test_bookmark_advances_resource_version(monkeypatch):
+    FakeWatch.events = [
+        {"type": "ADDED", "object": _obj("tenant-a-1", "web", "10"), "raw_object": {}},
+        # bookmarks arrive undecoded: the object is the raw dict
+        {"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "42"}}, "raw_object": {"metadata": {"resourceVersion": "42"}}},
+    ]
+    monkeypatch.setattr(informer_mod.watch, "Watch", FakeWatch)
+    inf = Informer("deployments", lambda: None, "app", "tenant-")
+    inf._rv = "1"
+    inf._stream()
+    assert inf._rv == "42"
+    assert inf.get("tenant-a-1", "web").metadata.resource_version == "10"
+
+
+def test_watch_events_update_store(monkeypatch):
+    FakeWatch.events = [
+        {"type": "ADDED", "object": _obj("tenant-a-1", "web", "11"), "raw_object": {}},
+        {"type": "ADDED", "object": _obj("kube-system", "dns", "12"), "raw_object": {}},
+        {"type": "DELETED", "object": _obj("tenant-a-1", "web", "13"), "raw_object": {}},
+    ]
+    monkeypatch.setattr(informer_mod.watch, "Watch", FakeWatch)
+    changes = []
+    inf = Informer("deployments", lambda: None, "app", "tenant-", on_change=lambda: changes.append(1))
+    inf._rv = "10"
+    inf._stream()
+    # namespaces outside the prefix are never stored; deletes empty the bucket
+    assert inf.list("kube-system") == []
+    assert inf.get("tenant-a-1", "web") is None
+    assert inf._rv == "13"
+    assert len(changes) == 2
+
+
+def test_tenant_cache_watches_managed_objects_only():
+    cache = informer_mod.TenantCache()
+    assert cache.namespaces._label_selector is None
+    for inf in (cache.deployments, cache.endpoints, cache.pods):
+        assert inf._label_selector == MANAGED_SELECTOR
+
+
+def test_unlabelled_tenant_is_read_live(monkeypatch):
+    cache = informer_mod.TenantCache()
+    monkeypatch.setattr(k8s, "tenant_cache", cache)
+    monkeypatch.setattr(cache, "serves", lambda ns: True)
+    cache.namespaces._store = {"": {"tenant-a-1": _obj("", "tenant-a-1", "1")}}
+    live = []
+    monkeypatch.setattr(k8s, "_fetch_live", lambda ns, name: live.append((ns, name)) or (None, None, []))
+    k8s.get_deployment_report("tenant-a-1", "web")
+    # a namespace the cache does not know is gone: no live read
+    k8s.get_deployment_report("tenant-b-1", "web")
+    assert live == [("tenant-a-1", "web")]
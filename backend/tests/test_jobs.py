@@ -0,0 +1,99 @@
+import asyncio
+import pathlib
+import sys
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src import jobs
+from src.core.config import settings
+
+# User's relationship needs the Deployment mapper registered
+from src.models import deployment  # noqa: F401
+from src.models.job import Job
+
+
+def _run(test):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Job.__table__.create)
+        try:
+            await test(async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+    asyncio.run(run())
+
+
+def test_claim_takes_each_job_once():
+    async def test(Session):
+        async with Session() as db:
+            for _ in range(3):
+                jobs.enqueue(db, "scale")
+            await db.commit()
+        async with Session() as db:
+            first = await jobs.claim(db, "w1", 2)
+            second = await jobs.claim(db, "w2", 2)
+            third = await jobs.claim(db, "w3", 2)
+        assert len(first) == 2 and len(second) == 1 and third == []
+        assert {j.id for j in first}.isdisjoint(j.id for j in second)
+        assert all(j.status == "running" and j.attempts == 1 for j in first + second)
+
+    _run(test)
+
+
+def test_expired_lease_is_claimable_again():
+    async def test(Session):
+        async with Session() as db:
+            job = jobs.enqueue(db, "delete")
+            await db.commit()
+        async with Session() as db:
+            await jobs.claim(db, "dead-worker", 1)
+            await db.execute(update(Job).values(locked_until=datetime.now(UTC) - timedelta(seconds=1)))
+            await db.commit()
+        async with Session() as db:
+            again = await jobs.claim(db, "w2", 1)
+        assert [j.id for j in again] == [job.id]
+        assert again[0].attempts == 2 and again[0].locked_by == "w2"
+
+    _run(test)
+
+
+def test_fail_backs_off_then_gives_up():
+    async def test(Session):
+        async with Session() as db:
+            jobs.enqueue(db, "scale")
+            await db.commit()
+        for attempt in range(1, settings.job_max_attempts + 1):
+            async with Session() as db:
+                # make the requeued job due now
+                await db.execute(update(Job).values(run_after=datetime.now(UTC) - timedelta(seconds=1)))
+                await db.commit()
+                (job,) = await jobs.claim(db, "w1", 1)
+                assert job.attempts == attempt
+                before = datetime.now(UTC)
+                await jobs.fail(db, job, "boom")
+            async with Session() as db:
+                row = (await db.execute(select(Job))).scalars().one()
+            if attempt < settings.job_max_attempts:
+                assert row.status == "queued"
+                delay = min(settings.job_retry_base_s * 2 ** (attempt - 1), 300)
+                run_after = row.run_after.replace(tzinfo=UTC)
+                assert abs((run_after - before).total_seconds() - delay) < 1
+            else:
+                assert row.status == "failed"
+        assert row.last_error == "boom"
+
+    _run(test)
+
+
+def test_claim_skips_locked_rows_on_postgres():
+    sql = str(
+        select(Job.id).with_for_update(skip_locked=True).compile(dialect=postgresql.dialect())
+    )
+    assert "FOR UPDATE SKIP LOCKED" in sql
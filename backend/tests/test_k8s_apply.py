@@ -0,0 +1,24 @@
+import threading
+import time
+
+from src.services import k8s
+
+
+def test_config_objects_are_applied_before_the_rest(monkeypatch):
+    events = []
+    lock = threading.Lock()
+
+    def apply(obj):
+        with lock:
+            events.append(("start", obj["kind"]))
+        if obj["kind"] == "ConfigMap":
+            time.sleep(0.05)  # a slow ConfigMap must still finish first
+        with lock:
+            events.append(("end", obj["kind"]))
+
+    monkeypatch.setattr(k8s, "server_side_apply", apply)
+    # build_nginx_manifests order, which puts the Deployment's volume source first
+    objs = [{"kind": kind, "metadata": {"name": "web"}} for kind in ("ConfigMap", "Deployment", "Service", "Ingress")]
+    k8s.apply_manifests(objs, parallel=True)
+    assert events[:2] == [("start", "ConfigMap"), ("end", "ConfigMap")]
+    assert sorted(kind for step, kind in events[2:] if step == "end") == ["Deployment", "Ingress", "Service"]
@@ -0,0 +1,108 @@
+import pathlib
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.services import k8s
+
+
+def _meta(ns, name, app=None):
+    return SimpleNamespace(namespace=ns, name=name, labels={"app": app} if app else {})
+
+
+def _dep(ns, name, ready):
+    return SimpleNamespace(metadata=_meta(ns, name), spec=SimpleNamespace(replicas=2),
+                           status=SimpleNamespace(ready_replicas=ready, available_replicas=ready, updated_replicas=ready))
+
+
+def _ep(ns, name, n):
+    return SimpleNamespace(metadata=_meta(ns, name), subsets=[SimpleNamespace(addresses=[object()] * n)])
+
+
+def _pod(ns, name, app):
+    return SimpleNamespace(metadata=_meta(ns, name, app), status=SimpleNamespace(phase="Running", container_statuses=[]))
+
+
+def _listing(items, delay=0.0):
+    def fn(**kwargs):
+        assert kwargs["label_selector"] == k8s.MANAGED_SELECTOR
+        time.sleep(delay)
+        return SimpleNamespace(items=items)
+    return fn
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    """Two labelled tenants, one outside the targets, and an unlabelled legacy tenant."""
+    reads = []
+
+    def read_deployment(name, namespace):
+        reads.append((namespace, name))
+        if (namespace, name) != ("tenant-c-1", "legacy"):
+            raise k8s.ApiException(status=404)
+        time.sleep(c.read_delay)
+        return _dep(namespace, name, 1)
+
+    c = SimpleNamespace(reads=reads, read_delay=0.0, delays={"deployments": 0.0, "endpoints": 0.0, "pods": 0.0})
+
+    def install():
+        d = c.delays
+        kube = SimpleNamespace(
+            apps=SimpleNamespace(
+                list_deployment_for_all_namespaces=_listing([_dep("tenant-a-1", "web", 2), _dep("tenant-b-1", "api", 1), _dep("other", "web", 2)], d["deployments"]),
+                read_namespaced_deployment=read_deployment,
+            ),
+            core=SimpleNamespace(
+                list_endpoints_for_all_namespaces=_listing([_ep("tenant-a-1", "web", 2), _ep("tenant-b-1", "api", 1)], d["endpoints"]),
+                list_pod_for_all_namespaces=_listing([_pod("tenant-a-1", "web-1", "web"), _pod("tenant-a-1", "web-2", "web"), _pod("tenant-b-1", "api-1", "api")], d["pods"]),
+                read_namespaced_endpoints=lambda name, namespace: _ep(namespace, name, 1),
+                list_namespaced_pod=lambda namespace, label_selector: SimpleNamespace(items=[_pod(namespace, "legacy-1", "legacy")]),
+            ),
+        )
+        monkeypatch.setattr(k8s, "kube", kube)
+
+    c.install = install
+    return c
+
+
+def test_lists_are_joined_per_target(cluster):
+    cluster.install()
+    out = k8s.get_deployment_reports([("tenant-a-1", "web"), ("tenant-b-1", "api")], timeout_s=2)
+    web, api = out[("tenant-a-1", "web")], out[("tenant-b-1", "api")]
+    assert (web["ready_replicas"], web["endpoints"], [p["name"] for p in web["pods"]]) == (2, 2, ["web-1", "web-2"])
+    assert (api["ready_replicas"], api["endpoints"], [p["name"] for p in api["pods"]]) == (1, 1, ["api-1"])
+    assert cluster.reads == []
+
+
+def test_unlabelled_tenant_is_read_directly(cluster):
+    cluster.install()
+    out = k8s.get_deployment_reports([("tenant-a-1", "web"), ("tenant-c-1", "legacy"), ("tenant-d-1", "gone")], timeout_s=2)
+    assert out[("tenant-c-1", "legacy")]["ready_replicas"] == 1
+    assert [p["name"] for p in out[("tenant-c-1", "legacy")]["pods"]] == ["legacy-1"]
+    # a target that does not exist at all comes back as an empty report
+    assert out[("tenant-d-1", "gone")]["replicas"] is None
+    assert sorted(cluster.reads) == [("tenant-c-1", "legacy"), ("tenant-d-1", "gone")]
+
+
+def test_slow_lists_and_reads_miss_the_budget(cluster):
+    cluster.delays["endpoints"] = 0.5
+    cluster.read_delay = 0.5
+    cluster.install()
+    started = time.monotonic()
+    out = k8s.get_deployment_reports([("tenant-a-1", "web"), ("tenant-c-1", "legacy")], timeout_s=0.2)
+    assert time.monotonic() - started < 0.45
+    web = out[("tenant-a-1", "web")]
+    assert (web["ready_replicas"], web["endpoints"], len(web["pods"])) == (2, None, 2)
+    assert out[("tenant-c-1", "legacy")] is None
+
+
+def test_missing_deployments_list_gives_no_reports(cluster):
+    cluster.delays["deployments"] = 0.5
+    cluster.install()
+    out = k8s.get_deployment_reports([("tenant-a-1", "web")], timeout_s=0.1)
+    assert out == {("tenant-a-1", "web"): None}
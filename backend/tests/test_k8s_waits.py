@@ -0,0 +1,58 @@
+import pathlib
+import sys
+import time
+from types import SimpleNamespace
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.services import k8s
+
+
+def _dep(ready: int, rv: str = "1"):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(resource_version=rv),
+        spec=SimpleNamespace(replicas=2),
+        status=SimpleNamespace(available_replicas=ready, ready_replicas=ready, updated_replicas=ready),
+    )
+
+
+def _fake_watch(events: list, seen: list):
+    class FakeWatch:
+        def stream(self, fn, *args, **kwargs):
+            seen.append(kwargs)
+            yield from events
+
+        def stop(self):
+            pass
+    return FakeWatch
+
+
+def _check(d, last):
+    return k8s.deployment_progress(d) if d is not None else (False, last)
+
+
+def test_wait_returns_on_watch_event(monkeypatch):
+    seen: list = []
+    events = [{"type": "MODIFIED", "object": _dep(1)}, {"type": "MODIFIED", "object": _dep(2)}]
+    monkeypatch.setattr(k8s.watch, "Watch", _fake_watch(events, seen))
+    started = time.monotonic()
+    last = k8s._wait_for(lambda: _dep(0, rv="7"), None, (), "web", _check, timeout_s=5)
+    assert last is None
+    assert time.monotonic() - started < 1
+    # the watch resumes from the read and only follows the named object
+    assert seen[0]["resource_version"] == "7"
+    assert seen[0]["field_selector"] == "metadata.name=web"
+
+
+def test_wait_reports_last_progress_on_timeout(monkeypatch):
+    monkeypatch.setattr(k8s.watch, "Watch", _fake_watch([{"type": "MODIFIED", "object": _dep(1)}], []))
+    monkeypatch.setattr(k8s.time, "sleep", lambda s: None)
+    last = k8s._wait_for(lambda: _dep(0), None, (), "web", _check, timeout_s=0.05)
+    assert last == "available=1/2, ready=1, updated=1"
+
+
+def test_deleted_event_counts_as_gone(monkeypatch):
+    monkeypatch.setattr(k8s.watch, "Watch", _fake_watch([{"type": "DELETED", "object": SimpleNamespace()}], []))
+    ns = SimpleNamespace(metadata=SimpleNamespace(resource_version="3"))
+    assert k8s._wait_for(lambda: ns, None, (), "tenant-a-1", lambda o, last: (o is None, None), timeout_s=5) is None
@@ -0,0 +1,88 @@
+import pathlib
+import sys
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.services import log_stream
+from src.services.log_stream import _follow_until_stopped, _RateLimit, _Stream
+
+
+class FakeResp:
+    def __init__(self, lines, error=None):
+        self._lines = lines
+        self._error = error
+
+    def __iter__(self):
+        for line in self._lines:
+            yield f"{line}\n".encode()
+        if self._error:
+            raise self._error
+
+    def release_conn(self):
+        pass
+
+
+def _line(sec: int, nanos: int, text: str) -> str:
+    return f"2026-01-01T00:00:{sec:02d}.{nanos:09d}Z {text}"
+
+
+def test_reopen_skips_lines_already_sent(monkeypatch):
+    opens = []
+    responses = [
+        FakeResp([_line(1, 5, "a"), _line(2, 0, "b"), _line(2, 7, "c")], error=ConnectionError("idle timeout")),
+        # since_seconds is whole seconds, so the reopen repeats part of what was sent
+        FakeResp([_line(2, 0, "b"), _line(2, 7, "c"), _line(2, 8, "d"), "no timestamp"]),
+    ]
+    stream = _Stream()
+
+    def open_pod_log(namespace, pod, container, tail_lines, since_seconds, read_timeout_s):
+        opens.append((tail_lines, since_seconds))
+        if not responses:
+            stream.stopped.set()
+            return FakeResp([])
+        return responses.pop(0)
+
+    monkeypatch.setattr(log_stream.k8s, "open_pod_log", open_pod_log)
+    monkeypatch.setattr(log_stream.settings, "sse_interval_s", 0.01)
+    pushed = []
+    _follow_until_stopped("tenant-a-1", "web-1", "web", pushed.append, _RateLimit(1000), stream)
+    assert [e["line"] for e in pushed] == ["a", "b", "c", "d", "no timestamp"]
+    # only the first open asks for the tail; reopens resume from the last line seen
+    assert opens[0] == (log_stream.settings.log_follow_tail_lines, None)
+    assert all(tail is None and since >= 1 for tail, since in opens[1:])
+
+
+def test_rate_limit_drops_then_resumes(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(log_stream.time, "monotonic", lambda: clock[0])
+    limit = _RateLimit(2)
+    assert [limit.allow() for _ in range(5)] == [True, True, False, False, False]
+    assert limit.take_skipped() == 3
+    assert limit.take_skipped() == 0
+    clock[0] += 0.5  # half a second refills one token
+    assert [limit.allow() for _ in range(2)] == [True, False]
+    clock[0] += 10  # the bucket never holds more than one second's worth
+    assert [limit.allow() for _ in range(3)] == [True, True, False]
+    assert limit.take_skipped() == 2
+
+
+def test_rate_limited_lines_are_counted_not_pushed(monkeypatch):
+    monkeypatch.setattr(log_stream.time, "monotonic", lambda: 100.0)
+    stream = _Stream()
+    opens = []
+
+    def open_pod_log(*args, **kwargs):
+        opens.append(1)
+        if len(opens) > 1:
+            stream.stopped.set()
+            return FakeResp([])
+        return FakeResp([_line(1, n, f"l{n}") for n in range(5)])
+
+    monkeypatch.setattr(log_stream.k8s, "open_pod_log", open_pod_log)
+    limit = _RateLimit(2)
+    pushed = []
+    _follow_until_stopped("tenant-a-1", "web-1", "web", pushed.append, limit, stream)
+    assert [e["line"] for e in pushed] == ["l0", "l1"]
+    # follow_logs turns the count into one "[3 lines skipped: rate limit]" marker
+    assert limit.take_skipped() == 3
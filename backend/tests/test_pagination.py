@@ -0,0 +1,27 @@
+import pathlib
+import sys
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.routers.deployments import _decode_cursor, _encode_cursor
+
+
+def test_cursor_round_trip():
+    d = SimpleNamespace(created_at=datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=UTC), id=uuid.uuid4())
+    cursor = _encode_cursor(d)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == (d.created_at, d.id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "eyJjIjogMX0"])
+def test_bad_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        _decode_cursor(cursor)
+    assert exc.value.status_code == 400
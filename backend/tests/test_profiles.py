@@ -0,0 +1,23 @@
+import pathlib
+import sys
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.services.profiles import values_fingerprint
+
+CHART = str(root.parent / "helm" / "tenant-nginx")
+
+
+def test_fingerprint_ignores_replica_count():
+    base = {"nameOverride": "web1", "host": "web1.example", "replicaCount": 1}
+    assert values_fingerprint(CHART, base) == values_fingerprint(CHART, {**base, "replicaCount": 5})
+
+
+def test_fingerprint_changes_with_other_values():
+    base = {"nameOverride": "web1", "host": "web1.example", "replicaCount": 1}
+    assert values_fingerprint(CHART, base) != values_fingerprint(CHART, {**base, "indexHtml": "<h1>new</h1>"})
+
+
+def test_fingerprint_is_none_for_unreadable_chart(tmp_path):
+    assert values_fingerprint(str(tmp_path / "missing"), {"replicaCount": 1}) is None
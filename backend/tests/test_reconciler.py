@@ -0,0 +1,32 @@
+import pathlib
+import sys
+from datetime import UTC, datetime, timedelta
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.core.config import settings
+from src.reconciler import resolve
+
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _report(ready: int, endpoints: int | None = 1) -> dict:
+    return {"replicas": 1, "ready_replicas": ready, "available_replicas": ready, "updated_replicas": ready, "endpoints": endpoints, "pods": []}
+
+
+def test_ready_with_endpoints():
+    assert resolve(_report(1), NOW, NOW) == ("READY", None)
+
+
+def test_incomplete_lookup_is_left_for_a_later_pass():
+    assert resolve(None, NOW, NOW) is None
+    assert resolve(_report(1, endpoints=None), NOW, NOW) is None
+
+
+def test_not_ready_until_timeout():
+    assert resolve(_report(0, endpoints=0), NOW, NOW) is None
+    created = NOW - timedelta(seconds=settings.deployment_ready_timeout_s + 1)
+    status, error = resolve(_report(0, endpoints=0), created, NOW)
+    assert status == "ERROR"
+    assert "ready 0/1" in error
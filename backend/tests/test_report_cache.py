@@ -0,0 +1,68 @@
+import asyncio
+import pathlib
+import sys
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.services import report_cache as report_cache_mod
+from src.services.report_cache import ReportCache
+
+
+def _slow_report(calls: list, delay: float = 0.05):
+    async def get_deployment_report(namespace, name):
+        calls.append((namespace, name))
+        await asyncio.sleep(delay)
+        return {"replicas": 1}
+    return get_deployment_report
+
+
+def test_concurrent_gets_share_one_fetch(monkeypatch):
+    calls: list = []
+    monkeypatch.setattr(report_cache_mod.k8s_async, "get_deployment_report", _slow_report(calls))
+
+    async def run():
+        cache = ReportCache()
+        reports = await asyncio.gather(*(cache.get("ns", "web") for _ in range(20)))
+        assert all(r == {"replicas": 1} for r in reports)
+        # later reads within the TTL are local hits
+        await cache.get("ns", "web")
+        assert calls == [("ns", "web")]
+        await cache.invalidate("ns", "web")
+        await cache.get("ns", "web")
+        assert len(calls) == 2
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_cancel_the_others(monkeypatch):
+    calls: list = []
+    monkeypatch.setattr(report_cache_mod.k8s_async, "get_deployment_report", _slow_report(calls, delay=0.1))
+
+    async def run():
+        cache = ReportCache()
+        starter = asyncio.create_task(cache.get("ns", "web"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get("ns", "web"))
+        await asyncio.sleep(0.01)
+        starter.cancel()
+        assert await waiter == {"replicas": 1}
+        assert starter.cancelled()
+        assert len(calls) == 1
+
+    asyncio.run(run())
+
+
+def test_fetch_error_reaches_every_waiter(monkeypatch):
+    async def fail(namespace, name):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("api down")
+
+    monkeypatch.setattr(report_cache_mod.k8s_async, "get_deployment_report", fail)
+
+    async def run():
+        cache = ReportCache()
+        results = await asyncio.gather(cache.get("ns", "web"), cache.get("ns", "web"), return_exceptions=True)
+        assert [str(r) for r in results] == ["api down", "api down"]
+
+    asyncio.run(run())
@@ -0,0 +1,97 @@
+import asyncio
+import pathlib
+import sys
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src import tasks
+from src.models.deployment import Deployment
+from src.models.job import Job
+from src.models.user import Base, User
+
+
+def _run(monkeypatch, test):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(tasks, "AsyncSessionLocal", Session)
+        try:
+            await test(Session)
+        finally:
+            await engine.dispose()
+    asyncio.run(run())
+
+
+async def _deployment(Session, status: str) -> uuid.UUID:
+    async with Session() as db:
+        user = User(email="a@example.com", user_slug="a", password_hash="x")
+        db.add(user)
+        await db.flush()
+        d = Deployment(
+            user_id=user.id, display_name="web", slug="web", namespace="tenant-a-1",
+            unique_id="abc", ingress_host="web.example", status=status,
+        )
+        db.add(d)
+        await db.commit()
+        return d.id
+
+
+async def _status(Session, dep_id: uuid.UUID) -> str | None:
+    async with Session() as db:
+        d = await db.get(Deployment, dep_id)
+        return d.status if d else None
+
+
+def test_finalize_records_ready(monkeypatch):
+    async def test(Session):
+        dep_id = await _deployment(Session, "READY")
+
+        async def ready(*args, **kwargs):
+            return "READY" if args else None
+
+        monkeypatch.setattr(tasks.k8s_async, "wait_deployment_ready", ready)
+        monkeypatch.setattr(tasks.k8s_async, "wait_service_endpoints_ready", ready)
+        monkeypatch.setattr(tasks.k8s_async, "check_ready_strict", ready)
+        await tasks.finalize_deployment(Job(kind="scale", deployment_id=dep_id, attempts=1))
+        assert await _status(Session, dep_id) == "READY"
+
+    _run(monkeypatch, test)
+
+
+def test_finalize_does_not_revive_a_deleting_row(monkeypatch):
+    async def test(Session):
+        dep_id = await _deployment(Session, "READY")
+
+        async def deleted_meanwhile(namespace, name):
+            # a delete lands while the rollout is being followed
+            async with Session() as db:
+                (await db.get(Deployment, dep_id)).status = "DELETING"
+                await db.commit()
+            raise TimeoutError("deployment not ready")
+
+        monkeypatch.setattr(tasks.k8s_async, "wait_deployment_ready", deleted_meanwhile)
+        await tasks.finalize_deployment(Job(kind="scale", deployment_id=dep_id, attempts=1))
+        assert await _status(Session, dep_id) == "DELETING"
+
+    _run(monkeypatch, test)
+
+
+def test_create_jobs_are_left_to_the_reconciler(monkeypatch):
+    async def test(Session):
+        dep_id = await _deployment(Session, "CREATING")
+
+        async def unexpected(*args, **kwargs):
+            raise AssertionError("the reconciler finalizes new deployments")
+
+        monkeypatch.setattr(tasks.settings, "reconcile_enabled", True)
+        monkeypatch.setattr(tasks.k8s_async, "wait_deployment_ready", unexpected)
+        await tasks.HANDLERS["create"](Job(kind="create", deployment_id=dep_id, attempts=1))
+        assert await _status(Session, dep_id) == "CREATING"
+
+    _run(monkeypatch, test)
@@ -0,0 +1,94 @@
+import pathlib
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from starlette.websockets import WebSocketDisconnect
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from src.core.security import create_access_token
+from src.main import app
+from src.models.deployment import Deployment
+from src.models.user import Base, User
+from src.routers import deployments as deployments_router
+
+READY = {"replicas": 1, "ready_replicas": 1, "available_replicas": 1, "updated_replicas": 1, "endpoints": 1, "pods": []}
+
+
+@pytest.fixture
+def seeded(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'ws.db'}"
+    with Session(create_engine(url)) as db:
+        Base.metadata.create_all(db.get_bind())
+        user = User(email="a@example.com", user_slug="a", password_hash="x")
+        db.add(user)
+        db.flush()
+        d = Deployment(user_id=user.id, display_name="web", slug="web", namespace="tenant-a-1", unique_id="abc", ingress_host="web.example", status="CREATING")
+        db.add(d)
+        db.commit()
+        ids = (user.id, str(d.id))
+    monkeypatch.setattr(deployments_router, "AsyncSessionLocal", async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ws.db'}")))
+
+    async def get_many(targets):
+        return {t: READY for t in targets}
+
+    async def get(namespace, name):
+        return READY
+
+    monkeypatch.setattr(deployments_router.report_cache, "get_many", get_many)
+    monkeypatch.setattr(deployments_router.report_cache, "get", get)
+    return create_access_token(sub="a@example.com", uid=ids[0], slug="a"), ids[1]
+
+
+def test_list_then_subscription_messages(seeded):
+    token, dep_id = seeded
+    with TestClient(app).websocket_connect(f"/deployments/stream?token={token}") as ws:
+        listing = ws.receive_json()
+        assert listing["type"] == "list"
+        assert listing["data"][dep_id]["status"] == "CREATING"
+        assert listing["data"][dep_id]["ready_replicas"] == 1
+
+        ws.send_json({"op": "subscribe", "id": dep_id})
+        snapshot = ws.receive_json()
+        assert (snapshot["type"], snapshot["id"], snapshot["data"]["status"]) == ("snapshot", dep_id, "READY")
+        # READY is terminal: the deployment's channel ends
+        assert ws.receive_json() == {"type": "end", "channel": "status", "id": dep_id}
+
+        ws.send_json({"op": "subscribe", "id": "00000000-0000-0000-0000-000000000000"})
+        assert ws.receive_json()["detail"] == "Not found"
+        ws.send_json({"op": "bogus"})
+        assert ws.receive_json() == {"type": "error", "id": None, "detail": "Unknown op: bogus"}
+
+
+def test_rejects_missing_token():
+    with pytest.raises(WebSocketDisconnect) as exc, TestClient(app).websocket_connect("/deployments/stream") as ws:
+        ws.receive_json()
+    assert exc.value.code == 1008
+
+
+def test_list_survives_a_database_error(seeded, monkeypatch):
+    token, dep_id = seeded
+    sessions = deployments_router.AsyncSessionLocal
+    calls = []
+
+    def flaky():
+        # the first session resolves the token, the second is the list poller's
+        calls.append(1)
+        if len(calls) == 2:
+            raise OperationalError("SELECT", {}, Exception("connection reset"))
+        return sessions()
+
+    monkeypatch.setattr(deployments_router, "AsyncSessionLocal", flaky)
+    monkeypatch.setattr(deployments_router.settings, "sse_interval_s", 0.05)
+    with TestClient(app).websocket_connect(f"/deployments/stream?token={token}") as ws:
+        # the failed read is retried on the next tick instead of ending the list channel
+        listing = ws.receive_json()
+        assert listing["type"] == "list"
+        assert dep_id in listing["data"]
+    assert len(calls) >= 3
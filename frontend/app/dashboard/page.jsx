@@ -1,6 +1,7 @@
 "use client";
 import { useEffect, useRef, useState } from "react";
 import { getToken, refreshIfNeeded } from "../../lib/session";
+import { mergePatch } from "../../lib/patch";
 import { motion, AnimatePresence } from "framer-motion";
 import ConfirmDialog from "../../components/ConfirmDialog";
 import ProgressTimeline from "../../components/ProgressTimeline";
@@ -25,6 +26,7 @@ export default function Dashboard() {
   const [msg, setMsg] = useState("");
   const [stats, setStats] = useState({});
   const notifiedReady = useRef(new Set());
+  const live = useRef(false);
   const [deleteTimers, setDeleteTimers] = useState({});
   const [replicas, setReplicas] = useState(1);
   const [deleteDelaySec, setDeleteDelaySec] = useState(3);
@@ -46,17 +48,60 @@ export default function Dashboard() {
       }
       refresh();
     }
-    const id = setInterval(() => refresh(), 5000);
-    return () => clearInterval(id);
   }, []);
 
+  // one WebSocket per dashboard pushes status and replica changes for every deployment;
+  // while it is down, fall back to polling the list
+  useEffect(() => {
+    if (!auth) return;
+    let ws, retry, poll = null, closed = false;
+    const startPolling = () => { if (!poll) poll = setInterval(() => refresh(), 5000); };
+    async function connect() {
+      const t = await refreshIfNeeded(API);
+      if (!t || closed) { startPolling(); return; }
+      let state = {};
+      ws = new WebSocket(`${API.replace(/^http/, 'ws')}/deployments/stream?token=${encodeURIComponent(t.access)}`);
+      ws.onopen = () => { live.current = true; clearInterval(poll); poll = null; };
+      ws.onmessage = (ev) => {
+        const msg = JSON.parse(ev.data);
+        if (msg.type !== 'list' && msg.type !== 'list_patch') return;
+        const prev = state;
+        state = msg.type === 'list' ? msg.data : mergePatch(state, msg.data);
+        setStats((m) => {
+          const out = { ...m };
+          for (const [id, s] of Object.entries(state)) out[id] = { ...out[id], ...s };
+          return out;
+        });
+        // a deployment appeared or went away: reload the rows themselves
+        if (Object.keys(prev).sort().join() !== Object.keys(state).sort().join()) refresh();
+      };
+      ws.onclose = () => {
+        live.current = false;
+        if (closed) return;
+        startPolling();
+        retry = setTimeout(connect, 5000);
+      };
+    }
+    connect();
+    return () => { closed = true; live.current = false; clearTimeout(retry); clearInterval(poll); try { ws?.close(); } catch {} };
+  }, [auth]);
+
   async function refresh() {
     const t = await refreshIfNeeded(API);
     if (!t) { setAuth(null); return; }
-    const res = await fetch(`${API}/deployments`, { headers: { Authorization: `Bearer ${t.access}` } });
-    const data = await res.json();
+    // follow keyset pages (X-Next-Cursor) until the list is complete
+    let data = [];
+    let cursor = null;
+    do {
+      const qs = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const res = await fetch(`${API}/deployments${qs}`, { headers: { Authorization: `Bearer ${t.access}` } });
+      const page = await res.json();
+      if (!Array.isArray(page)) { data = page; break; }
+      data = data.concat(page);
+      cursor = res.headers.get('X-Next-Cursor');
+    } while (cursor);
     setList(Array.isArray(data) ? data : []);
-    if (Array.isArray(data)) {
+    if (Array.isArray(data) && !live.current) {
       data.forEach((d) => d && fetchStatus(d.id));
     }
   }
@@ -88,10 +133,11 @@ export default function Dashboard() {
     try {
       const t = await refreshIfNeeded(API);
       if (!t) return;
-      const es = new EventSource(`${API.replace('http', 'http')}/deployments/${id}/events`, { withCredentials: false });
+      const es = new EventSource(`${API}/deployments/${id}/events?logs=false&token=${encodeURIComponent(t.access)}`);
       return await new Promise((resolve) => {
-        es.onmessage = async (ev) => {
-          const data = JSON.parse(ev.data);
+        // a full "snapshot" first, then "patch" events with only the changed fields
+        let state = {};
+        const onFrame = async (data) => {
           setStats((m) => ({ ...m, [id]: { ...m[id], ...data.report, status: data.status } }));
           if (data.status === 'READY') {
             if (!notifiedReady.current.has(id)) {
@@ -105,6 +151,8 @@ export default function Dashboard() {
           }
           if (data.status === 'ERROR') { es.close(); await refresh(); resolve(); }
         };
+        es.addEventListener('snapshot', (ev) => { state = JSON.parse(ev.data); onFrame(state); });
+        es.addEventListener('patch', (ev) => { state = mergePatch(state, JSON.parse(ev.data)); onFrame(state); });
         es.addEventListener('end', async () => { es.close(); await refresh(); resolve(); });
         setTimeout(async () => { es.close(); await refresh(); resolve(); }, deadline - Date.now());
       });
@@ -150,7 +198,7 @@ export default function Dashboard() {
         const t = await refreshIfNeeded(API);
         if (!t) return;
         const res = await fetch(`${API}/deployments/${id}`, { method: "DELETE", headers: { Authorization: `Bearer ${t.access}` } });
-        if (res.ok) { toast.success('Deployment deleted'); await refresh(); }
+        if (res.ok) { toast.success('Deletion started'); await refresh(); }
         else { toast.error('Error deleting deployment'); }
       } finally {
         setDeleteTimers((m) => { const n={...m}; delete n[id]; return n; });
@@ -2,6 +2,8 @@
 import { useEffect, useRef, useState } from "react";
 import { refreshIfNeeded } from "../lib/session";
 
+const MAX_LINES = 2000;
+
 export default function LogStream({ id, apiBase }) {
   const [lines, setLines] = useState([]);
   const [paused, setPaused] = useState(false);
@@ -17,13 +19,14 @@ export default function LogStream({ id, apiBase }) {
       const url = `${apiBase}/deployments/${id}/events?token=${encodeURIComponent(t.access)}`;
       es = new EventSource(url);
       esRef.current = es;
-      es.onmessage = (ev) => {
+      // only new lines arrive, as "log" events; status frames are ignored here
+      es.addEventListener('log', (ev) => {
         try {
           const data = JSON.parse(ev.data);
-          const logs = flattenLogs(data.logs || {});
-          if (logs.length) setLines((xs) => [...xs, `# ${new Date().toLocaleTimeString()}` , ...logs]);
+          const logs = formatLines(data.lines || []);
+          if (logs.length) setLines((xs) => [...xs, ...logs].slice(-MAX_LINES));
         } catch {}
-      };
+      });
       es.addEventListener('end', () => { es.close(); });
       es.onerror = () => { es.close(); };
     }
@@ -59,13 +62,6 @@ export default function LogStream({ id, apiBase }) {
   );
 }
 
-function flattenLogs(logs) {
-  const out = [];
-  for (const [pod, containers] of Object.entries(logs)) {
-    for (const [container, text] of Object.entries(containers || {})) {
-      const lines = (text || '').split('\n').filter(Boolean).slice(-40);
-      for (const ln of lines) out.push(`${pod}:${container} | ${ln}`);
-    }
-  }
-  return out;
+function formatLines(entries) {
+  return entries.map((e) => (e.container ? `${e.pod}:${e.container} | ${e.line}` : `${e.pod} | ${e.line}`));
 }
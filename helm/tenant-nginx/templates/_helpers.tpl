@@ -9,3 +9,8 @@
 {{- define "tenant-nginx.name" -}}
 {{- .Chart.Name | trunc 63 | trimSuffix "-" -}}
 {{- end -}}
+
+{{- define "tenant-nginx.labels" -}}
+app: {{ include "tenant-nginx.fullname" . }}
+sas-k8s-sim/managed-by: sas-k8s-sim-api
+{{- end -}}
@@ -6,3 +6,7 @@
 {{- end -}}
 {{- end -}}
 
+{{- define "tenant-tomcat.labels" -}}
+app: {{ include "tenant-tomcat.fullname" . }}
+sas-k8s-sim/managed-by: sas-k8s-sim-api
+{{- end -}}